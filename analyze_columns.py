@@ -1,12 +1,11 @@
-import pandas as pd
-import io
+from scraper_core.csv_io import read_companies
 
 try:
     # Use the robust parsing logic or just pandas with error_bad_lines=False for quick analysis
     # Since we fixed the import, let's try reading it carefully.
     # Actually, for analysis, I just want the industry and region columns.
     
-    df = pd.read_csv('companies.csv', on_bad_lines='skip', low_memory=False)
+    df = read_companies('companies.csv', columns=['industry', 'region'])
     
     print("--- Industry Analysis ---")
     print(f"Total unique industries: {df['industry'].nunique()}")
@@ -1,6 +1,6 @@
-
-import pandas as pd
 import os
+from scraper_core.csv_io import read_companies
+from scraper_core.work_queue import WorkQueue, queue_path, print_stats
 
 files = ['companies_x_updated.csv', 'companies.csv']
 target_file = None
@@ -14,14 +14,17 @@ if not target_file:
     print("No CSV found")
     exit()
 
+# The work queue already knows what is left; no need to rescan the CSV
+if os.path.exists(queue_path(target_file)):
+    queue = WorkQueue(queue_path(target_file))
+    print(f"Queue for {target_file}:")
+    print_stats(queue)
+    print("Next 5 to scrape:")
+    print([{'company_name': n, 'website_url': w} for _, _, n, w in queue.peek('x', 5)])
+    exit()
+
 print(f"Reading {target_file}...")
-try:
-    df = pd.read_csv(target_file, encoding='utf-8', low_memory=False)
-except:
-    try:
-        df = pd.read_csv(target_file, encoding='utf-8-sig', low_memory=False)
-    except:
-        df = pd.read_csv(target_file, encoding='cp932', low_memory=False)
+df = read_companies(target_file)
 
 total = len(df)
 if 'x_url' not in df.columns:
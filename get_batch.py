@@ -1,20 +1,30 @@
 
-import pandas as pd
 import json
+import os
+from scraper_core.csv_io import read_companies
+from scraper_core.work_queue import WorkQueue, queue_path
 
-try: df = pd.read_csv('companies_x_updated.csv', encoding='utf-8', low_memory=False)
-except: 
-    try: df = pd.read_csv('companies_x_updated.csv', encoding='utf-8-sig', low_memory=False)
-    except: df = pd.read_csv('companies.csv', encoding='utf-8', low_memory=False)
-
-target = df[df['x_url'].isna() | (df['x_url'] == '')].head(5)
+QUEUE_FILE = queue_path('companies_x_updated.csv')
 
 result = []
-for _, row in target.iterrows():
-    result.append({
-        'name': row['company_name'],
-        'website': row['website_url']
-    })
+if os.path.exists(QUEUE_FILE):
+    # Next pending X tasks straight from the work queue
+    for _, _, name, website in WorkQueue(QUEUE_FILE).peek('x', 5):
+        result.append({
+            'name': name,
+            'website': website
+        })
+else:
+    source = 'companies_x_updated.csv' if os.path.exists('companies_x_updated.csv') else 'companies.csv'
+    df = read_companies(source, columns=['company_name', 'website_url', 'x_url'])
+
+    target = df[df['x_url'].isna() | (df['x_url'] == '')].head(5)
+
+    for _, row in target.iterrows():
+        result.append({
+            'name': row['company_name'],
+            'website': row['website_url']
+        })
 
 with open('batch.json', 'w', encoding='utf-8') as f:
     json.dump(result, f, ensure_ascii=False, indent=2)
@@ -1,5 +1,5 @@
-import pandas as pd
 import os
+from scraper_core.csv_io import read_companies
 
 INPUT_FILE = 'companies.csv'
 
@@ -8,10 +8,7 @@ def main():
         print("File not found.")
         return
 
-    try: df = pd.read_csv(INPUT_FILE, encoding='utf-8')
-    except:
-        try: df = pd.read_csv(INPUT_FILE, encoding='cp932')
-        except: df = pd.read_csv(INPUT_FILE, encoding='shift_jis')
+    df = read_companies(INPUT_FILE)
         
     # Filter IDs 2-10
     # Assuming 'id' column exists, or just index 1-9 (0-indexed)
@@ -1,5 +1,7 @@
-import pandas as pd
 import os
+import pandas as pd
+from scraper_core.csv_io import read_companies, iter_companies, write_companies
+from scraper_core.text import company_name_key, get_domain
 
 # Configuration
 BASE_FILE = 'companies.csv'
@@ -9,100 +11,160 @@ FILES_TO_MERGE = [
     {'file': 'companies_youtube_filled.csv', 'cols': ['youtube_url', 'youtube_subscribers']}
 ]
 OUTPUT_FILE = 'companies_final.csv'
+CONFLICTS_FILE = 'merge_conflicts.csv'
+# When base and source disagree on a non-empty value: 'source' overwrites (filled
+# files are newer), 'base' keeps the existing value. Either way it is reported.
+ON_CONFLICT = 'source'
+CHUNK_SIZE = 50000
+
+
+def name_keys(df):
+    """
+    Fallback join key for rows without an id: normalized company name + website
+    domain. Normalization runs once per distinct value, not per row. NA for rows
+    without a company name: they must not all join one another.
+    """
+    names = df['company_name'].dropna().unique()
+    name_map = {n: company_name_key(n) or pd.NA for n in names}
+    key = df['company_name'].map(name_map).astype('string')
+    if 'website_url' in df.columns:
+        urls = df['website_url'].dropna().unique()
+        domain_map = {u: get_domain(u) for u in urls}
+        key = key + '|' + df['website_url'].map(domain_map).fillna('')
+    else:
+        key = key + '|'
+    return key
+
+
+def ids(df):
+    if 'id' not in df.columns:
+        return pd.Series(pd.NA, index=df.index, dtype='string')
+    s = df['id'].astype('string').str.strip()
+    return s.mask(s == '')
+
+
+def load_source(filepath, cols):
+    """
+    Streams a platform file in chunks and keeps only rows that carry a value for
+    one of `cols`, keyed by id and by name key. Returns (updates, duplicates,
+    unkeyed): unkeyed rows have neither an id nor a name key and cannot be joined.
+    """
+    parts = []
+    for chunk in iter_companies(filepath, columns=['id', 'company_name', 'website_url'] + cols, chunksize=CHUNK_SIZE):
+        present = [c for c in cols if c in chunk.columns]
+        if not present or 'company_name' not in chunk.columns: continue
+        chunk = chunk[chunk[present].notna().any(axis=1)]
+        if chunk.empty: continue
+        part = chunk[present].copy()
+        part['_id'] = ids(chunk)
+        part['_name_key'] = name_keys(chunk)
+        part['company_name'] = chunk['company_name']
+        parts.append(part)
+    if not parts:
+        return None, None, None
+    src = pd.concat(parts)
+    for c in cols:
+        if c not in src.columns: src[c] = pd.NA
+    no_key = src['_id'].isna() & src['_name_key'].isna()
+    unkeyed, src = src[no_key], src[~no_key].copy()
+
+    # Same company listed more than once in the source: keep the last row, report disagreements
+    src['_key'] = src['_id'].fillna('name:' + src['_name_key'])
+    dup = src[src.duplicated('_key', keep=False)]
+    src = src.drop_duplicates('_key', keep='last')
+    return src, dup, unkeyed
+
+
+def join_source(base, src, cols):
+    """
+    One multi-column hash join per key type: rows with an id join on id, the rest
+    on the name key. Returns a frame aligned to base.index with the source values.
+    """
+    out = pd.DataFrame(index=base.index, columns=cols)
+    base_keys = pd.DataFrame({'_id': ids(base), '_name_key': name_keys(base)}, index=base.index)
+    base_keys['_row'] = base.index
+
+    by_id = src[src['_id'].notna()]
+    if len(by_id):
+        m = base_keys[base_keys['_id'].notna()].merge(by_id[['_id'] + cols], on='_id', how='inner')
+        out.loc[m['_row'].values, cols] = m[cols].values
+
+    by_name = src[src['_id'].isna()]
+    if len(by_name):
+        # A source without ids can still fill base rows that have one
+        named = base_keys[base_keys['_name_key'].notna()]
+        m = named.merge(by_name[['_name_key'] + cols], on='_name_key', how='inner')
+        m = m[~m['_row'].isin(out.dropna(how='all').index)]
+        out.loc[m['_row'].values, cols] = m[cols].values
+    return out
+
 
 def main():
     print(f"Loading base file: {BASE_FILE}...")
-    try:
-        base_df = pd.read_csv(BASE_FILE, encoding='cp932', low_memory=False)
-    except:
-        try:
-             base_df = pd.read_csv(BASE_FILE, encoding='utf-8', low_memory=False)
-        except:
-             base_df = pd.read_csv(BASE_FILE, encoding='shift_jis', low_memory=False)
-
+    base_df = read_companies(BASE_FILE)
     print(f"Base rows: {len(base_df)}")
-    
+
     # Create valid columns in base if not exist (initialize with None)
     for f in FILES_TO_MERGE:
         for col in f['cols']:
             if col not in base_df.columns:
                 base_df[col] = None
 
+    conflicts = []
+
     # Merge Process
     for item in FILES_TO_MERGE:
         filepath = item['file']
         cols = item['cols']
-        
+
         if not os.path.exists(filepath):
             print(f"Warning: {filepath} not found. Skipping.")
             continue
-            
+
         print(f"Merging {filepath}...")
-        try:
-            target_df = pd.read_csv(filepath, encoding='cp932', low_memory=False)
-        except:
-             try: target_df = pd.read_csv(filepath, encoding='utf-8', low_memory=False)
-             except: target_df = pd.read_csv(filepath, encoding='shift_jis', low_memory=False)
-        
-        # We merge based on 'company_name'. 
-        # Assuming company_name is unique enough or index helps.
-        # Actually, best approach is to iterate and update base_df where company_name matches,
-        # OR left join. 
-        # Since these are filled versions of the SAME original csv, the company_name should align.
-        
-        # Create a dictionary for faster lookup? or just merge using pandas
-        # We only want to update specific columns.
-        
-        # Let's subset target_df to just company_name + target cols
-        # Ensure company_name exists
-        if 'company_name' not in target_df.columns:
-             print(f"Error: 'company_name' not in {filepath}. Skipping.")
-             continue
-             
-        subset = target_df[['company_name'] + cols].copy()
-        
-        # Drop rows where company_name is NaN
-        subset = subset.dropna(subset=['company_name'])
-        
-        # Set index to company_name for mapping
-        subset.set_index('company_name', inplace=True)
-        
-        # Convert base_df to index for easier update
-        # Warning: if duplicates exist in company_name, this might be tricky.
-        # But 'companies.csv' implies unique companies or at least consistent list.
-        # Let's assume unique company_name for now or use the first match.
-        
-        # Update base_df
-        # We iterate over the columns we want to update
+        src, dup, unkeyed = load_source(filepath, cols)
+        if src is None:
+            print(f"  No values for {cols} in {filepath}. Skipping.")
+            continue
+        if len(dup):
+            print(f"  [Warning] {dup['_key'].nunique()} company key(s) appear more than once; last row wins.")
+        if len(unkeyed):
+            print(f"  [Warning] {len(unkeyed)} row(s) without an id or company name cannot be matched; skipped.")
+            for _, r in unkeyed.iterrows():
+                for col in cols:
+                    if pd.notna(r[col]):
+                        conflicts.append({'row': None, 'id': None, 'company_name': r['company_name'],
+                                          'column': col, 'base_value': None, 'source_value': r[col],
+                                          'source_file': filepath, 'reason': 'no_key'})
+
+        new = join_source(base_df, src, cols)
         for col in cols:
-            # Map the values from subset to base_df
-            # This respects the index (company_name)
-            # update() in pandas is inplace and aligns on index
-            
-            # Using map might be safer to strictly control what we overwrite?
-            # actually pandas update implies overwriting NaNs with values, 
-            # but we want to overwrite even if base has something (if filled is newer)
-            # or usually base is empty/old, and filled has new data.
-            
-            # Let's use map/combine_first logic manually to be safe and explicit
-            # Recalculate match:
-            # Create a series from subset for this col
-            s_map = subset[col]
-            
-            # Use 'map' on base_df['company_name'] to get new values
-            mapped_values = base_df['company_name'].map(s_map)
-            
-            # Where mapped_values is NOT NULL, update base_df
-            # We can use update or combine_first. 
-            # If we want to overwrite base:
-            base_df.loc[mapped_values.notna(), col] = mapped_values[mapped_values.notna()]
-            
-            count = mapped_values.notna().sum()
-            print(f"  Updated {col}: {count} records")
+            incoming = new[col]
+            has_new = incoming.notna()
+            old = base_df[col]
+            differs = has_new & old.notna() & (old.astype('string') != incoming.astype('string'))
+            for idx in base_df.index[differs]:
+                conflicts.append({
+                    'row': idx,
+                    'id': base_df.at[idx, 'id'] if 'id' in base_df.columns else None,
+                    'company_name': base_df.at[idx, 'company_name'],
+                    'column': col,
+                    'base_value': old.at[idx],
+                    'source_value': incoming.at[idx],
+                    'source_file': filepath,
+                    'reason': 'conflict',
+                })
+            update = has_new & ~differs if ON_CONFLICT == 'base' else has_new
+            base_df.loc[update, col] = incoming[update]
+            print(f"  Updated {col}: {update.sum()} records ({differs.sum()} conflicts)")
+
+    if conflicts:
+        pd.DataFrame(conflicts).to_csv(CONFLICTS_FILE, index=False, encoding='utf-8-sig')
+        print(f"{len(conflicts)} conflict(s) / unmatched value(s) written to {CONFLICTS_FILE} (kept: {ON_CONFLICT})")
 
     # Save
     print(f"Saving merged data to {OUTPUT_FILE}...")
-    base_df.to_csv(OUTPUT_FILE, index=False, encoding='utf-8-sig') # utf-8-sig for Excel compatibility
+    write_companies(base_df, OUTPUT_FILE) # utf-8-sig for Excel compatibility
     print("Done.")
 
 if __name__ == "__main__":
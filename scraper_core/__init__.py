@@ -0,0 +1 @@
+"""Shared building blocks for the SNS scrapers (scrape_*.py)."""
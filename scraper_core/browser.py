@@ -0,0 +1,131 @@
+import os
+import threading
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import TimeoutException, SessionNotCreatedException
+from webdriver_manager.chrome import ChromeDriverManager
+
+from scraper_core.rate_limit import get_pacer
+
+PAGE_LOAD_TIMEOUT = 20
+# chromedriver path resolved by webdriver-manager, reused by later runs (CHROMEDRIVER overrides)
+DRIVER_PATH_CACHE = os.environ.get('CHROMEDRIVER_PATH_CACHE', '.chromedriver_path')
+
+# Lean mode: the validators only read HTML, JSON and text, so images, media,
+# fonts and analytics never need to load. Blocked via CDP on the attached tab.
+# Disable with SCRAPER_LEAN=0 (e.g. when logging in by hand).
+LEAN_MODE = os.environ.get('SCRAPER_LEAN', '1') != '0'
+BLOCKED_URL_PATTERNS = [
+    # Images (CDN URLs carry query strings, hence the trailing *)
+    '*.jpg*', '*.jpeg*', '*.png*', '*.gif*', '*.webp*', '*.avif*', '*.heic*', '*.ico*', '*.svg*',
+    # Media
+    '*.mp4*', '*.webm*', '*.m4a*', '*.m4s*', '*.mp3*',
+    '*googlevideo.com/videoplayback*', '*mime_type=video*', '*mime_type=audio*',
+    # Fonts
+    '*.woff*', '*.ttf*', '*.otf*', '*.eot*',
+    # Analytics / ads
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*googlesyndication.com*', '*googleadservices.com*', '*connect.facebook.net*',
+    '*analytics.tiktok.com*', '*mon.tiktokv.com*', '*scorecardresearch.com*',
+    '*hotjar.com*', '*clarity.ms*', '*ads-twitter.com*', '*criteo.com*',
+]
+
+
+def enable_lean_mode(driver, patterns=None):
+    """Blocks BLOCKED_URL_PATTERNS for the tab the driver is attached to. Returns True on success."""
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns or BLOCKED_URL_PATTERNS})
+        return True
+    except Exception as e:
+        print(f"  [Warn] Could not enable lean mode (resource blocking): {e}")
+        return False
+
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def driver_path():
+    """
+    chromedriver binary: $CHROMEDRIVER, else the cached path from an earlier run,
+    else ChromeDriverManager().install() once (a network check) and cache it.
+    """
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path: return _driver_path
+        path = os.environ.get('CHROMEDRIVER')
+        if not path:
+            try:
+                with open(DRIVER_PATH_CACHE, encoding='utf-8') as f:
+                    path = f.read().strip()
+            except OSError:
+                path = None
+            if not path or not os.path.exists(path):
+                path = ChromeDriverManager().install()
+                try:
+                    with open(DRIVER_PATH_CACHE, 'w', encoding='utf-8') as f:
+                        f.write(path)
+                except OSError: pass
+        _driver_path = path
+        return path
+
+
+def reset_driver_path():
+    """Forgets the cached chromedriver (e.g. after a Chrome upgrade); the next driver_path() installs a matching one."""
+    global _driver_path
+    with _driver_path_lock:
+        _driver_path = None
+        try:
+            os.remove(DRIVER_PATH_CACHE)
+        except OSError: pass
+
+
+def _connect(options):
+    try:
+        return webdriver.Chrome(service=Service(driver_path()), options=options)
+    except SessionNotCreatedException as e:
+        # A cached chromedriver no longer matches the upgraded Chrome: resolve it again once
+        if os.environ.get('CHROMEDRIVER'): raise
+        print(f"  [Warn] chromedriver does not match Chrome ({e.msg}); installing a matching one.")
+        reset_driver_path()
+        return webdriver.Chrome(service=Service(driver_path()), options=options)
+
+
+def setup_driver(port, profile_name="ChromeProfile", lean=LEAN_MODE):
+    """Attaches to a Chrome started with --remote-debugging-port=<port>. lean: see LEAN_MODE."""
+    print(f"Connecting to existing Chrome on port {port}...")
+    options = webdriver.ChromeOptions()
+    options.add_experimental_option("debuggerAddress", f"127.0.0.1:{port}")
+    try:
+        driver = _connect(options)
+        # Set a reasonable page load timeout to prevent hanging
+        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        if lean and enable_lean_mode(driver):
+            print(f"  [Lean] Blocking images, media, fonts and analytics on port {port}.")
+        return driver
+    except Exception as e:
+        print(f"\nError connecting to Chrome: {e}")
+        print("IMPORTANT: You must start Chrome with remote debugging first!")
+        print(f'Run this in Command Prompt: chrome.exe --remote-debugging-port={port} --user-data-dir="C:\\selenium\\{profile_name}_{port}"')
+        print("Or let scraper_core.fleet launch headless instances (FLEET_SIZE in the scrape scripts).")
+        raise e
+
+
+def safe_get(driver, url):
+    """
+    Tries to load a page. If it times out, stops loading but keeps the open page 
+    (which is enough for scraping DOM usually).
+    Waits for the domain's Pacer slot first (raises CircuitOpen while it is
+    blocked); callers report() what the page turned out to be.
+    """
+    get_pacer().acquire(url)
+    try:
+        driver.get(url)
+    except TimeoutException:
+        print(f"  [Warn] Page load timed out for {url}. Stopping load and proceeding.")
+        try:
+            driver.execute_script("window.stop();")
+        except: pass
+    except Exception as e:
+        print(f"  [Error] Failed to load {url}: {e}")
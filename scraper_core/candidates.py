@@ -0,0 +1,102 @@
+"""
+Cheap ranking of search candidates before any profile page is loaded.
+
+A candidate is a URL or a (url, text) pair, where text is what the search
+showed for it (Google result title and snippet, X user cell). Scores add up:
+
+- OFFICIAL: '公式' / 'official' in the text
+- DOMAIN: the company's website domain in the text
+- NAME: the normalized company name in the text
+- HANDLE: similarity (0-1) of the profile handle to the handle guesses
+  (domain label, ASCII / romaji name; see match_keys); a guess inside a
+  longer handle counts only as a whole word ('aeon_official', not 'aeonmall')
+
+Callers fetch only the top few in full (see Platform.process).
+"""
+import re
+from difflib import SequenceMatcher
+from urllib.parse import urlparse
+
+from scraper_core.match_keys import keys_for, prepare_text, name_in_text, domain_in_text, MIN_ROMAJI_LEN
+
+OFFICIAL_WEIGHT = 2.0
+DOMAIN_WEIGHT = 3.0
+NAME_WEIGHT = 1.5
+HANDLE_WEIGHT = 3.0
+RANK_PENALTY = 0.1   # Per search position, so ties keep the search engine's order
+
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]')  # Same form as match_keys handles
+MIN_CONTAINED_LEN = MIN_ROMAJI_LEN  # Shorter guesses only count as the whole handle
+# Path prefixes in front of the handle (youtube.com/c/Name, /user/Name)
+_HANDLE_PREFIXES = ('c', 'user')
+# First path segments that are never a handle
+_NOT_HANDLES = {'channel', 'hashtag', 'explore', 'search', 'watch', 'share', 'intent', 'i'}
+
+
+def as_candidates(items):
+    """(url, text) pairs from URLs or pairs (search_cache stores pairs as lists)."""
+    out = []
+    for item in items or []:
+        if isinstance(item, str):
+            out.append((item, ""))
+        else:
+            out.append((item[0], item[1] or ""))
+    return out
+
+
+def profile_handle(url):
+    """'https://www.instagram.com/Green_House/' -> 'green_house' (lowercase, separators kept)."""
+    try:
+        parts = [p for p in urlparse(url).path.split('/') if p]
+    except Exception:
+        return ""
+    if parts and parts[0] in _HANDLE_PREFIXES:
+        parts = parts[1:]
+    if not parts or parts[0] in _NOT_HANDLES: return ""
+    return parts[0].lstrip('@').lower()
+
+
+def _contains_word(text, word):
+    return len(word) >= MIN_CONTAINED_LEN and re.search(rf'(?<![a-z0-9]){re.escape(word)}(?![a-z0-9])', text) is not None
+
+
+def handle_similarity(handle, targets):
+    """
+    1.0 when the handle equals a target or one contains the other as a whole
+    word of at least MIN_CONTAINED_LEN characters, else the best difflib ratio.
+    handle: from profile_handle; targets: match_keys handles.
+    """
+    if not handle: return 0.0
+    words = _NON_ALNUM_RE.sub(' ', handle).strip()
+    flat = words.replace(' ', '')
+    if not flat: return 0.0
+    best = 0.0
+    for target in targets:
+        if target == flat or _contains_word(words, target):
+            return 1.0
+        best = max(best, SequenceMatcher(None, flat, target).ratio())
+    return best
+
+
+def score_candidate(url, text, keys):
+    """keys: match_keys.keys_for(company_name, website_url)."""
+    text = prepare_text(text)
+    score = 0.0
+    if "公式" in text or "official" in text:
+        score += OFFICIAL_WEIGHT
+    if domain_in_text(keys, text):
+        score += DOMAIN_WEIGHT
+    if name_in_text(keys, text):
+        score += NAME_WEIGHT
+    score += HANDLE_WEIGHT * handle_similarity(profile_handle(url), keys['handles'])
+    return score
+
+
+def rank_candidates(items, company_name, website_url=None):
+    """Returns [(score, url)], best first; duplicates keep their first position."""
+    keys = keys_for(company_name, website_url)
+    ranked = {}
+    for pos, (url, text) in enumerate(as_candidates(items)):
+        if url in ranked: continue
+        ranked[url] = score_candidate(url, text, keys) - pos * RANK_PENALTY
+    return sorted(((s, u) for u, s in ranked.items()), key=lambda su: -su[0])
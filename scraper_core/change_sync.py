@@ -0,0 +1,136 @@
+"""
+Incremental push of local results (CSV or column store) to the companies table.
+
+Each row's synced columns are hashed; the hash of what was last pushed is kept
+in <results_file>.sync_state.sqlite, so a run only upserts rows whose content
+changed since then (in SupabaseSync batches) and stamps them with updated_at.
+Empty local values are never sent, so a sync cannot null out data in the table.
+
+    python -m scraper_core.change_sync <results_file> [--dry-run] [--mark-synced] [--full]
+
+--mark-synced records the current hashes without pushing (e.g. right after
+exporting companies.csv from the table); --full ignores the recorded state.
+"""
+import hashlib
+import json
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from scraper_core.csv_io import COMPANY_COLUMNS, read_companies
+from scraper_core.supabase_sync import REQUIRED_COLUMNS, SupabaseSync, get_client
+
+# Columns pushed to the table; id is the key, timestamps are set by the sync / DB
+SYNC_COLUMNS = [c for c in COMPANY_COLUMNS if c not in ('id', 'created_at', 'updated_at')]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS synced (
+    id TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+def state_path(results_file):
+    return str(results_file).rstrip('/\\') + '.sync_state.sqlite'
+
+
+def _value(val):
+    if val is None or pd.isna(val): return None
+    if hasattr(val, 'item'): val = val.item()
+    if isinstance(val, str):
+        val = val.strip()
+        return val or None
+    return val
+
+
+def row_payloads(df):
+    """Yields (id, payload) with the non-empty synced columns of every row that has an id."""
+    columns = [c for c in SYNC_COLUMNS if c in df.columns]
+    for record in df[['id'] + columns].itertuples(index=False, name=None):
+        row_id = _value(record[0])
+        if row_id is None: continue
+        payload = {}
+        for col, val in zip(columns, record[1:]):
+            val = _value(val)
+            if val is not None: payload[col] = val
+        yield str(row_id), payload
+
+
+def content_hash(payload):
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def load_state(conn):
+    return dict(conn.execute("SELECT id, hash FROM synced"))
+
+
+def save_state(conn, hashes):
+    now = time.time()
+    conn.execute("BEGIN")
+    conn.executemany("INSERT OR REPLACE INTO synced(id, hash, synced_at) VALUES(?, ?, ?)",
+                     [(i, h, now) for i, h in hashes.items()])
+    conn.execute("COMMIT")
+
+
+def sync_file(results_file, dry_run=False, mark_synced=False, full=False):
+    df = read_companies(results_file, ['id'] + SYNC_COLUMNS)
+    if 'id' not in df.columns:
+        print(f"Error: {results_file} has no id column.")
+        return
+    conn = sqlite3.connect(state_path(results_file), isolation_level=None)
+    conn.executescript(SCHEMA)
+    state = {} if full else load_state(conn)
+
+    changed = {}
+    incomplete = 0
+    total = 0
+    for row_id, payload in row_payloads(df):
+        total += 1
+        h = content_hash(payload)
+        if state.get(row_id) == h: continue
+        if any(c not in payload for c in REQUIRED_COLUMNS):
+            incomplete += 1 # An upsert is an INSERT first; NOT NULL columns must be present
+            continue
+        changed[row_id] = (h, payload)
+
+    print(f"[Sync] {total} row(s) with an id, {len(changed)} changed since the last sync"
+          + (f", {incomplete} skipped (missing {', '.join(REQUIRED_COLUMNS)})" if incomplete else ""))
+
+    if mark_synced:
+        save_state(conn, {i: h for i, (h, _) in changed.items()})
+        print(f"[Sync] Marked {len(changed)} row(s) as synced without pushing.")
+        return
+    if dry_run or not changed:
+        for row_id, (_, payload) in list(changed.items())[:5]:
+            print(f"  {row_id}: {payload}")
+        return
+
+    client = get_client()
+    if client is None: return
+    sync = SupabaseSync(client)
+    updated_at = datetime.now(timezone.utc).isoformat()
+    for row_id, (_, payload) in changed.items():
+        sync.upsert({'id': row_id, **payload, 'updated_at': updated_at})
+    sync.close()
+
+    failed = {str(r['id']) for r in sync.failed}
+    save_state(conn, {i: h for i, (h, _) in changed.items() if i not in failed})
+    print(f"[Sync] Pushed {len(changed) - len(failed)} row(s); {len(failed)} will be retried next run.")
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if not args:
+        print("Usage: python -m scraper_core.change_sync <results_file> [--dry-run] [--mark-synced] [--full]")
+        return
+    flags = set(a for a in sys.argv[1:] if a.startswith('--'))
+    sync_file(args[0], dry_run='--dry-run' in flags, mark_synced='--mark-synced' in flags, full='--full' in flags)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+One loader / writer for companies.csv and every file derived from it.
+
+The encoding is sniffed from a prefix instead of trying full parses with
+cp932, utf-8 and shift_jis in turn, the column types come from schema.sql
+(see COMPANY_COLUMNS), and pyarrow is used as the parse engine when installed.
+Everything is written back as utf-8-sig: lossless for Japanese text and still
+opens correctly in Excel.
+
+Paths ending in `.store` are columnar stores (see store.py) and are read and
+written column-selectively instead.
+"""
+import codecs
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    ENGINE = 'pyarrow'
+except ImportError:
+    ENGINE = 'c'
+
+OUTPUT_ENCODING = 'utf-8-sig'
+STORE_SUFFIX = '.store'
+SNIFF_BYTES = 64 * 1024
+
+# Columns of public.companies (schema.sql + migration_add_keywords.sql)
+TEXT_COLUMNS = [
+    'id', 'company_name', 'industry', 'region', 'address', 'description', 'website_url',
+    'x_url', 'insta_url', 'tiktok_url', 'youtube_url', 'facebook_url', 'line_url',
+    'created_at', 'updated_at',
+    'keyword1', 'keyword2', 'keyword3', 'keyword4', 'keyword5',
+]
+COUNT_COLUMNS = [
+    'employee_count', 'x_followers', 'insta_followers', 'tiktok_followers',
+    'youtube_subscribers', 'facebook_followers', 'line_friends',
+]
+COMPANY_COLUMNS = TEXT_COLUMNS + COUNT_COLUMNS
+
+
+def is_store(path):
+    return str(path).rstrip('/\\').endswith(STORE_SUFFIX)
+
+
+def sniff_encoding(path):
+    """Guesses the file encoding from its first SNIFF_BYTES bytes."""
+    with open(path, 'rb') as f:
+        prefix = f.read(SNIFF_BYTES)
+    if prefix.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    # Incremental decoders tolerate a multi-byte character cut off at the prefix end
+    for encoding in ('utf-8', 'cp932'):
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(prefix, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return 'cp932'
+
+
+def read_companies(path, columns=None):
+    """
+    Reads a companies CSV with typed columns: text columns as strings (ids and
+    phone-like values keep their leading zeros), counts as nullable Int64.
+    columns: optional list of columns to read (others are never parsed).
+    """
+    if is_store(path):
+        from scraper_core.store import read_store
+        return read_store(path, columns)
+    encoding = sniff_encoding(path)
+    header = list(pd.read_csv(path, encoding=encoding, nrows=0).columns)
+    usecols = header if columns is None else [c for c in header if c in columns]
+    if ENGINE == 'pyarrow':
+        df = _read_arrow(path, encoding, header, usecols)
+    else:
+        df = pd.read_csv(path, encoding=encoding, dtype=str, usecols=usecols, low_memory=False)
+    return _typed(df)
+
+
+def iter_companies(path, columns=None, chunksize=50000):
+    """
+    Same as read_companies, but yields DataFrames of about `chunksize` rows so a
+    large file is never held in memory at once. The index continues across chunks.
+    """
+    if is_store(path):
+        yield read_companies(path, columns)
+        return
+    encoding = sniff_encoding(path)
+    header = list(pd.read_csv(path, encoding=encoding, nrows=0).columns)
+    usecols = header if columns is None else [c for c in header if c in columns]
+    if ENGINE == 'pyarrow':
+        names = [f"c{i}" for i in range(len(header))]
+        wanted = [names[i] for i, c in enumerate(header) if c in usecols]
+        reader = pa_csv.open_csv(path, **_arrow_options(encoding, names, wanted, block_size=1 << 22))
+        start = 0
+        for batch in reader:
+            df = batch.to_pandas()
+            df.columns = [header[names.index(n)] for n in wanted]
+            df.index = pd.RangeIndex(start, start + len(df))
+            start += len(df)
+            yield _typed(df)
+    else:
+        for df in pd.read_csv(path, encoding=encoding, dtype=str, usecols=usecols, chunksize=chunksize):
+            yield _typed(df)
+
+
+def _typed(df):
+    # Trailing commas in exported sheets produce empty "Unnamed: N" columns
+    empty_unnamed = [c for c in df.columns
+                     if (c == '' or str(c).startswith('Unnamed:')) and df[c].isna().all()]
+    if empty_unnamed:
+        df = df.drop(columns=empty_unnamed)
+
+    for col in COUNT_COLUMNS:
+        if col in df.columns:
+            # Earlier outputs wrote counts as floats ("1234.0")
+            df[col] = pd.to_numeric(df[col], errors='coerce').round().astype('Int64')
+    return df
+
+
+def _read_arrow(path, encoding, header, usecols):
+    # pandas' engine='pyarrow' infers types first and casts to str afterwards,
+    # which turns "001" into "1"; declaring every column as string avoids that.
+    # Column names come from pandas so duplicates / blanks match the C engine.
+    names = [f"c{i}" for i in range(len(header))]
+    wanted = [names[i] for i, c in enumerate(header) if c in usecols]
+    table = pa_csv.read_csv(path, **_arrow_options(encoding, names, wanted))
+    df = table.to_pandas()
+    df.columns = [header[names.index(n)] for n in wanted]
+    return df
+
+
+def _arrow_options(encoding, names, wanted, block_size=None):
+    read_options = pa_csv.ReadOptions(encoding=encoding, column_names=names, skip_rows=1)
+    if block_size:
+        read_options.block_size = block_size
+    return {
+        'read_options': read_options,
+        'convert_options': pa_csv.ConvertOptions(
+            column_types={n: pa.string() for n in names},
+            include_columns=wanted,
+            strings_can_be_null=True),
+        'parse_options': pa_csv.ParseOptions(newlines_in_values=True),
+    }
+
+
+def write_companies(df, path):
+    """Writes df as utf-8-sig, atomically (temp file + replace). Stores only get df's columns."""
+    if is_store(path):
+        from scraper_core.store import write_store
+        return write_store(df, path)
+    tmp = path + '.tmp'
+    df.to_csv(tmp, index=False, encoding=OUTPUT_ENCODING)
+    os.replace(tmp, path)
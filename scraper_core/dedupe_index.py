@@ -0,0 +1,155 @@
+"""
+In-memory membership index of known companies for discovery de-duplication.
+
+Keys are canonical domains ('d:example.co.jp') and normalized company names
+('n:グリーンハウス'). They are persisted as a sorted key file and loaded into a
+Bloom filter at startup, so checking a search hit is a few local hash probes;
+only a probable hit (possibly a false positive, ~FALSE_POSITIVE_RATE) needs a
+database query to confirm. The key file is rebuilt from the table when it is
+older than KEYS_MAX_AGE or was written with another KEYS_VERSION.
+"""
+import hashlib
+import math
+import os
+import re
+import time
+
+from scraper_core.text import company_name_key, normalize_text, get_domain
+
+KEYS_FILE = os.environ.get('KNOWN_KEYS_FILE', 'known_companies.keys')
+KEYS_MAX_AGE = 24 * 3600
+KEYS_VERSION = 3  # Bump when the key format changes; older key files are rebuilt
+_HEADER = f"#version {KEYS_VERSION}"
+FALSE_POSITIVE_RATE = 0.001
+MIN_CAPACITY = 100000
+# Separators and legal words between the runs of a name as it is written
+_RUN_SPLIT_RE = re.compile(r'[\s,.・･()（）/&＆%_]+|株式会社|有限会社|合同会社|\(株\)|（株）')
+
+
+def domain_key(url):
+    d = get_domain(url)
+    return f"d:{d}" if d else None
+
+
+def name_key(name):
+    core = company_name_key(name)
+    return f"n:{core}" if core else None
+
+
+def query_terms(name):
+    """
+    Substrings for fetching candidate rows with ilike: the longest run of the name
+    as written and of its NFKC form. Stored names keep their widths, spaces and
+    suffixes, which name_key folds away, so candidates are compared by name_key.
+    """
+    terms = []
+    for form in (str(name or ''), normalize_text(name)):
+        runs = [r for r in _RUN_SPLIT_RE.split(form) if r]
+        if runs:
+            terms.append(max(runs, key=len))
+    return list(dict.fromkeys(terms))
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=FALSE_POSITIVE_RATE):
+        capacity = max(int(capacity), 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        # Double hashing: h1 + i * h2 gives k independent-enough positions from one digest
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key):
+        for p in self._positions(key):
+            self.bits[p >> 3] |= 1 << (p & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+
+class DedupeIndex:
+    """Only the Bloom filter stays in memory; the keys themselves live in the sorted key file."""
+
+    def __init__(self, count, built_at):
+        self.count = count
+        self.built_at = built_at
+        self.added = set()  # Keys inserted this run (not in the table yet)
+        self.bloom = BloomFilter(max(count * 2, MIN_CAPACITY))
+
+    @classmethod
+    def load(cls, path=KEYS_FILE):
+        count = sum(1 for _ in _read_keys(path))
+        index = cls(count, os.path.getmtime(path))
+        for key in _read_keys(path):
+            index.bloom.add(key)
+        return index
+
+    @classmethod
+    def build(cls, rows, path=KEYS_FILE):
+        """Writes the sorted key file from rows (dicts with company_name / website_url) and loads it."""
+        keys = set()
+        for row in rows:
+            for key in (domain_key(row.get('website_url')), name_key(row.get('company_name'))):
+                if key: keys.add(key)
+        _write_keys(path, sorted(keys), time.time())
+        return cls.load(path)
+
+    def might_contain(self, name, url):
+        """Returns the first key that is probably known, or None if both are certainly new."""
+        for key in (domain_key(url), name_key(name)):
+            if key and key in self.bloom:
+                return key
+        return None
+
+    def add(self, name, url):
+        for key in (domain_key(url), name_key(name)):
+            if key:
+                self.bloom.add(key)
+                self.added.add(key)
+
+    def save(self, path=KEYS_FILE):
+        """Merges the keys added this run into the key file, keeping its build time."""
+        if not self.added: return
+        keys = set(_read_keys(path))
+        _write_keys(path, sorted(keys | self.added), self.built_at)
+
+
+def _read_keys(path):
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip() and not line.startswith('#'):
+                yield line.rstrip('\n')
+
+
+def _is_current(path):
+    with open(path, encoding='utf-8') as f:
+        return f.readline().rstrip('\n') == _HEADER
+
+
+def _write_keys(path, keys, built_at):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(_HEADER + '\n')
+        f.writelines(k + '\n' for k in keys)
+    os.replace(tmp, path)
+    # The mtime records when the keys were read from the table, so merges don't postpone a rebuild
+    os.utime(path, (built_at, built_at))
+
+
+def load_or_build(fetch_rows, path=KEYS_FILE, max_age=KEYS_MAX_AGE):
+    """
+    Loads the key file if it is fresh, else rebuilds it from fetch_rows()
+    (an iterable of rows, e.g. a paged read of the companies table).
+    """
+    if os.path.exists(path) and time.time() - os.path.getmtime(path) < max_age and _is_current(path):
+        index = DedupeIndex.load(path)
+        print(f"[Index] Loaded {index.count} known keys from {path}")
+        return index
+    index = DedupeIndex.build(fetch_rows(), path)
+    print(f"[Index] Built {index.count} known keys into {path}")
+    return index
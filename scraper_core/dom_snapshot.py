@@ -0,0 +1,68 @@
+"""
+Everything validators read from a loaded profile page, in one WebDriver call.
+
+Each find_element / get_attribute / .text is a separate HTTP round trip to the
+driver, and the DOM fallbacks used to make dozens per profile. take_snapshot()
+runs a single execute_script and returns plain data; platform extract_browser()
+and validate() then work on that dict in Python:
+
+    {'url', 'title', 'body_text',
+     'meta':     {name or property: content}          (first tag wins)
+     'titled':   [{'tag', 'title', 'href'}]           elements with a title attribute,
+                                                      href of the enclosing link
+     'links':    [{'href', 'text', 'titles'}]         a[href*="followers"]
+     'e2e':      {data-e2e value: [text, ...]}
+     'selected': {name: [text, ...]}                  per-platform CSS selectors}
+"""
+
+MAX_TITLED = 500      # Elements with a title attribute (YouTube pages have many)
+MAX_TEXT = 300        # Characters kept per element text
+
+_SNAPSHOT_JS = """
+var selectors = arguments[0] || {}, maxTitled = arguments[1], maxText = arguments[2];
+function text(el) { return (el.innerText || el.textContent || '').trim().slice(0, maxText); }
+function each(selector, fn) { Array.prototype.forEach.call(document.querySelectorAll(selector), fn); }
+
+var meta = {};
+each('meta[name], meta[property]', function (m) {
+    var key = m.getAttribute('name') || m.getAttribute('property');
+    if (!(key in meta)) meta[key] = m.getAttribute('content') || '';
+});
+var titled = [];
+each('body [title]', function (el) {
+    if (titled.length >= maxTitled) return;
+    var a = el.closest('a');
+    titled.push({tag: el.tagName.toLowerCase(), title: el.getAttribute('title'), href: a ? a.getAttribute('href') : null});
+});
+var links = [];
+each('a[href*="followers"]', function (a) {
+    var titles = [];
+    Array.prototype.forEach.call(a.querySelectorAll('[title]'), function (t) { titles.push(t.getAttribute('title')); });
+    links.push({href: a.getAttribute('href'), text: text(a), titles: titles});
+});
+var e2e = {};
+each('[data-e2e]', function (el) {
+    var key = el.getAttribute('data-e2e');
+    (e2e[key] = e2e[key] || []).push(text(el));
+});
+var selected = {};
+for (var name in selectors) {
+    selected[name] = [];
+    each(selectors[name], function (el) { selected[name].push(text(el)); });
+}
+return {url: location.href, title: document.title, body_text: document.body ? document.body.innerText : '',
+        meta: meta, titled: titled, links: links, e2e: e2e, selected: selected};
+"""
+
+
+def take_snapshot(driver, selectors=None):
+    """One execute_script round trip; selectors: optional {name: css} collected into 'selected'."""
+    return driver.execute_script(_SNAPSHOT_JS, selectors or {}, MAX_TITLED, MAX_TEXT)
+
+
+def meta_content(dom, *names):
+    """First non-empty meta content among names ('description', 'og:description', ...)."""
+    for name in names:
+        content = dom['meta'].get(name)
+        if content: return content
+    return ""
@@ -0,0 +1,234 @@
+"""
+Headless Chrome fleet: launches, health-checks and recycles the browsers the
+scrapers attach to, instead of someone starting chrome.exe by hand per port.
+
+Each instance runs with its own copy of a logged-in base profile
+(PROFILES_DIR/<profile_name>, e.g. browser_profiles/ChromeProfile_X), cloned
+into FLEET_DIR without caches, so start-up takes seconds. Clones are named by
+process id and slot, so several processes draining the same work queue never
+share a profile directory; Fleet.close() removes them. An instance is
+restarted after RECYCLE_AFTER rows (Chrome memory only grows on long runs)
+and whenever its process or DevTools endpoint stops responding.
+
+Log in once per platform profile (opens a visible Chrome on the base profile):
+
+    python -m scraper_core.fleet login ChromeProfile_X https://x.com/i/flow/login
+    python -m scraper_core.fleet status
+
+Scrape scripts use it with FLEET_SIZE = N (see orchestrator.run).
+"""
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+from scraper_core.browser import setup_driver
+from scraper_core.http_fetch import HEADERS
+
+PROFILES_DIR = os.environ.get('FLEET_PROFILES_DIR', 'browser_profiles')  # Logged-in base profiles
+FLEET_DIR = os.environ.get('FLEET_DIR', 'browser_fleet')                 # Per-instance clones
+CHROME_CANDIDATES = ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome']
+RECYCLE_AFTER = 100      # Rows (a search plus a few profile loads each) per browser process
+STARTUP_TIMEOUT = 20     # Seconds for DevTools to come up
+HEALTH_TIMEOUT = 2
+# Not copied into clones: caches are rebuilt, locks belong to the base profile's process
+CLONE_IGNORE = shutil.ignore_patterns('Singleton*', '*.tmp', 'lockfile', 'Crashpad', 'Cache', 'Code Cache',
+                                      'GPUCache', 'DawnCache', 'GrShaderCache', 'ShaderCache', 'CacheStorage')
+
+
+def chrome_binary():
+    path = os.environ.get('CHROME_BINARY')
+    if path: return path
+    for name in CHROME_CANDIDATES:
+        path = shutil.which(name)
+        if path: return path
+    raise RuntimeError("No Chrome/Chromium binary found; set CHROME_BINARY.")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def devtools_alive(port, timeout=HEALTH_TIMEOUT):
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=timeout) as res:
+            return res.status == 200
+    except Exception:
+        return False
+
+
+def chrome_args(port, user_data_dir, headless=True):
+    args = [
+        chrome_binary(),
+        f"--remote-debugging-port={port}",
+        f"--user-data-dir={os.path.abspath(user_data_dir)}",
+        "--no-first-run", "--no-default-browser-check",
+        "--disable-dev-shm-usage", "--disable-background-networking",
+        "--window-size=1280,2000", "--lang=ja-JP",
+        # Headless Chrome announces itself in the UA; sites serve it a different page
+        f"--user-agent={HEADERS['User-Agent']}",
+    ]
+    if headless:
+        args += ["--headless=new", "--disable-gpu"]
+    if hasattr(os, 'geteuid') and os.geteuid() == 0:
+        args.append("--no-sandbox")  # Chrome refuses to run as root with the sandbox
+    args.append("about:blank")
+    return args
+
+
+class ManagedBrowser:
+    """One Chrome process plus its attached driver. Workers call driver() per row and task_done() after it."""
+
+    def __init__(self, profile_name, slot, headless=True, recycle_after=RECYCLE_AFTER):
+        self.profile_name = profile_name
+        self.slot = slot
+        self.headless = headless
+        self.recycle_after = recycle_after
+        # Slots are per process: the pid keeps two processes off the same profile lock
+        self.user_data_dir = os.path.join(FLEET_DIR, f"{profile_name}_{os.getpid()}_{slot}")
+        self.port = None
+        self.proc = None
+        self._driver = None
+        self.tasks = 0
+        self.restarts = 0
+
+    def _clone_profile(self):
+        if os.path.isdir(self.user_data_dir): return
+        base = os.path.join(PROFILES_DIR, self.profile_name)
+        if os.path.isdir(base):
+            shutil.copytree(base, self.user_data_dir, ignore=CLONE_IGNORE)
+        else:
+            print(f"  [Fleet] No base profile {base}; {self.profile_name} starts logged out.")
+            os.makedirs(self.user_data_dir, exist_ok=True)
+
+    def start(self):
+        self._clone_profile()
+        self.port = free_port()
+        self.proc = subprocess.Popen(chrome_args(self.port, self.user_data_dir, self.headless),
+                                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                     start_new_session=True)  # Ctrl+C reaches Python only; close() stops Chrome
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while not devtools_alive(self.port, timeout=0.5):
+            if self.proc.poll() is not None or time.monotonic() > deadline:
+                self._kill()
+                raise RuntimeError(f"Chrome for {self.profile_name} (slot {self.slot}) did not start")
+            time.sleep(0.2)
+        try:
+            self._driver = setup_driver(self.port, self.profile_name)
+        except Exception:
+            self._kill()  # Do not leave the launched Chrome running
+            raise
+        self.tasks = 0
+        return self
+
+    def healthy(self):
+        return self.proc is not None and self.proc.poll() is None and devtools_alive(self.port)
+
+    def restart(self, reason):
+        print(f"  [Fleet] Restarting {self.profile_name} slot {self.slot}: {reason}")
+        self.quit()
+        self.restarts += 1
+        return self.start()
+
+    def driver(self):
+        """The attached driver, after restarting a crashed or worn-out browser."""
+        if self.proc is None:
+            self.start()
+        elif self.proc.poll() is not None:
+            self.restart(f"process exited ({self.proc.returncode})")
+        elif self.tasks >= self.recycle_after:
+            self.restart(f"recycled after {self.tasks} rows")
+        return self._driver
+
+    def task_done(self, failed=False):
+        self.tasks += 1
+        # A failed row may mean a hung or dead browser; check before the next one
+        if failed and not self.healthy():
+            self.restart("health check failed")
+
+    def quit(self):
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except: pass
+            self._driver = None
+        self._kill()
+
+    def remove_clone(self):
+        shutil.rmtree(self.user_data_dir, ignore_errors=True)
+
+    def _kill(self):
+        if self.proc is None: return
+        if self.proc.poll() is None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+        self.proc = None
+
+
+class Fleet:
+    def __init__(self, headless=True, recycle_after=RECYCLE_AFTER):
+        self.headless = headless
+        self.recycle_after = recycle_after
+        self.browsers = []
+        self._lock = threading.Lock()
+
+    def launch(self, profile_name):
+        """Starts one more instance of profile_name and returns its ManagedBrowser."""
+        with self._lock:
+            slot = sum(1 for b in self.browsers if b.profile_name == profile_name)
+            browser = ManagedBrowser(profile_name, slot, self.headless, self.recycle_after)
+            self.browsers.append(browser)
+        browser.start()
+        print(f"  [Fleet] {profile_name} slot {slot} up on port {browser.port}")
+        return browser
+
+    def close(self):
+        for b in self.browsers:
+            b.quit()
+            b.remove_clone()
+        restarts = sum(b.restarts for b in self.browsers)
+        print(f"[Fleet] Stopped {len(self.browsers)} browser(s); {restarts} restart(s) during the run.")
+
+
+def login(profile_name, url=None):
+    """Opens a visible Chrome on the base profile so a person can log in once; clones copy the session."""
+    base = os.path.join(PROFILES_DIR, profile_name)
+    os.makedirs(base, exist_ok=True)
+    args = chrome_args(free_port(), base, headless=False)
+    if url: args[-1] = url
+    print(f"Log in, then close the browser. Profile: {base}")
+    subprocess.run(args)
+    # Clones made from the old profile (<profile_name>_<pid>_<slot>) would still be logged out
+    for name in os.listdir(FLEET_DIR) if os.path.isdir(FLEET_DIR) else []:
+        if name.rsplit('_', 2)[0] == profile_name:
+            shutil.rmtree(os.path.join(FLEET_DIR, name), ignore_errors=True)
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+    if command == 'login' and len(sys.argv) > 2:
+        login(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+    elif command == 'status':
+        profiles = sorted(os.listdir(PROFILES_DIR)) if os.path.isdir(PROFILES_DIR) else []
+        clones = sorted(os.listdir(FLEET_DIR)) if os.path.isdir(FLEET_DIR) else []
+        try:
+            binary = chrome_binary()
+        except RuntimeError as e:
+            binary = str(e)
+        print(json.dumps({'chrome': binary, 'base_profiles': profiles, 'clones': clones}, indent=2))
+    else:
+        print("Usage: python -m scraper_core.fleet [status | login <profile_name> [url]]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Streaming extraction of links and head metadata from HTML.
+
+Instead of building a full BeautifulSoup tree, responses are tokenized chunk by
+chunk as they arrive and reading stops as soon as the caller has what it needs
+(e.g. every SNS link found, or the end of <head>). Links go through an
+incremental parser (lxml's HTMLPullParser when installed, else the stdlib
+HTMLParser); title / meta tags go through a compiled-regex fast path.
+"""
+import codecs
+import html
+import re
+from html.parser import HTMLParser
+
+try:
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+MAX_BYTES = 2 * 1024 * 1024  # Never read more than this per page
+CHUNK_SIZE = 16 * 1024
+HEAD_LIMIT = 256 * 1024      # Characters of <head> kept for the regex pass
+HEAD_END_OVERLAP = 32        # Tail of the previous chunk searched again, for a '</head >' split across chunks
+
+_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w\-]+)', re.I)
+_HEAD_END_RE = re.compile(r'</head\s*>|<body[\s>]', re.I)
+_TITLE_RE = re.compile(r'<title[^>]*>(.*?)</title\s*>', re.I | re.S)
+_META_RE = re.compile(r'<meta\s[^>]*>', re.I)
+_ATTR_RE = re.compile(r'([\w:\-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))')
+
+
+def sniff_charset(prefix, header_charset=None):
+    """Charset from the Content-Type header, else the <meta charset>, else utf-8."""
+    for candidate in (header_charset, _meta_charset(prefix)):
+        if not candidate: continue
+        try:
+            return codecs.lookup(candidate).name
+        except LookupError:
+            continue
+    return 'utf-8'
+
+
+def _meta_charset(prefix):
+    m = _CHARSET_RE.search(prefix[:4096])
+    return m.group(1).decode('ascii', 'ignore') if m else None
+
+
+def parse_head(text):
+    """Regex fast path: (title, {meta name/property: content}) from the <head> markup."""
+    m = _TITLE_RE.search(text)
+    title = html.unescape(m.group(1)).strip() if m else ''
+    meta = {}
+    for tag in _META_RE.findall(text):
+        attrs = {a.lower(): html.unescape(v1 or v2 or v3) for a, v1, v2, v3 in _ATTR_RE.findall(tag)}
+        key = attrs.get('name') or attrs.get('property')
+        if key and 'content' in attrs:
+            meta.setdefault(key.lower(), attrs['content'])
+    return title, meta
+
+
+class _StdlibLinks(HTMLParser):
+    def __init__(self, scanner):
+        super().__init__(convert_charrefs=True)
+        self.scanner = scanner
+        self.href = None
+        self.text = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            self.href = dict(attrs).get('href')
+            self.text = []
+
+    def handle_data(self, data):
+        if self.href is not None:
+            self.text.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == 'a' and self.href is not None:
+            self.scanner._link(self.href, ''.join(self.text))
+            self.href = None
+
+
+class _LxmlLinks:
+    def __init__(self, scanner):
+        self.scanner = scanner
+        self.parser = etree.HTMLPullParser(events=('end',), tag='a')
+
+    def feed(self, text):
+        self.parser.feed(text)
+        for _, el in self.parser.read_events():
+            href = el.get('href')
+            if href is not None:
+                self.scanner._link(href, ''.join(el.itertext()))
+            el.clear(keep_tail=True)
+
+    def close(self):
+        try:
+            self.parser.close()
+        except Exception: pass
+
+
+class PageScanner:
+    """
+    Feed it raw response chunks; it calls on_link(href, text) for every <a href>
+    (stop early by returning True) and collects title / meta from <head>.
+    head_only: skip link parsing and stop at the end of <head>.
+    Check `.done` after each feed() and stop reading when it is True.
+    """
+
+    def __init__(self, on_link=None, head_only=False, header_charset=None, max_bytes=MAX_BYTES):
+        self.on_link = on_link
+        self.head_only = head_only
+        self.header_charset = header_charset
+        self.max_bytes = max_bytes
+        self.title = ''
+        self.meta = {}
+        self.done = False
+        self._decoder = None
+        self._pending = b''
+        self._head = []
+        self._head_len = 0
+        self._head_tail = ''
+        self._head_done = False
+        self._read = 0
+        self._links = None if head_only else (_LxmlLinks(self) if HAS_LXML else _StdlibLinks(self))
+
+    def _link(self, href, text):
+        if self.done or not self.on_link: return
+        if self.on_link(href.strip(), ' '.join(text.split())):
+            self.done = True
+
+    def feed(self, chunk):
+        if self.done: return True
+        self._read += len(chunk)
+        if self._decoder is None:
+            self._pending += chunk
+            # Wait for enough bytes to see a <meta charset>
+            if len(self._pending) < 1024 and self._read < self.max_bytes: return False
+            chunk, self._pending = self._pending, b''
+            encoding = sniff_charset(chunk, self.header_charset)
+            self._decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        self._text(self._decoder.decode(chunk))
+        if self._read >= self.max_bytes:
+            self.close()
+        return self.done
+
+    def _text(self, text):
+        if not self._head_done:
+            # Only the new text is searched (joining and rescanning the head per chunk is quadratic)
+            window = self._head_tail + text
+            m = _HEAD_END_RE.search(window)
+            self._head.append(text)
+            self._head_len += len(text)
+            self._head_tail = window[-HEAD_END_OVERLAP:]
+            if m or self._head_len > HEAD_LIMIT:
+                joined = ''.join(self._head)
+                end = self._head_len - len(window) + m.start() if m else None
+                self.title, self.meta = parse_head(joined[:end])
+                self._head_done = True
+                self._head = []
+                self._head_tail = ''
+                if self.head_only:
+                    self.done = True
+                    return
+        if self._links is not None and not self.done:
+            self._links.feed(text)
+
+    def close(self):
+        """Flushes buffered input. Safe to call more than once."""
+        if self._decoder is None and self._pending:
+            chunk, self._pending = self._pending, b''
+            self._decoder = codecs.getincrementaldecoder(sniff_charset(chunk, self.header_charset))(errors='replace')
+            self._text(self._decoder.decode(chunk))
+        if not self._head_done and self._head:
+            # No </head>: whatever we saw is the head
+            self.title, self.meta = parse_head(''.join(self._head))
+            self._head_done = True
+        if self._links is not None and not self.done:
+            self._links.close()
+        self.done = True
+
+
+def scan_bytes(data, on_link=None, head_only=False, header_charset=None):
+    """PageScanner over an in-memory body, in CHUNK_SIZE steps (still stops early)."""
+    scanner = PageScanner(on_link, head_only, header_charset)
+    for i in range(0, len(data), CHUNK_SIZE):
+        if scanner.feed(data[i:i + CHUNK_SIZE]): break
+    scanner.close()
+    return scanner
@@ -0,0 +1,86 @@
+import threading
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from scraper_core.rate_limit import get_pacer, Throttled, STATIC_TIER
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept-Language': 'ja,en-US;q=0.8,en;q=0.6',
+}
+TIMEOUT = 10
+POOL_SIZE = 10
+
+# requests.Session is not guaranteed thread-safe, so each pool worker gets its own
+# keep-alive session (connections are reused across rows within that worker).
+_local = threading.local()
+
+
+def get_session():
+    """Returns this thread's pooled keep-alive session."""
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update(HEADERS)
+        # 429 / 503 are not retried here: they slow the domain down in the Pacer instead
+        retry = Retry(total=2, backoff_factor=0.5, status_forcelist=(500, 502, 504))
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _local.session = session
+    return session
+
+
+def _meta(soup, **attrs):
+    tag = soup.find('meta', attrs=attrs)
+    return tag.get('content', '') if tag else ''
+
+
+def fetch_page(url):
+    """
+    Fetches a page with plain HTTP and returns the fields validators use:
+    {'url', 'html', 'title', 'meta_description', 'og_title', 'og_description', 'text'}.
+    Returns None if the request fails, does not return 200, or lands on a block
+    page / login wall (reported to the Pacer under STATIC_TIER, apart from the
+    browser's pacing of the same domain, see rate_limit).
+    """
+    pacer = get_pacer()
+    try:
+        pacer.acquire(url, tier=STATIC_TIER)
+        res = get_session().get(url, timeout=TIMEOUT)
+    except Throttled as e:
+        print(f"  [HTTP] Skipped {url}: {e}")
+        return None
+    except Exception as e:
+        print(f"  [HTTP] Fetch failed for {url}: {e}")
+        return None
+    if res.status_code != 200:
+        pacer.report(url, res.status_code, res.url, tier=STATIC_TIER)
+        print(f"  [HTTP] {res.status_code} for {url}")
+        return None
+
+    html = res.text
+    soup = BeautifulSoup(html, 'html.parser')
+    title = soup.title.string.strip() if soup.title and soup.title.string else ''
+    meta_description = _meta(soup, name='description')
+    og_title = _meta(soup, property='og:title')
+    og_description = _meta(soup, property='og:description')
+    for tag in soup(['script', 'style', 'noscript']):
+        tag.decompose()
+    body_text = soup.get_text(' ', strip=True)
+    # Visible text only: raw HTML mentions reCAPTCHA on plenty of ordinary pages
+    if pacer.report(url, res.status_code, res.url, f"{title} {body_text}", tier=STATIC_TIER) != 'ok':
+        return None
+
+    return {
+        'url': res.url,
+        'html': html,
+        'title': title,
+        'meta_description': meta_description,
+        'og_title': og_title,
+        'og_description': og_description,
+        # Everything a name/official/domain check can see on a static page
+        'text': ' '.join([title, og_title, meta_description, og_description, body_text]),
+    }
@@ -0,0 +1,210 @@
+"""
+Append-only write-ahead journal for scrape results.
+
+Every processed row is appended as one JSON line instead of rewriting the whole
+CSV. The CSV is only rewritten on compaction (end of run, or on demand with
+`python -m scraper_core.journal <output_file> [input_file]`), and resume
+replays whatever the journals hold on top of the last compacted file.
+
+Each process writes its own journal file, so several processes draining the
+same work queue never interleave writes; replay merges all of them by timestamp.
+"""
+import glob
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+from scraper_core.csv_io import is_store, read_companies, write_companies
+
+FSYNC_INTERVAL = 10  # fsync after this many appends (each append is still flushed)
+LOCK_TIMEOUT = 120
+# Records newer than (compaction start - margin) are replayed again next time. The
+# margin covers records another process timestamped just before we read its journal
+# but flushed just after; re-applying them is idempotent.
+WATERMARK_MARGIN = 60
+
+
+def journal_path(output_file, worker_id=None):
+    if worker_id:
+        # host:pid -> filesystem-safe
+        return f"{output_file}.journal.{worker_id.replace(':', '-')}.jsonl"
+    return output_file + '.journal.jsonl'
+
+
+def all_journals(output_file):
+    return sorted(glob.glob(glob.escape(output_file) + '.journal*.jsonl'))
+
+
+def read_watermark(output_file):
+    """Timestamp up to which journal records are already in output_file (0 if unknown)."""
+    try:
+        with open(output_file + '.compacted', encoding='utf-8') as f:
+            return float(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0.0
+
+
+def _json_value(val):
+    # numpy scalars / NaN / pd.NA are not JSON serializable as-is
+    if val is None or val is pd.NA: return None
+    if hasattr(val, 'item'): val = val.item()
+    if isinstance(val, float) and val != val: return None
+    return val
+
+
+class Journal:
+    def __init__(self, path):
+        self.path = path
+        self._fh = open(path, 'a', encoding='utf-8')
+        self._pending = 0
+
+    def append(self, idx, row_id, updates):
+        record = {
+            'idx': int(idx),
+            'id': _json_value(row_id),
+            'ts': time.time(),
+            'updates': {k: _json_value(v) for k, v in (updates or {}).items()},
+        }
+        self._fh.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._fh.flush()
+        self._pending += 1
+        if self._pending >= FSYNC_INTERVAL:
+            os.fsync(self._fh.fileno())
+            self._pending = 0
+
+    def close(self):
+        if self._fh.closed: return
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._fh.close()
+
+
+def read_records(path):
+    """Yields journal records. A torn last line (crash mid-write) is skipped."""
+    if not os.path.exists(path): return
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line: continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                print(f"[Journal] Skipping unreadable line in {path}")
+
+
+def replay(df, paths, since=0.0):
+    """
+    Applies journaled updates from one or more journals to df in place, oldest
+    first, skipping records at or before `since`. Rows are matched by `id` when available.
+    """
+    if isinstance(paths, str): paths = [paths]
+    id_to_idx = None
+    if 'id' in df.columns:
+        id_to_idx = {v: i for i, v in zip(df.index, df['id']) if pd.notna(v)}
+
+    records = [rec for p in paths for rec in read_records(p) if rec.get('ts', 0) > since]
+    records.sort(key=lambda r: r.get('ts', 0))
+
+    applied = 0
+    for rec in records:
+        idx = rec['idx']
+        if id_to_idx is not None and rec.get('id') is not None:
+            idx = id_to_idx.get(rec['id'], id_to_idx.get(str(rec['id']), idx))
+        if idx not in df.index: continue
+        for col, val in rec['updates'].items():
+            if col not in df.columns: df[col] = None
+            df.at[idx, col] = val
+        applied += 1
+    if applied:
+        print(f"[Journal] Replayed {applied} record(s) from {len(paths)} journal(s)")
+    return applied
+
+
+def journal_columns(paths, since=0.0):
+    """Columns updated by records newer than `since`, in first-seen order."""
+    cols = {}
+    for path in paths:
+        for rec in read_records(path):
+            if rec.get('ts', 0) > since:
+                cols.update(dict.fromkeys(rec['updates']))
+    return list(cols)
+
+
+class _CompactionLock:
+    """Cross-process lock file so two compactions never overwrite each other."""
+
+    def __init__(self, output_file):
+        self.path = output_file + '.lock'
+
+    def __enter__(self):
+        deadline = time.time() + LOCK_TIMEOUT
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.close(fd)
+                return self
+            except FileExistsError:
+                if time.time() > deadline:
+                    print(f"[Journal] Breaking stale lock {self.path}")
+                    os.remove(self.path)
+                    continue
+                time.sleep(0.5)
+
+    def __exit__(self, *exc):
+        try:
+            os.remove(self.path)
+        except OSError: pass
+
+
+def compact(output_file, input_file, truncate=None):
+    """
+    Rebuilds output_file from the last compacted file (or input_file) plus every
+    journal, writes it atomically, then truncates the journals in `truncate`
+    (default: all; pass only your own while other processes are running).
+    Reading from disk rather than one process's DataFrame keeps results written
+    by other processes. A columnar store only reads and rewrites the journaled columns.
+    """
+    with _CompactionLock(output_file):
+        started = time.time()
+        paths = all_journals(output_file)
+        written = None
+        if os.path.exists(output_file):
+            since = read_watermark(output_file)
+            if is_store(output_file):
+                # 'id' is read to match journal entries to rows; only the journaled columns are written
+                written = journal_columns(paths, since)
+                df = read_companies(output_file, ['id'] + written)
+            else:
+                df = read_companies(output_file)
+        else:
+            df = read_companies(input_file)
+            since = 0.0
+        replay(df, paths, since)
+        write_companies(df if written is None else df[[c for c in written if c in df.columns]], output_file)
+        with open(output_file + '.compacted', 'w', encoding='utf-8') as f:
+            f.write(str(started - WATERMARK_MARGIN))
+        # Crash between replace and truncate is safe: replaying the same updates is idempotent
+        for path in (paths if truncate is None else truncate):
+            try:
+                os.remove(path)
+            except FileNotFoundError: pass
+            except OSError:
+                open(path, 'w').close() # Still open elsewhere (Windows); empty it instead
+    return df
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python -m scraper_core.journal <output_file> [input_file]")
+        return
+    output_file = sys.argv[1]
+    input_file = sys.argv[2] if len(sys.argv) > 2 else 'companies.csv'
+    compact(output_file, input_file)
+    print(f"Compacted into {output_file}")
+
+
+if __name__ == "__main__":
+    main()
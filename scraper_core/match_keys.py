@@ -0,0 +1,261 @@
+"""
+Precomputed per-company match keys, kept in a sidecar SQLite index.
+
+Validators used to normalize the company name and parse the website URL on
+every call, then lowercase and copy the page text once per check. The keys are
+now computed once per company (orchestrator runs precompute() over every row
+at startup) and a page is normalized once with prepare_text(); every name or
+domain check is then a substring lookup:
+
+    keys = keys_for(company_name, website_url)
+    text = prepare_text(page_text)
+    name_in_text(keys, text), domain_in_text(keys, text)
+
+Keys (all NFKC, lowercase, without spaces):
+    names    full name and core name with legal suffixes (JP and EN) stripped
+    domain   registrable domain of the website ('greenhouse.co.jp')
+    handles  alphanumeric handle guesses (domain label, ASCII name, romaji of
+             an all-kana name); only for handle scoring (see candidates),
+             never matched against page text
+
+    python -m scraper_core.match_keys build <results_file>
+    python -m scraper_core.match_keys show <company_name> [website_url]
+    python -m scraper_core.match_keys status
+"""
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+from scraper_core.text import normalize_text, company_name_key, get_domain
+
+MATCH_KEYS_FILE = os.environ.get('MATCH_KEYS_FILE', 'match_keys.sqlite')
+KEYS_VERSION = 3  # Bump when build_keys changes; older rows are rebuilt on read
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS match_keys (
+    company TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    keys TEXT NOT NULL,
+    built_at REAL NOT NULL
+);
+"""
+
+_SPACE_RE = re.compile(r'\s+')
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]')
+# Second-level suffixes under which the registrable domain has three labels
+_SECOND_LEVEL = {'co', 'or', 'ne', 'ac', 'ad', 'ed', 'go', 'gr', 'lg', 'com', 'net', 'org', 'gov', 'edu'}
+MIN_NAME_LEN = 2  # Shorter variants would match almost any page
+MIN_HANDLE_LEN = 3
+MIN_ROMAJI_LEN = 4  # Short romaji ('ai', 'ion') is a fragment of too many handles
+
+# Hepburn romaji for katakana; two-character entries (キャ) are tried first
+_ROMAJI = {
+    'ア': 'a', 'イ': 'i', 'ウ': 'u', 'エ': 'e', 'オ': 'o',
+    'カ': 'ka', 'キ': 'ki', 'ク': 'ku', 'ケ': 'ke', 'コ': 'ko',
+    'サ': 'sa', 'シ': 'shi', 'ス': 'su', 'セ': 'se', 'ソ': 'so',
+    'タ': 'ta', 'チ': 'chi', 'ツ': 'tsu', 'テ': 'te', 'ト': 'to',
+    'ナ': 'na', 'ニ': 'ni', 'ヌ': 'nu', 'ネ': 'ne', 'ノ': 'no',
+    'ハ': 'ha', 'ヒ': 'hi', 'フ': 'fu', 'ヘ': 'he', 'ホ': 'ho',
+    'マ': 'ma', 'ミ': 'mi', 'ム': 'mu', 'メ': 'me', 'モ': 'mo',
+    'ヤ': 'ya', 'ユ': 'yu', 'ヨ': 'yo',
+    'ラ': 'ra', 'リ': 'ri', 'ル': 'ru', 'レ': 're', 'ロ': 'ro',
+    'ワ': 'wa', 'ヲ': 'o', 'ン': 'n',
+    'ガ': 'ga', 'ギ': 'gi', 'グ': 'gu', 'ゲ': 'ge', 'ゴ': 'go',
+    'ザ': 'za', 'ジ': 'ji', 'ズ': 'zu', 'ゼ': 'ze', 'ゾ': 'zo',
+    'ダ': 'da', 'ヂ': 'ji', 'ヅ': 'zu', 'デ': 'de', 'ド': 'do',
+    'バ': 'ba', 'ビ': 'bi', 'ブ': 'bu', 'ベ': 'be', 'ボ': 'bo',
+    'パ': 'pa', 'ピ': 'pi', 'プ': 'pu', 'ペ': 'pe', 'ポ': 'po',
+    'ヴ': 'vu', 'ァ': 'a', 'ィ': 'i', 'ゥ': 'u', 'ェ': 'e', 'ォ': 'o',
+    'ャ': 'ya', 'ュ': 'yu', 'ョ': 'yo',
+    'キャ': 'kya', 'キュ': 'kyu', 'キョ': 'kyo', 'シャ': 'sha', 'シュ': 'shu', 'ショ': 'sho',
+    'チャ': 'cha', 'チュ': 'chu', 'チョ': 'cho', 'ニャ': 'nya', 'ニュ': 'nyu', 'ニョ': 'nyo',
+    'ヒャ': 'hya', 'ヒュ': 'hyu', 'ヒョ': 'hyo', 'ミャ': 'mya', 'ミュ': 'myu', 'ミョ': 'myo',
+    'リャ': 'rya', 'リュ': 'ryu', 'リョ': 'ryo', 'ギャ': 'gya', 'ギュ': 'gyu', 'ギョ': 'gyo',
+    'ジャ': 'ja', 'ジュ': 'ju', 'ジョ': 'jo', 'ビャ': 'bya', 'ビュ': 'byu', 'ビョ': 'byo',
+    'ピャ': 'pya', 'ピュ': 'pyu', 'ピョ': 'pyo',
+    'ティ': 'ti', 'ディ': 'di', 'ファ': 'fa', 'フィ': 'fi', 'フェ': 'fe', 'フォ': 'fo',
+    'ウィ': 'wi', 'ウェ': 'we', 'ウォ': 'wo', 'シェ': 'she', 'ジェ': 'je', 'チェ': 'che',
+}
+
+
+def prepare_text(text):
+    """Page text in the form the keys are in: NFKC, lowercase, no whitespace. Do this once per page."""
+    return _SPACE_RE.sub('', normalize_text(text).lower())
+
+
+def to_katakana(s):
+    return ''.join(chr(ord(c) + 0x60) if 'ぁ' <= c <= 'ゖ' else c for c in s)
+
+
+def to_romaji(s):
+    """Romaji of a kana / ASCII string, None if it contains anything else (kanji needs a dictionary)."""
+    s = to_katakana(s)
+    out = []
+    i = 0
+    double = False
+    while i < len(s):
+        c = s[i]
+        pair = _ROMAJI.get(s[i:i + 2])
+        if c == 'ッ':
+            double = True
+            i += 1
+            continue
+        if c == 'ー':
+            i += 1
+            continue
+        roma = pair or _ROMAJI.get(c)
+        if roma is None:
+            if not c.isascii(): return None
+            roma = c
+        if double and roma[0] not in 'aeiou':
+            roma = roma[0] + roma
+        double = False
+        out.append(roma)
+        i += 2 if pair else 1
+    return ''.join(out)
+
+
+def registrable_domain(url):
+    """'https://shop.greenhouse.co.jp/x' -> 'greenhouse.co.jp'."""
+    host = get_domain(url).split(':')[0]
+    labels = [l for l in host.split('.') if l]
+    if len(labels) <= 2: return '.'.join(labels)
+    keep = 3 if labels[-2] in _SECOND_LEVEL else 2
+    return '.'.join(labels[-keep:])
+
+
+def build_keys(company_name, website_url=None):
+    full = prepare_text(company_name)
+    core = company_name_key(company_name)
+    names = [n for n in dict.fromkeys([full, core]) if len(n) >= MIN_NAME_LEN]
+    romaji = to_romaji(core) if core and not core.isascii() else None
+    if romaji and len(romaji) < MIN_ROMAJI_LEN: romaji = None
+
+    domain = registrable_domain(website_url)
+    handles = []
+    if domain: handles.append(_NON_ALNUM_RE.sub('', domain.split('.')[0]))
+    for n in (core, romaji):
+        if n: handles.append(_NON_ALNUM_RE.sub('', n))
+    handles = [h for h in dict.fromkeys(handles) if len(h) >= MIN_HANDLE_LEN]
+    return {'names': names, 'core': core, 'romaji': romaji, 'domain': domain, 'handles': handles}
+
+
+def name_in_text(keys, text):
+    """Full or core name in text (from prepare_text)."""
+    return any(n in text for n in keys['names'])
+
+
+def domain_in_text(keys, text):
+    d = keys['domain']
+    # basic sanity check, ignore short "t.co" styled noise
+    return bool(d) and len(d) > 4 and d in text
+
+
+def _company(company_name, website_url):
+    return f"{normalize_text(company_name)}\t{get_domain(website_url) if website_url else ''}"
+
+
+class MatchKeyIndex:
+    """Keys by company; the in-memory map is filled from the sidecar file or built on first use."""
+
+    def __init__(self, path=MATCH_KEYS_FILE):
+        self.path = path
+        self._local = threading.local()
+        self._memo = {}
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self):
+        # sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def get(self, company_name, website_url=None):
+        company = _company(company_name, website_url)
+        keys = self._memo.get(company)
+        if keys is not None: return keys
+        row = self._conn().execute("SELECT version, keys FROM match_keys WHERE company = ?", (company,)).fetchone()
+        if row and row[0] == KEYS_VERSION:
+            keys = json.loads(row[1])
+        else:
+            keys = build_keys(company_name, website_url)
+            self._store([(company, keys)])
+        self._memo[company] = keys
+        return keys
+
+    def precompute(self, companies):
+        """Loads (or builds and stores) the keys of every (company_name, website_url) in one pass."""
+        wanted = {}
+        for name, url in companies:
+            if name: wanted.setdefault(_company(name, url), (name, url))
+        conn = self._conn()
+        stored = {c: k for c, v, k in conn.execute("SELECT company, version, keys FROM match_keys")
+                  if v == KEYS_VERSION and c in wanted}
+        built = []
+        for company, (name, url) in wanted.items():
+            if company in stored:
+                self._memo[company] = json.loads(stored[company])
+            else:
+                keys = build_keys(name, url)
+                self._memo[company] = keys
+                built.append((company, keys))
+        self._store(built)
+        print(f"[MatchKeys] {len(wanted)} compan(ies): {len(stored)} loaded, {len(built)} built.")
+
+    def _store(self, items):
+        if not items: return
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN")
+        conn.executemany("INSERT OR REPLACE INTO match_keys(company, version, keys, built_at) VALUES(?, ?, ?, ?)",
+                         [(c, KEYS_VERSION, json.dumps(k, ensure_ascii=False), now) for c, k in items])
+        conn.execute("COMMIT")
+
+    def count(self):
+        return self._conn().execute("SELECT COUNT(*) FROM match_keys").fetchone()[0]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_match_keys():
+    """Process-wide index at MATCH_KEYS_FILE."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = MatchKeyIndex()
+        return _index
+
+
+def keys_for(company_name, website_url=None):
+    return get_match_keys().get(company_name, website_url)
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+    if command == 'build' and len(sys.argv) > 2:
+        import pandas as pd
+        from scraper_core.csv_io import read_companies
+        df = read_companies(sys.argv[2], ['company_name', 'website_url'])
+        urls = df['website_url'] if 'website_url' in df.columns else [None] * len(df)
+        get_match_keys().precompute(
+            (name, None if pd.isna(url) else url) for name, url in zip(df['company_name'], urls) if pd.notna(name))
+    elif command == 'show' and len(sys.argv) > 2:
+        print(json.dumps(build_keys(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None), ensure_ascii=False, indent=2))
+    elif command == 'status':
+        print(f"{MATCH_KEYS_FILE}: {get_match_keys().count()} compan(ies), version {KEYS_VERSION}")
+    else:
+        print("Usage: python -m scraper_core.match_keys [status | build <results_file> | show <company_name> [website_url]]")
+
+
+if __name__ == "__main__":
+    main()
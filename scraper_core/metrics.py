@@ -0,0 +1,256 @@
+"""
+Structured per-row metrics: one JSON line per (row, platform) next to the
+output file (<output_file>.metrics.jsonl), so a run can be analysed instead of
+read back from print() logs:
+
+    {"ts", "worker", "row", "company", "platform", "outcome", "reject", "error",
+     "stages": {"search": s, "navigate": s, "wait": s, "extract": s, "validate": s, "save": s},
+     "total": s,
+     "candidates": [{"url", "score", "result"}]}
+
+outcome:  found | updated | not_found | rejected | skipped | throttled | error
+reject / candidate result: valid or one of the REJECT_* codes
+
+Platform code records into the event of its own thread (the orchestrator
+calls start() per row and platform): `with stage('search'): ...`, candidate(),
+reject(), set_outcome(). Stage times add up over candidates. The orchestrator
+times the journal write as 'save' and appends the events from its single
+writer thread.
+
+    python -m scraper_core.metrics <output_file> [hours]
+
+prints rows/hour, p50/p95 per stage, hit rates per platform and the top
+reject reasons (of the last `hours` only, if given).
+"""
+import json
+import math
+import os
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+STAGES = ('search', 'navigate', 'wait', 'extract', 'validate', 'save')
+HITS = ('found', 'updated')
+NOT_ATTEMPTED = ('skipped', 'throttled')   # Left out of hit rates
+
+REJECT_NOT_PROFILE = 'not_profile_url'
+REJECT_NAME = 'name_mismatch'
+REJECT_DOMAIN = 'domain_mismatch'
+REJECT_LOW_POSTS = 'low_posts'
+REJECT_LOAD = 'load_error'
+REJECT_BLOCKED = 'blocked'
+
+_local = threading.local()
+
+
+def metrics_path(output_file):
+    return output_file + '.metrics.jsonl'
+
+
+class RowEvent:
+    def __init__(self, row, company, platform):
+        self.started = time.monotonic()
+        self.data = {'ts': time.time(), 'worker': f"{socket.gethostname()}:{os.getpid()}",
+                     'row': row, 'company': company, 'platform': platform,
+                     'outcome': None, 'reject': None, 'error': None,
+                     'stages': {}, 'total': None, 'candidates': []}
+
+    def add(self, name, seconds):
+        stages = self.data['stages']
+        stages[name] = round(stages.get(name, 0.0) + seconds, 4)
+
+    def finish(self, outcome=None, error=None):
+        """Outcome set by the platform (set_outcome) wins over the caller's default."""
+        if self.data['outcome'] is None:
+            self.data['outcome'] = outcome
+        if error is not None:
+            self.data['error'] = str(error)[:300]
+        self.data['total'] = round(time.monotonic() - self.started, 4)
+        if getattr(_local, 'event', None) is self:
+            _local.event = None
+        return self.data
+
+
+def start(row, company, platform):
+    """Starts the event for one row and platform on this thread."""
+    _local.event = RowEvent(row, company, platform)
+    return _local.event
+
+
+def current():
+    return getattr(_local, 'event', None)
+
+
+@contextmanager
+def stage(name):
+    """Adds the time spent in the block to stage `name` of this thread's event (no-op without one)."""
+    t0 = time.monotonic()
+    try:
+        yield
+    finally:
+        event = current()
+        if event is not None:
+            event.add(name, time.monotonic() - t0)
+
+
+def candidate(url, score=None):
+    event = current()
+    if event is None: return
+    event.data['candidates'].append({'url': url, 'score': None if score is None else round(score, 2), 'result': None})
+
+
+def _mark(result):
+    """Sets the result of the candidate being checked (the last one); a later tier overrides an earlier one."""
+    event = current()
+    if event is None: return None
+    if event.data['candidates']:
+        event.data['candidates'][-1]['result'] = result
+    return event
+
+
+def reject(reason):
+    """The candidate being checked failed with REJECT_* reason (the last reason is the row's)."""
+    event = _mark(reason)
+    if event is not None:
+        event.data['reject'] = reason
+
+
+def accept():
+    _mark('valid')
+
+
+def set_outcome(outcome):
+    event = current()
+    if event is not None:
+        event.data['outcome'] = outcome
+        # Rejected candidates before the hit do not make it a rejected row
+        if outcome in HITS:
+            event.data['reject'] = None
+
+
+class MetricsWriter:
+    """Appends events as JSON lines; used from one thread only (the orchestrator's writer)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._f = open(path, 'a', encoding='utf-8')
+
+    def write(self, events):
+        if not events: return
+        # One write per batch: concurrent processes appending to the file do not interleave lines
+        self._f.write(''.join(json.dumps(e, ensure_ascii=False) + '\n' for e in events))
+        self._f.flush()
+        self.count += len(events)
+
+    def close(self):
+        self._f.close()
+
+
+# --- Summary ---
+
+def read_events(path, since=None):
+    events = []
+    try:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    e = json.loads(line)
+                except ValueError:
+                    continue  # Torn last line of a killed run
+                if since is None or e.get('ts', 0) >= since:
+                    events.append(e)
+    except FileNotFoundError:
+        pass
+    return events
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of a non-empty list."""
+    values = sorted(values)
+    k = max(0, min(len(values) - 1, math.ceil(p / 100.0 * len(values)) - 1))
+    return values[k]
+
+
+def _active_hours(events):
+    """Wall-clock hours covered by the workers' runs (overlapping processes counted once)."""
+    spans = {}
+    for e in events:
+        lo, hi = spans.get(e['worker'], (e['ts'], e['ts']))
+        spans[e['worker']] = (min(lo, e['ts']), max(hi, e['ts'] + (e.get('total') or 0)))
+    total = 0.0
+    end = None
+    for lo, hi in sorted(spans.values()):
+        if end is not None and lo < end:
+            lo = end
+        if hi > lo:
+            total += hi - lo
+        end = hi if end is None else max(end, hi)
+    return total / 3600
+
+
+def summarize(events, top=10):
+    rows = {(e['worker'], e['row']) for e in events}
+    hours = _active_hours(events)
+    stages = {}
+    for e in events:
+        for name, seconds in e['stages'].items():
+            stages.setdefault(name, []).append(seconds)
+    stage_stats = {name: {'n': len(v), 'p50': round(percentile(v, 50), 3), 'p95': round(percentile(v, 95), 3),
+                          'total': round(sum(v), 1)}
+                   for name, v in stages.items()}
+
+    platforms = {}
+    for e in events:
+        p = platforms.setdefault(e['platform'], Counter())
+        p[e['outcome']] += 1
+    hit_rates = {}
+    for name, outcomes in platforms.items():
+        attempted = sum(n for o, n in outcomes.items() if o not in NOT_ATTEMPTED)
+        hits = sum(outcomes[o] for o in HITS)
+        hit_rates[name] = {'attempted': attempted, 'hits': hits,
+                           'hit_rate': round(hits / attempted, 3) if attempted else None,
+                           'outcomes': dict(outcomes)}
+
+    rejects = Counter(c['result'] for e in events for c in e['candidates'] if c['result'] not in (None, 'valid'))
+    return {'events': len(events), 'rows': len(rows), 'hours': round(hours, 3),
+            'rows_per_hour': round(len(rows) / hours, 1) if hours else None,
+            'stages': stage_stats, 'platforms': hit_rates, 'top_rejects': rejects.most_common(top)}
+
+
+def print_summary(path, since=None):
+    summary = summarize(read_events(path, since))
+    if not summary['events']:
+        print(f"No metrics in {path}.")
+        return
+    print(f"--- Metrics ({path}) ---")
+    print(f"  {summary['rows']} row(s) in {summary['hours']:.2f}h active: {summary['rows_per_hour']} rows/hour")
+    print("  Stage       n      p50      p95    total")
+    ordered = [s for s in STAGES if s in summary['stages']] + sorted(set(summary['stages']) - set(STAGES))
+    for name in ordered:
+        s = summary['stages'][name]
+        print(f"  {name:<9} {s['n']:>5} {s['p50']:>7.2f}s {s['p95']:>7.2f}s {s['total']:>7.0f}s")
+    for name, p in sorted(summary['platforms'].items()):
+        rate = f"{p['hit_rate'] * 100:.1f}%" if p['hit_rate'] is not None else "-"
+        outcomes = ", ".join(f"{o}={n}" for o, n in sorted(p['outcomes'].items(), key=lambda kv: str(kv[0])))
+        print(f"  {name}: hit rate {rate} ({p['hits']}/{p['attempted']}; {outcomes})")
+    if summary['top_rejects']:
+        print("  Top reject reasons: " + ", ".join(f"{r}={n}" for r, n in summary['top_rejects']))
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python -m scraper_core.metrics <output_file | metrics_file> [hours]")
+        return
+    path = sys.argv[1]
+    if not path.endswith('.metrics.jsonl'):
+        path = metrics_path(path)
+    since = time.time() - float(sys.argv[2]) * 3600 if len(sys.argv) > 2 else None
+    print_summary(path, since)
+
+
+if __name__ == "__main__":
+    main()
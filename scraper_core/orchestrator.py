@@ -0,0 +1,213 @@
+import os
+import time
+import pandas as pd
+
+from scraper_core import metrics
+from scraper_core.browser import setup_driver
+from scraper_core.csv_io import read_companies
+from scraper_core.fleet import Fleet
+from scraper_core.journal import Journal, journal_path, all_journals, read_watermark, replay, compact
+from scraper_core.match_keys import get_match_keys
+from scraper_core.platforms import get_platforms
+from scraper_core.pool import WorkerPool
+from scraper_core.rate_limit import Throttled, print_pacer_summary
+from scraper_core.readiness import print_wait_summary
+from scraper_core.work_queue import WorkQueue, queue_path, print_stats
+
+
+def company_key(idx, row):
+    """Stable task key: the id column when present, else the row position."""
+    row_id = row.get('id')
+    if pd.notna(row_id) and str(row_id).strip() != "":
+        return str(row_id)
+    return f"row:{idx}"
+
+
+def build_tasks(df, platforms):
+    """Yields queue tasks for every company/platform that still needs work."""
+    for idx, row in df.iterrows():
+        company_name = row['company_name']
+        if pd.isna(company_name) or company_name == "": continue
+        website_url = row.get('website_url')
+        website_url = None if pd.isna(website_url) else str(website_url)
+        for p in platforms:
+            existing = row.get(p.url_col)
+            if p.verify_existing or pd.isna(existing) or str(existing).strip() == "":
+                yield company_key(idx, row), p.name, idx, str(company_name), website_url
+
+
+def run(platform_names, input_file, output_file, ports=None, fleet_size=None):
+    """
+    Runs every enabled platform for each company in a single pass and writes
+    all result columns to one output file.
+
+    Work is claimed from a persistent queue next to the output file, so a
+    restarted (or additional) process simply continues where the queue stands.
+    Use `python -m scraper_core.work_queue <output_file> reset` for a fresh pass.
+
+    ports: optional {platform: [port, ...]} override of each plugin's debugger ports.
+    Worker k uses the k-th port of every platform, so the worker count is the
+    shortest port list.
+
+    fleet_size: launch that many headless Chrome workers per platform instead
+    (see fleet.py: cloned logged-in profiles, recycling, crash restarts); ports
+    and the manual login step are then not used.
+    """
+    platforms = get_platforms(platform_names)
+    for p in platforms:
+        if ports and p.name in ports:
+            p.ports = list(ports[p.name])
+
+    # 1. Load Data (only the columns the platforms use; compaction keeps the rest)
+    columns = ['id', 'company_name', 'website_url']
+    for p in platforms:
+        columns += [p.url_col, p.count_col]
+    if os.path.exists(output_file):
+        print(f"Resuming from {output_file}...")
+        df = read_companies(output_file, columns)
+        since = read_watermark(output_file)
+    elif os.path.exists(input_file):
+        print(f"Reading {input_file}...")
+        df = read_companies(input_file, columns)
+        since = 0.0
+    else:
+        print(f"Error: {input_file} not found.")
+        return
+
+    # Ensure columns exist
+    for p in platforms:
+        if p.url_col not in df.columns: df[p.url_col] = None
+        if p.count_col not in df.columns: df[p.count_col] = None
+
+    # Results since the last compaction live in the journals
+    replay(df, all_journals(output_file), since)
+
+    queue = WorkQueue(queue_path(output_file))
+    tasks = list(build_tasks(df, platforms))
+    # Name / domain / handle keys for every company, so validators only do lookups
+    get_match_keys().precompute((t[3], t[4]) for t in tasks)
+    added = queue.seed(tasks)
+    print(f"[Queue] {added} new task(s) queued.")
+    print_stats(queue)
+    queue.start_heartbeat()
+    jpath = journal_path(output_file, queue.worker)
+    journal = Journal(jpath)
+    # Per row and platform: stage timings, candidates, outcome (python -m scraper_core.metrics <output_file>)
+    metrics_writer = metrics.MetricsWriter(metrics.metrics_path(output_file))
+
+    # 2. Setup Drivers: one Chrome per platform per worker
+    fleet = Fleet() if fleet_size else None
+    if fleet:
+        slots = list(range(fleet_size))
+    else:
+        num_workers = min(len(p.ports) for p in platforms)
+        slots = [{p.name: p.ports[k] for p in platforms} for k in range(num_workers)]
+
+    def connect(slot):
+        if fleet:
+            return {p.name: fleet.launch(p.profile_name) for p in platforms}
+        return {p.name: setup_driver(slot[p.name], p.profile_name) for p in platforms}
+
+    def process_row(drivers, idx, task):
+        row, names = task
+        print(f"[{idx}] Processing: {row['company_name']}")
+        updates = {}
+        errors = {}
+        events = []
+        for p in platforms:
+            if p.name not in names: continue
+            browser = drivers[p.name] if fleet else None
+            event = metrics.start(idx, row['company_name'], p.name)
+            try:
+                result = p.process(browser.driver() if fleet else drivers[p.name], row)
+            except Exception as e:
+                print(f"  [{p.label}] [Error] {e}")
+                errors[p.name] = e
+                events.append(event.finish('throttled' if isinstance(e, Throttled) else 'error', e))
+                if fleet: browser.task_done(failed=True)
+                continue
+            events.append(event.finish('found' if result else 'not_found'))
+            if fleet: browser.task_done()
+            if result:
+                updates.update(result)
+        return {'updates': updates, 'errors': errors, 'events': events}
+
+    pool = WorkerPool(connect, slots, process_row)
+    drivers = pool.connect()
+    print("Driver connected successfully.")
+
+    login_platforms = [p for p in platforms if p.login_url and not fleet]
+    if login_platforms:
+        print("Opening login pages...")
+        for worker_drivers in drivers:
+            for p in login_platforms:
+                worker_drivers[p.name].get(p.login_url)
+        input("Please log in in every browser, then press Enter to start scraping...")
+
+    print("Starting scraping... Press Ctrl+C to stop and save.")
+    processed_count = 0
+    claimed = {}  # idx -> (company_key, [platform, ...]) for rows handed to workers
+
+    def rows_to_process():
+        names = [p.name for p in platforms]
+        while True:
+            task = queue.claim(names)
+            if task is None: return
+            key, idx, task_platforms = task
+            if idx not in df.index:
+                for n in task_platforms:
+                    queue.fail(key, n, f"row {idx} not in {output_file}")
+                continue
+            claimed[idx] = (key, task_platforms)
+            yield idx, (df.loc[idx], task_platforms)
+
+    def on_result(idx, result):
+        # Single writer: only this thread touches df and the journal
+        nonlocal processed_count
+        key, names = claimed.pop(idx)
+        if result is None:
+            for n in names: queue.fail(key, n, "worker error")
+            return
+        updates = result['updates']
+        if updates:
+            t0 = time.monotonic()
+            for col, val in updates.items():
+                df.at[idx, col] = val
+            journal.append(idx, df.at[idx, 'id'] if 'id' in df.columns else None, updates)
+            for event in result['events']:
+                if event['outcome'] in metrics.HITS:
+                    event['stages']['save'] = round(time.monotonic() - t0, 4)
+        metrics_writer.write(result['events'])
+        # Journal first, then mark done: a crash in between only repeats the row
+        for n in names:
+            error = result['errors'].get(n)
+            if isinstance(error, Throttled):
+                # Blocked or circuit open: come back after the cooldown without using up an attempt
+                queue.defer(key, n, error.retry_in, error)
+            elif error is not None:
+                queue.fail(key, n, error)
+            else:
+                queue.complete(key, n)
+        processed_count += 1
+
+    try:
+        pool.run(rows_to_process(), on_result)
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    except Exception as e:
+        print(f"An error occurred: {e}")
+    finally:
+        journal.close()
+        metrics_writer.close()
+        print(f"[Metrics] {metrics_writer.count} event(s) appended to {metrics_writer.path}")
+        print(f"Compacting {processed_count} processed row(s) into {output_file}...")
+        compact(output_file, input_file, truncate=[jpath])
+        queue.close()
+        if fleet:
+            fleet.close()
+        else:
+            pool.close()
+        print_stats(queue)
+        print_wait_summary()
+        print_pacer_summary()
+        print("Done.")
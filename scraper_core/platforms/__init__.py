@@ -0,0 +1,18 @@
+"""Platform plugins. Each one supplies search, candidate filter, stats extraction and validation rules."""
+from scraper_core.platforms.instagram import InstagramPlatform
+from scraper_core.platforms.tiktok import TikTokPlatform
+from scraper_core.platforms.youtube import YouTubePlatform
+from scraper_core.platforms.x import XPlatform
+
+PLATFORMS = {
+    'x': XPlatform,
+    'instagram': InstagramPlatform,
+    'tiktok': TikTokPlatform,
+    'youtube': YouTubePlatform,
+}
+
+
+def get_platforms(names=None):
+    """Instantiates the plugins for the given names (all platforms if None)."""
+    names = names or list(PLATFORMS)
+    return [PLATFORMS[n]() for n in names]
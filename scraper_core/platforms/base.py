@@ -0,0 +1,312 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from scraper_core import metrics
+from scraper_core.browser import safe_get
+from scraper_core.candidates import rank_candidates
+from scraper_core.dom_snapshot import take_snapshot, meta_content
+from scraper_core.http_fetch import fetch_page
+from scraper_core.match_keys import keys_for, prepare_text, name_in_text, domain_in_text
+from scraper_core.rate_limit import get_pacer, Throttled
+from scraper_core.readiness import wait_ready
+from scraper_core.search_cache import get_cache
+from scraper_core.snapshots import get_snapshots, FRESH_SECONDS
+from scraper_core.text import count_pattern
+
+# '1,234 Followers' / 'フォロワー1.2万人'; read with search_count
+FOLLOWERS_RE = count_pattern('followers|フォロワー', 'フォロワー')
+POSTS_RE = count_pattern('posts|件|ツイート|videos|本', '投稿')
+
+# HTTP fetches of the top-ranked candidates run in parallel on these threads
+# (long-lived, so each keeps its http_fetch keep-alive session)
+PREFETCH_WORKERS = 4
+_prefetch_pool = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS)
+
+
+class Platform:
+    """
+    Plugin interface for one SNS. Subclasses supply the search, the candidate
+    filter, stats extraction (static HTML and browser DOM) and validation rules;
+    this base class runs the shared search -> validate -> update loop.
+    """
+    name = None           # Key used for readiness conditions and CLI names
+    label = None          # Human readable name for logs
+    url_col = None        # CSV column holding the profile URL
+    count_col = None      # CSV column holding followers / subscribers
+    ports = []            # Debugger ports, one per worker
+    profile_name = "ChromeProfile"
+    login_url = None      # If set, the login page is opened before scraping starts
+    verify_existing = True  # Re-validate stored URLs (False: skip rows that have one)
+    max_candidates = 2    # How many top-ranked search results to validate before giving up
+    min_posts = 0         # Reject accounts with 0 < posts < min_posts
+    static_fetch = True   # Try the plain-HTTP tier before the browser
+    snapshot_selectors = None  # Extra {name: css} texts for the DOM snapshot (see dom_snapshot)
+
+    # --- Search ---
+
+    def search(self, driver, company_name):
+        """Returns candidates in search order: URLs or (url, text shown in the results) pairs."""
+        raise NotImplementedError
+
+    def filter_candidate(self, url):
+        """Returns True if the URL looks like a profile page for this platform."""
+        return True
+
+    def google_search(self, driver, company_name, href_contains):
+        """
+        Searches Google for '{company_name} {platform}' and returns filtered result
+        links as (url, title + snippet) pairs for ranking. Results are cached (see
+        search_cache), so re-runs skip the search. Raises Throttled when Google
+        answers with its /sorry/ page (the task is deferred, not failed).
+        """
+        query = f"{company_name} {self.name}"
+        cached = get_cache().get(query, self.name)
+        if cached is not None:
+            print(f"  [Cache] {len(cached)} candidate(s) for '{query}'")
+            return cached
+
+        candidates = []
+        try:
+            safe_get(driver, "https://www.google.com/")
+
+            # Determine search box
+            try:
+                search_box = WebDriverWait(driver, 5).until(
+                    EC.presence_of_element_located((By.NAME, "q"))
+                )
+            except:
+                # Fallback for some google versions
+                search_box = driver.find_element(By.CSS_SELECTOR, 'textarea[name="q"]')
+
+            search_box.clear()
+            search_box.send_keys(query)
+            search_box.send_keys(Keys.RETURN)
+
+            wait_ready(driver, 'google', 'results') # Wait for results
+            get_pacer().check("https://www.google.com/", final_url=driver.current_url)
+
+            results = driver.find_elements(By.XPATH, f'//a[contains(@href, "{href_contains}")]')
+            seen = set()
+            for res in results:
+                url = res.get_attribute('href')
+                if not url or url in seen: continue
+                seen.add(url)
+                if self.filter_candidate(url):
+                    candidates.append((url, self._result_text(res)))
+
+        except Throttled:
+            raise
+        except Exception as e:
+            print(f"  [Error] Google Search failed: {e}")
+            return candidates # Not cached: a failed search says nothing about the company
+
+        get_cache().put(query, self.name, candidates)
+        return candidates
+
+    def _result_text(self, link):
+        """Title and snippet of the Google result block around link (just the link text if not found)."""
+        try:
+            return link.find_element(By.XPATH, './ancestor::div[@data-hveid][1]').text
+        except:
+            try: return link.text
+            except: return ""
+
+    def prefetch(self, urls):
+        """
+        Fetches the static pages of urls concurrently. Returns {url: page}, with
+        False for failed fetches; URLs with a fresh snapshot are left out.
+        """
+        if not self.static_fetch: return {}
+        snapshots = get_snapshots()
+        urls = [u for u in urls if self.filter_candidate(u) and not snapshots.get(u, max_age=FRESH_SECONDS)]
+        pages = _prefetch_pool.map(fetch_page, urls)
+        return {u: page or False for u, page in zip(urls, pages)}
+
+    # --- Stats ---
+
+    def extract_static(self, page):
+        """
+        Stats from an HTTP-fetched page (see http_fetch.fetch_page).
+        Returns {'followers': n, 'posts': n} or None if the browser is needed.
+        """
+        return None
+
+    def extract_browser(self, dom):
+        """
+        Stats from a snapshot of the loaded browser page (see dom_snapshot.take_snapshot).
+        Returns {'followers': n, 'posts': n}.
+        """
+        raise NotImplementedError
+
+    # --- Validation ---
+
+    def validate(self, page_text, company_name, website_url, stats):
+        """Name / official / website-domain check, the profile-link domain check and the post-count rule."""
+        keys = keys_for(company_name, website_url)
+        text = prepare_text(page_text)
+
+        # Name Validation: full or core name OR contains "公式" (Official) OR Website Domain Match
+        name_match = name_in_text(keys, text)
+        official_match = "公式" in text or "official" in text
+
+        website_match = domain_in_text(keys, text)
+        if website_match:
+            print(f"  [Match] Website domain '{keys['domain']}' found in profile.")
+
+        if not (name_match or official_match or website_match):
+            print(f"  [Reject] Name '{keys['core']}' not found, 'official' not found, and website match failed.")
+            metrics.reject(metrics.REJECT_NAME)
+            return False
+
+        if self.domain_mismatch(keys, stats):
+            return False
+
+        posts = stats.get('posts', 0)
+        if posts > 0 and posts < self.min_posts:
+            print(f"  [Reject] Low posts: {posts} < {self.min_posts}")
+            metrics.reject(metrics.REJECT_LOW_POSTS)
+            return False
+
+        return True
+
+    def domain_mismatch(self, keys, stats):
+        """
+        True (and rejected as REJECT_DOMAIN) when the profile links to a website other
+        than the company's, e.g. greenhouse.co.jp vs green-house.co.jp. Needs the
+        extractor to report stats['profile_domain'].
+        """
+        expected_domain = keys['domain']
+        profile_domain = stats.get('profile_domain')
+        if not expected_domain or not profile_domain: return False
+        if expected_domain in profile_domain or profile_domain in expected_domain: return False
+        print(f"  [Reject Domain] Mismatch: Expected {expected_domain}, Found {profile_domain}")
+        metrics.reject(metrics.REJECT_DOMAIN)
+        return True
+
+    def verify(self, driver, url, company_name, website_url=None, page=None):
+        """
+        Validates one candidate: a fresh snapshot first, then the HTTP tier, the
+        browser only when the static page is not enough. Only pages that pass
+        validation are snapshotted, and a snapshot that no longer passes (its text
+        is truncated) falls through to a fetch. page: a prefetched static page
+        (False: its fetch failed).
+        Returns (is_valid, followers_count, correct_url).
+        Stage times and the reject reason go to the row's metrics event.
+        """
+        if not self.filter_candidate(url):
+            print(f"  [Reject] URL does not look like a {self.label} profile: {url}")
+            metrics.reject(metrics.REJECT_NOT_PROFILE)
+            return False, 0, url
+
+        snapshots = get_snapshots()
+        snap = snapshots.get(url, max_age=FRESH_SECONDS)
+        if snap and snap['stats'].get('followers', 0) > 0:
+            print(f"  [Snapshot] {snap['source']} snapshot from {time.strftime('%Y-%m-%d %H:%M', time.localtime(snap['fetched_at']))}")
+            with metrics.stage('validate'):
+                valid = self.validate(snap['text'], company_name, website_url, snap['stats'])
+            if valid:
+                return True, snap['stats']['followers'], url
+            print("  [Snapshot] Snapshot no longer passes. Fetching the page.")
+
+        if page is None and self.static_fetch:
+            with metrics.stage('navigate'):
+                page = fetch_page(url)
+        if page:
+            with metrics.stage('extract'):
+                stats = self.extract_static(page)
+            if stats and stats.get('followers', 0) > 0:
+                print(f"  [HTTP Stats] {stats}")
+                with metrics.stage('validate'):
+                    valid = self.validate(page['text'], company_name, website_url, stats)
+                if valid:
+                    snapshots.put(url, self.name, 'http', stats, page['text'], page['meta_description'])
+                    return True, stats['followers'], url
+            print("  [HTTP] Static parse incomplete. Falling back to browser.")
+
+        try:
+            with metrics.stage('navigate'):
+                safe_get(driver, url)
+            with metrics.stage('wait'):
+                wait_ready(driver, self.name, 'profile')
+            with metrics.stage('extract'):
+                # One round trip for everything below; the rest runs on the snapshot
+                dom = take_snapshot(driver, self.snapshot_selectors)
+                page_text = dom['body_text'] or ""
+                # Login walls and block pages must not be validated (or snapshotted) as profiles
+                get_pacer().check(url, final_url=dom['url'], text=page_text)
+                stats = self.extract_browser(dom)
+
+            with metrics.stage('validate'):
+                valid = self.validate(page_text, company_name, website_url, stats)
+            if not valid:
+                return False, 0, url
+            if stats.get('followers', 0) > 0:
+                snapshots.put(url, self.name, 'browser', stats, page_text, meta_content(dom, 'description') or None)
+            return True, stats.get('followers', 0), url
+
+        except Throttled:
+            metrics.reject(metrics.REJECT_BLOCKED)
+            raise
+        except Exception as e:
+            print(f"  [Error] Validation failed: {e}")
+            metrics.reject(metrics.REJECT_LOAD)
+            return False, 0, url
+
+    # --- Per-row loop ---
+
+    def process(self, driver, row):
+        """Runs verification/search for one company. Returns {column: value} updates or None."""
+        company_name = row['company_name']
+        website_url = row.get('website_url', None)
+        if pd.isna(website_url): website_url = None
+
+        # --- UPDATE MODE LOGIC ---
+        # If we already have a URL, verify it first instead of skipping
+        existing_url = row.get(self.url_col)
+        if pd.notna(existing_url) and str(existing_url).strip() != "":
+            if not self.verify_existing:
+                metrics.set_outcome('skipped')
+                return None
+            e_url = str(existing_url).strip()
+            print(f"  [{self.label}] [Existing] Verifying: {e_url}")
+            metrics.candidate(e_url)
+            is_valid, count, final_url = self.verify(driver, e_url, company_name, website_url)
+            if is_valid:
+                print(f"  [{self.label}] [UPDATE] Valid existing URL. Updating count: {count}")
+                metrics.accept()
+                metrics.set_outcome('updated')
+                return {self.url_col: final_url, self.count_col: count}
+            print(f"  [{self.label}] [Invalid] Existing URL failed validation. Will search for new one.")
+
+        # Rank every result cheaply; only the top max_candidates are loaded
+        with metrics.stage('search'):
+            candidates = rank_candidates(self.search(driver, company_name), company_name, website_url)
+        if self.max_candidates:
+            candidates = candidates[:self.max_candidates]
+        if not candidates:
+            print(f"  [{self.label}] [Not Found] No candidate URL found.")
+            metrics.set_outcome('not_found')
+            return None
+
+        with metrics.stage('navigate'):
+            pages = self.prefetch([url for _, url in candidates])
+        for score, url in candidates:
+            print(f"  [{self.label}] Checking: {url} (score {score:.1f})")
+            metrics.candidate(url, score)
+            is_valid, count, final_url = self.verify(driver, url, company_name, website_url, pages.get(url))
+            if is_valid:
+                print(f"  [{self.label}] [SUCCESS] {final_url} ({count})")
+                metrics.accept()
+                metrics.set_outcome('found')
+                updates = {self.url_col: final_url}
+                if count > 0: updates[self.count_col] = count
+                return updates
+
+        print(f"  [{self.label}] [Skipped] Validation failed.")
+        metrics.set_outcome('rejected')
+        return None
@@ -0,0 +1,112 @@
+from urllib.parse import quote
+from selenium.webdriver.common.by import By
+
+from scraper_core import metrics
+from scraper_core.platforms.base import Platform, FOLLOWERS_RE
+from scraper_core.match_keys import keys_for, prepare_text, name_in_text
+from scraper_core.rate_limit import get_pacer, Throttled
+from scraper_core.readiness import wait_ready
+from scraper_core.text import parse_count_str, get_domain, count_pattern, search_count
+
+X_POSTS_RE = count_pattern('posts|件のポスト')
+
+
+class XPlatform(Platform):
+    name = 'x'
+    label = 'X'
+    url_col = 'x_url'
+    count_col = 'x_followers'
+    ports = [9228]
+    profile_name = 'ChromeProfile_X'
+    login_url = "https://x.com/i/flow/login"
+    verify_existing = False
+    max_candidates = 5     # Top-ranked user cells to open
+    min_posts = 10
+    static_fetch = False  # Profiles are rendered client-side only
+
+    def filter_candidate(self, url):
+        return "/status/" not in url and "/search" not in url
+
+    def search(self, driver, company_name):
+        """Searches X for the company and returns (url, user cell text) candidates for ranking."""
+        candidates = [] # List of (url, text)
+        url = f"https://x.com/search?q={quote(str(company_name))}&f=user"
+        pacer = get_pacer()
+        try:
+            pacer.acquire(url)
+            driver.get(url)
+            wait_ready(driver, 'x', 'search') # Wait for results
+            pacer.check(url, final_url=driver.current_url)  # Logged out: redirected to the login flow
+
+            # Scrape User Cells with text for prioritization
+            for el in driver.find_elements(By.CSS_SELECTOR, '[data-testid="UserCell"]'):
+                try:
+                    link = el.find_element(By.TAG_NAME, 'a').get_attribute('href')
+                    if link and self.filter_candidate(link):
+                        candidates.append((link, el.text))
+                except: continue
+        except Throttled:
+            raise
+        except Exception as e:
+            print(f"  Search Error: {e}")
+            return []
+
+        # "公式" (Official) in the cell is one of the ranking signals (see candidates.py)
+        return candidates
+
+    # Texts collected by the DOM snapshot (see dom_snapshot)
+    snapshot_selectors = {
+        # Website link in profile. X redirects via t.co, but the text shows the display URL
+        'profile_url': '[data-testid="UserUrl"] a, [data-testid="UserProfileHeader_Url"] a, [data-testid="UserUrl"]',
+        'header': '[data-testid="primaryColumn"] h2 + div',
+    }
+
+    def extract_browser(self, dom):
+        stats = {'followers': 0, 'posts': 0, 'profile_domain': None}
+
+        for text in dom['selected'].get('profile_url', []):
+            if text:
+                stats['profile_domain'] = get_domain(text)
+                break
+
+        stats['posts'] = search_count(X_POSTS_RE, dom['body_text'])
+        stats['followers'] = search_count(FOLLOWERS_RE, dom['body_text'])
+
+        if stats['posts'] == 0:
+            for text in dom['selected'].get('header', []):
+                if "post" in text.lower() or "ポスト" in text:
+                    stats['posts'] = parse_count_str(text)
+                    break
+
+        print(f"      [Stats] Posts: ~{stats['posts']}, Followers: ~{stats['followers']}")
+        return stats
+
+    def validate(self, page_text, company_name, website_url, stats):
+        """
+        1. Profile website link matching the CSV website domain is the strongest signal.
+        2. Otherwise the normalized company name must appear in the profile.
+        3. Posts >= 10.
+        """
+        keys = keys_for(company_name, website_url)
+        expected_domain = keys['domain']
+        profile_domain = stats.get('profile_domain')
+        domain_match = bool(expected_domain and profile_domain and expected_domain in profile_domain)
+        if domain_match:
+            print(f"      [CONFIRMED] Domain match: {expected_domain} in {profile_domain}")
+
+        name_match = name_in_text(keys, prepare_text(page_text))
+        if not name_match and not domain_match:
+            print(f"      [Reject Name] '{keys['core']}' not found and no domain match.")
+            metrics.reject(metrics.REJECT_NAME)
+            return False
+
+        # If name matches but domain explicitly MISMATCHES
+        if self.domain_mismatch(keys, stats):
+            return False
+
+        posts = stats.get('posts', 0)
+        if posts > 0 and posts < self.min_posts:
+            print(f"      [Reject] Post count {posts} < {self.min_posts}")
+            metrics.reject(metrics.REJECT_LOW_POSTS)
+            return False
+        return True
@@ -0,0 +1,59 @@
+import re
+
+from scraper_core.dom_snapshot import meta_content
+from scraper_core.platforms.base import Platform
+from scraper_core.text import parse_count_str, count_pattern, search_count
+
+SUBSCRIBERS_META_RE = count_pattern('subscribers|登録者', 'チャンネル登録者数|登録者数')
+# Older layout: "subscriberCountText":{..."simpleText":"..."}; newer: metadata "content":"..."
+# The object nests "accessibility":{...} before simpleText, so scan a bounded stretch, not [^{}]
+SUBSCRIBER_TEXT_RE = re.compile(r'"subscriberCountText":\{.{0,500}?"simpleText":"([^"]+)"', re.S)
+SUBSCRIBER_CONTENT_RE = re.compile(r'"content":"([^"]*(?:subscribers|登録者)[^"]*)"')
+
+
+class YouTubePlatform(Platform):
+    name = 'youtube'
+    label = 'YouTube'
+    url_col = 'youtube_url'
+    count_col = 'youtube_subscribers'
+    ports = [9227]
+    profile_name = 'ChromeProfile_YouTube'
+
+    def filter_candidate(self, url):
+        if "youtube.com" not in url: return False
+        if "/watch" in url or "/playlist" in url or "/results" in url: return False
+        # Must look like a channel: /channel/UC..., /c/Name, /user/Name, /@Handle
+        return "/channel/" in url or "/c/" in url or "/user/" in url or "/@" in url
+
+    def search(self, driver, company_name):
+        return self.google_search(driver, company_name, "youtube.com")
+
+    def extract_static(self, page):
+        # The channel page embeds ytInitialData with the subscriber line
+        stats = {'followers': 0, 'posts': 0}
+        html = page['html']
+        s_match = SUBSCRIBER_TEXT_RE.search(html)
+        if not s_match:
+            s_match = SUBSCRIBER_CONTENT_RE.search(html)
+        if s_match: stats['followers'] = parse_count_str(s_match.group(1))
+
+        if stats['followers'] == 0:
+            stats['followers'] = search_count(SUBSCRIBERS_META_RE, page['meta_description'])
+        return stats
+
+    def extract_browser(self, dom):
+        stats = {'followers': 0, 'posts': 0}
+        # e.g. <span class="yt-core-attributed-string ...">チャンネル登録者数 15.7万人</span>
+        for line in dom['body_text'].splitlines():
+            if "登録者" in line or "subscribers" in line:
+                val = search_count(SUBSCRIBERS_META_RE, line)
+                if val > 0:
+                    stats['followers'] = val
+                    print(f"  [DOM] Found subscribers: {line.strip()} -> {val}")
+                    break
+
+        # Fallback to meta description
+        if stats['followers'] == 0:
+            stats['followers'] = search_count(SUBSCRIBERS_META_RE, meta_content(dom, 'description'))
+            print(f"  [Meta Stats] Subscribers: {stats['followers']}")
+        return stats
@@ -0,0 +1,122 @@
+import queue
+import threading
+
+# Sentinel pushed once per worker to tell it the task queue is drained.
+_STOP = object()
+
+
+class WorkerPool:
+    """
+    Runs one WebDriver per debugger-attached Chrome instance and hands out rows
+    from a shared queue. Results are funnelled back to the calling thread, which
+    is the only one allowed to touch the DataFrame / output file.
+
+    WebDriver sessions serialize their commands, so parallelism comes from
+    separate Chrome instances (one per port), not from tabs of the same one.
+    """
+
+    def __init__(self, driver_factory, slots, handler):
+        # slots: one entry per worker, e.g. a debugger port or {platform: port}
+        # driver_factory(slot) -> driver (or {platform: driver})
+        # handler(driver, idx, row) -> dict of {column: value} updates (or None)
+        self.driver_factory = driver_factory
+        self.slots = list(slots)
+        self.handler = handler
+        self.tasks = queue.Queue(maxsize=len(self.slots) * 2)
+        self.results = queue.Queue()
+        self.stop_event = threading.Event()
+        self.drivers = []
+
+    def connect(self):
+        """Attaches a driver to every slot. Fails fast if one cannot connect."""
+        for slot in self.slots:
+            self.drivers.append(self.driver_factory(slot))
+        print(f"[Pool] {len(self.drivers)} worker(s) connected: {self.slots}")
+        return self.drivers
+
+    def _feed(self, rows):
+        try:
+            for idx, row in rows:
+                while not self.stop_event.is_set():
+                    try:
+                        self.tasks.put((idx, row), timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+                if self.stop_event.is_set():
+                    break
+        finally:
+            for _ in self.drivers:
+                self.tasks.put(_STOP)
+
+    def _work(self, worker_id, driver):
+        while True:
+            task = self.tasks.get()
+            if task is _STOP:
+                break
+            if self.stop_event.is_set():
+                continue  # Keep draining so the feeder never blocks forever
+            idx, row = task
+            try:
+                updates = self.handler(driver, idx, row)
+            except Exception as e:
+                print(f"  [W{worker_id}] [Error] Row {idx} failed: {e}")
+                updates = None
+            self.results.put((idx, updates))
+        self.results.put((None, worker_id))
+
+    def run(self, rows, on_result):
+        """
+        Processes (idx, row) pairs from `rows` across all workers.
+        on_result(idx, updates) is called on the calling thread for every row.
+        """
+        if not self.drivers:
+            self.connect()
+
+        feeder = threading.Thread(target=self._feed, args=(rows,), daemon=True)
+        workers = [
+            threading.Thread(target=self._work, args=(i, d), daemon=True)
+            for i, d in enumerate(self.drivers)
+        ]
+        feeder.start()
+        for w in workers:
+            w.start()
+
+        active = len(workers)
+        try:
+            while active:
+                try:
+                    idx, updates = self.results.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                if idx is None:
+                    active -= 1
+                    continue
+                on_result(idx, updates)
+        except KeyboardInterrupt:
+            print("\n[Pool] Stopping... waiting for in-flight rows to finish.")
+            self.stop_event.set()
+            self._drain(active, on_result)
+            raise
+
+    def _drain(self, active, on_result):
+        """Collects results of rows that were already in progress when stopping."""
+        while active:
+            try:
+                idx, updates = self.results.get(timeout=60)
+            except queue.Empty:
+                print("[Pool] Timed out waiting for workers.")
+                return
+            except KeyboardInterrupt:
+                return
+            if idx is None:
+                active -= 1
+                continue
+            on_result(idx, updates)
+
+    def close(self):
+        for d in self.drivers:
+            for driver in (d.values() if isinstance(d, dict) else [d]):
+                try:
+                    driver.quit()
+                except: pass
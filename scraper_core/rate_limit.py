@@ -0,0 +1,328 @@
+"""
+Token-bucket rate limiting shared by concurrent workers.
+
+A bucket refills at `rate` tokens per second up to `burst`; every request takes
+one token and blocks until one is available. Several sessions can then run in
+parallel without exceeding the overall request rate a search engine tolerates.
+
+The Pacer (get_pacer()) is the central scheduler for every outgoing request:
+one AdaptiveBucket and CircuitBreaker per domain (DOMAIN_LIMITS; company sites
+get DEFAULT_LIMITS per registrable domain). Callers acquire() before a request
+and report() its outcome. Healthy responses raise the rate additively up to
+max_rate; 429/503, CAPTCHA / block pages and login walls halve it, and
+BREAKER_THRESHOLD such signals in a row open the domain's circuit, so requests
+fail fast with CircuitOpen until the cooldown (doubling per trip) has passed.
+After the cooldown the circuit is half-open: a single probe request goes out
+and the rest keep getting CircuitOpen until it reports (success closes the
+circuit, failure re-opens it) or PROBE_TIMEOUT passes without a report.
+
+Anonymous static fetches (http_fetch, the official-site crawler) pass
+tier=STATIC_TIER and get their own bucket and breaker per domain
+('http:instagram.com'): login walls and 403s are expected there and must not
+open the circuit of the logged-in browser.
+"""
+import asyncio
+import re
+import threading
+import time
+
+from scraper_core.match_keys import registrable_domain
+
+# domain -> (start rate/s, min rate, max rate, burst)
+DOMAIN_LIMITS = {
+    'google.com': (0.2, 0.02, 0.5, 1),
+    'duckduckgo.com': (0.5, 0.05, 1.0, 2),
+    'instagram.com': (0.5, 0.05, 2.0, 2),
+    'tiktok.com': (0.5, 0.05, 2.0, 2),
+    'youtube.com': (1.0, 0.1, 4.0, 2),
+    'x.com': (0.3, 0.03, 1.0, 1),
+}
+DEFAULT_LIMITS = (1.0, 0.1, 4.0, 2)   # Any other host (company sites)
+STATIC_TIER = 'http'
+DOMAIN_ALIASES = {'twitter.com': 'x.com', 'youtu.be': 'youtube.com', 'google.co.jp': 'google.com',
+                  'cdninstagram.com': 'instagram.com', 'tiktokcdn.com': 'tiktok.com'}
+
+INCREASE_STEPS = 20        # Successes to climb from min_rate to max_rate
+DECREASE_FACTOR = 0.5
+BREAKER_THRESHOLD = 3      # Consecutive throttle / block signals that open the circuit
+BREAKER_COOLDOWN = 300     # Seconds; doubles per consecutive trip
+BREAKER_MAX_COOLDOWN = 3600
+PROBE_TIMEOUT = 60         # Seconds a half-open probe may take before another one is let through
+
+THROTTLE_STATUSES = {429, 503}
+BLOCK_STATUSES = {403}
+# Redirect targets of block pages and login walls
+BLOCK_URL_MARKERS = ('/sorry/', 'captcha', '/challenge', '/accounts/login', '/i/flow/login', '/login?')
+BLOCK_TEXT_RE = re.compile(
+    r'unusual traffic|not a robot|verify you are human|complete the captcha|too many requests|'
+    r'rate limit exceeded|please wait a few minutes|異常なトラフィック|ロボットではありません|'
+    r'しばらくしてからもう一度お試し',
+    re.I)
+# Block pages say so at the top; long pages are not scanned in full. Plain 'captcha' is not
+# a signal: ordinary pages show 'protected by reCAPTCHA'.
+BLOCK_TEXT_SCAN = 3000
+
+
+class TokenBucket:
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens=1):
+        """Takes tokens if available. Returns 0 on success, else the seconds until they will be."""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0
+            return (tokens - self.tokens) / self.rate
+
+    def acquire(self, tokens=1, stop_event=None):
+        """Blocks until tokens are available. Returns False if stop_event was set while waiting."""
+        while True:
+            wait = self.try_acquire(tokens)
+            if not wait: return True
+            if stop_event is not None:
+                if stop_event.wait(wait): return False
+            else:
+                time.sleep(wait)
+
+
+class AdaptiveBucket(TokenBucket):
+    """TokenBucket whose rate grows on success and halves on throttling (AIMD), within [min_rate, max_rate]."""
+
+    def __init__(self, rate, burst=1, min_rate=None, max_rate=None):
+        super().__init__(rate, burst)
+        self.min_rate = float(min_rate if min_rate is not None else rate)
+        self.max_rate = float(max_rate if max_rate is not None else rate)
+        self.step = (self.max_rate - self.min_rate) / INCREASE_STEPS
+
+    def on_success(self):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.step)
+
+    def on_throttle(self):
+        with self.lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.min_rate, self.rate * DECREASE_FACTOR)
+            self.tokens = min(self.tokens, 0.0)  # Pause before the next request
+
+
+class Throttled(Exception):
+    """A domain is throttling or blocking us; the task should be retried later, not marked invalid."""
+
+    def __init__(self, domain, retry_in, reason):
+        super().__init__(f"{domain}: {reason}")
+        self.domain = domain
+        self.retry_in = retry_in
+
+
+class Blocked(Throttled):
+    pass
+
+
+class CircuitOpen(Throttled):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN, max_cooldown=BREAKER_MAX_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.failures = 0
+        self.streak = 0          # Trips without a success in between
+        self.open_until = 0.0
+        self.probe_until = 0.0   # Half-open: a probe is in flight until it reports or this passes
+        self.trips = 0
+        self.lock = threading.Lock()
+
+    def _tripped(self):
+        return self.failures >= self.threshold
+
+    def remaining(self):
+        """Seconds until a request may go out again (0: closed, or half-open with no probe in flight)."""
+        with self.lock:
+            now = time.time()
+            if now < self.open_until: return self.open_until - now
+            if self._tripped() and now < self.probe_until: return self.probe_until - now
+            return 0.0
+
+    def start_request(self):
+        """
+        Called when a request is about to go out. True when closed, or when this request
+        becomes the half-open probe; False if the circuit is open or another probe is in flight.
+        """
+        with self.lock:
+            if not self._tripped(): return True
+            now = time.time()
+            if now < self.open_until or now < self.probe_until: return False
+            self.probe_until = now + PROBE_TIMEOUT
+            return True
+
+    def on_success(self):
+        with self.lock:
+            self.failures = 0
+            self.streak = 0
+            self.probe_until = 0.0
+
+    def on_failure(self):
+        """Returns the cooldown if this failure opened the circuit, else 0."""
+        with self.lock:
+            self.failures += 1
+            # In-flight requests that fail after the trip do not extend it
+            if self.failures < self.threshold or self.open_until > time.time(): return 0
+            # Also reached when a half-open probe fails (failures stays >= threshold)
+            cooldown = min(self.max_cooldown, self.cooldown * (2 ** self.streak))
+            self.streak += 1
+            self.trips += 1
+            self.open_until = time.time() + cooldown
+            self.probe_until = 0.0
+            return cooldown
+
+
+def domain_key(url):
+    """Registrable domain of url (or of a bare domain), mapped through DOMAIN_ALIASES."""
+    domain = registrable_domain(url)
+    return DOMAIN_ALIASES.get(domain, domain)
+
+
+def pacer_key(url, tier=None):
+    """domain_key, prefixed with the tier ('http:instagram.com') when one is given."""
+    domain = domain_key(url)
+    return f"{tier}:{domain}" if tier else domain
+
+
+def classify(status=None, final_url=None, text=None):
+    """'ok', 'throttled' or 'blocked' for one response."""
+    if status in THROTTLE_STATUSES: return 'throttled'
+    if status in BLOCK_STATUSES: return 'blocked'
+    if final_url and any(m in final_url.lower() for m in BLOCK_URL_MARKERS): return 'blocked'
+    if text and BLOCK_TEXT_RE.search(text[:BLOCK_TEXT_SCAN]): return 'blocked'
+    return 'ok'
+
+
+class Pacer:
+    def __init__(self):
+        self.domains = {}   # domain -> {'bucket', 'breaker', 'ok', 'throttled', 'blocked'}
+        self.lock = threading.Lock()
+
+    def configure(self, domain, rate, min_rate, max_rate, burst=1):
+        with self.lock:
+            self.domains[domain] = self._entry((rate, min_rate, max_rate, burst))
+
+    def _entry(self, limits):
+        rate, min_rate, max_rate, burst = limits
+        return {'bucket': AdaptiveBucket(rate, burst, min_rate, max_rate), 'breaker': CircuitBreaker(),
+                'ok': 0, 'throttled': 0, 'blocked': 0}
+
+    def _get(self, domain):
+        with self.lock:
+            entry = self.domains.get(domain)
+            if entry is None:
+                # Tiers of a domain start from the domain's limits
+                limits = DOMAIN_LIMITS.get(domain.rpartition(':')[2], DEFAULT_LIMITS)
+                entry = self.domains[domain] = self._entry(limits)
+            return entry
+
+    def try_acquire(self, url, tier=None):
+        """Takes a token for url's domain: 0 on success, else seconds to wait. Raises CircuitOpen."""
+        domain = pacer_key(url, tier)
+        entry = self._get(domain)
+        breaker = entry['breaker']
+        remaining = breaker.remaining()
+        if remaining:
+            raise CircuitOpen(domain, remaining, f"circuit open for {remaining:.0f}s")
+        wait = entry['bucket'].try_acquire()
+        if wait: return wait
+        # Checked again with the token in hand: only one request may probe a half-open circuit
+        if not breaker.start_request():
+            remaining = breaker.remaining() or PROBE_TIMEOUT
+            raise CircuitOpen(domain, remaining, f"half-open, probe in flight ({remaining:.0f}s)")
+        return 0
+
+    def acquire(self, url, stop_event=None, wait_circuit=False, tier=None):
+        """
+        Blocks until url's domain may be requested. False if stop_event was set.
+        Raises CircuitOpen, unless wait_circuit (scripts that only talk to one domain).
+        """
+        while True:
+            try:
+                wait = self.try_acquire(url, tier)
+            except CircuitOpen as e:
+                if not wait_circuit: raise
+                wait = e.retry_in
+            if not wait: return True
+            if stop_event is not None:
+                if stop_event.wait(wait): return False
+            else:
+                time.sleep(wait)
+
+    async def acquire_async(self, url, tier=None):
+        while True:
+            wait = self.try_acquire(url, tier)
+            if not wait: return
+            await asyncio.sleep(wait)
+
+    def report(self, url, status=None, final_url=None, text=None, tier=None):
+        """Feeds one response back into url's domain. Returns 'ok', 'throttled' or 'blocked'."""
+        outcome = classify(status, final_url, text)
+        domain = pacer_key(url, tier)
+        entry = self._get(domain)
+        entry[outcome] += 1
+        if outcome == 'ok':
+            entry['bucket'].on_success()
+            entry['breaker'].on_success()
+            return outcome
+        entry['bucket'].on_throttle()
+        print(f"  [Pacer] {domain}: {outcome} ({status or final_url or 'page text'}); "
+              f"rate now {entry['bucket'].rate:.2f}/s")
+        cooldown = entry['breaker'].on_failure()
+        if cooldown:
+            print(f"  [Pacer] {domain}: circuit open for {cooldown:.0f}s")
+        return outcome
+
+    def check(self, url, status=None, final_url=None, text=None, tier=None):
+        """report(), raising Blocked when the response was a throttle / block page."""
+        outcome = self.report(url, status, final_url, text, tier)
+        if outcome != 'ok':
+            domain = pacer_key(url, tier)
+            raise Blocked(domain, self._get(domain)['breaker'].remaining() or BREAKER_COOLDOWN, outcome)
+
+    def summary(self):
+        with self.lock:
+            return {d: {'rate': round(e['bucket'].rate, 3), 'ok': e['ok'], 'throttled': e['throttled'],
+                        'blocked': e['blocked'], 'trips': e['breaker'].trips}
+                    for d, e in self.domains.items()}
+
+
+def print_pacer_summary(limit=10):
+    """Per-domain request outcomes and the rate each domain settled at (busiest first)."""
+    summary = get_pacer().summary()
+    if not summary: return
+    print("[Pacer] Requests per domain:")
+    busiest = sorted(summary.items(), key=lambda kv: -(kv[1]['ok'] + kv[1]['throttled'] + kv[1]['blocked']))
+    for domain, s in busiest[:limit]:
+        print(f"  {domain}: ok={s['ok']} throttled={s['throttled']} blocked={s['blocked']} "
+              f"circuit_trips={s['trips']} rate={s['rate']}/s")
+
+
+_pacer = None
+_pacer_lock = threading.Lock()
+
+
+def get_pacer():
+    """Process-wide Pacer."""
+    global _pacer
+    with _pacer_lock:
+        if _pacer is None:
+            _pacer = Pacer()
+        return _pacer
@@ -0,0 +1,109 @@
+import threading
+import time
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+POLL_INTERVAL = 0.2
+
+# (platform, page) -> readiness definition.
+#   ready:  list of alternatives; the page is ready when every selector of any
+#           one alternative matches.
+#   timeout: upper bound in seconds (we proceed with whatever is loaded).
+#   legacy_sleep: the fixed sleep this wait replaced, used to report savings.
+READY_CONDITIONS = {
+    ('google', 'results'): {
+        'ready': [['#search a h3'], ['#rso a[href]'], ['#botstuff'], ['#captcha-form']],
+        'timeout': 5, 'legacy_sleep': 2,
+    },
+    ('instagram', 'profile'): {
+        'ready': [['a[href*="followers"]'], ['header section ul'],
+                  ['meta[name="description"][content*="ollower"]'],
+                  ['meta[name="description"][content*="フォロワー"]']],
+        'timeout': 5, 'legacy_sleep': 3,
+    },
+    ('tiktok', 'profile'): {
+        # The header alone: zero-post and private profiles never render post items, and
+        # posts == 0 (none rendered yet) does not trigger the 5-post rule
+        'ready': [['[data-e2e="followers-count"]']],
+        'timeout': 5, 'legacy_sleep': 3,
+    },
+    ('youtube', 'profile'): {
+        'ready': [['#page-header yt-content-metadata-view-model'], ['#subscriber-count'],
+                  ['meta[name="description"][content]:not([content=""])', '#page-header']],
+        'timeout': 5, 'legacy_sleep': 3,
+    },
+    ('x', 'search'): {
+        'ready': [['[data-testid="UserCell"]'], ['[data-testid="emptyState"]']],
+        'timeout': 6, 'legacy_sleep': 4,
+    },
+    ('x', 'profile'): {
+        'ready': [['[data-testid="UserName"]'], ['[data-testid="emptyState"]'],
+                  ['[data-testid="error-detail"]']],
+        'timeout': 5, 'legacy_sleep': 3,
+    },
+}
+
+_READY_JS = """
+var groups = arguments[0];
+for (var i = 0; i < groups.length; i++) {
+    var ok = true;
+    for (var j = 0; j < groups[i].length; j++) {
+        if (!document.querySelector(groups[i][j])) { ok = false; break; }
+    }
+    if (ok) return true;
+}
+return false;
+"""
+
+# key -> {'count', 'total', 'max', 'timeouts'}; shared by all pool workers
+WAIT_STATS = {}
+_stats_lock = threading.Lock()
+
+
+def _record(key, elapsed, ready):
+    with _stats_lock:
+        s = WAIT_STATS.setdefault(key, {'count': 0, 'total': 0.0, 'max': 0.0, 'timeouts': 0})
+        s['count'] += 1
+        s['total'] += elapsed
+        s['max'] = max(s['max'], elapsed)
+        if not ready:
+            s['timeouts'] += 1
+
+
+def wait_ready(driver, platform, page, timeout=None):
+    """
+    Blocks until the page matches its readiness condition or the timeout expires.
+    Returns True if the condition held, False on timeout (caller proceeds anyway).
+    """
+    cond = READY_CONDITIONS[(platform, page)]
+    timeout = cond['timeout'] if timeout is None else timeout
+    start = time.monotonic()
+    ready = False
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(
+            lambda d: d.execute_script(_READY_JS, cond['ready'])
+        )
+        ready = True
+    except TimeoutException:
+        print(f"  [Wait] {platform}/{page} not ready after {timeout}s. Proceeding.")
+    except WebDriverException as e:
+        print(f"  [Wait] {platform}/{page} check failed: {e}")
+    _record((platform, page), time.monotonic() - start, ready)
+    return ready
+
+
+def print_wait_summary():
+    """Prints how long each readiness wait took compared to the old fixed sleep."""
+    with _stats_lock:
+        items = sorted(WAIT_STATS.items())
+    if not items: return
+    print("--- Wait summary ---")
+    total_saved = 0.0
+    for key, s in items:
+        avg = s['total'] / s['count']
+        legacy = READY_CONDITIONS[key]['legacy_sleep']
+        saved = legacy * s['count'] - s['total']
+        total_saved += saved
+        print(f"  {key[0]}/{key[1]}: n={s['count']} avg={avg:.2f}s max={s['max']:.2f}s "
+              f"timeouts={s['timeouts']} (fixed sleep {legacy}s, saved {saved:.0f}s)")
+    print(f"  Total time saved vs fixed sleeps: {total_saved:.0f}s")
@@ -0,0 +1,136 @@
+"""
+Persistent cache of search results: normalized query + platform -> candidates
+(URLs or [url, result text] pairs, in search order).
+
+Google searches are the slowest and most rate-limited step, and re-runs (after a
+crash, or verification passes) would repeat them for rows already searched.
+Entries expire after TTL_SECONDS (empty results after NEGATIVE_TTL_SECONDS, so a
+company that gets an account is found on a later run), and the least recently
+used entries are evicted once the cache holds more than MAX_ENTRIES.
+
+    python -m scraper_core.search_cache [status|evict|clear]
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import unicodedata
+
+CACHE_FILE = os.environ.get('SEARCH_CACHE_FILE', 'search_cache.sqlite')
+TTL_SECONDS = 30 * 24 * 3600
+NEGATIVE_TTL_SECONDS = 3 * 24 * 3600
+MAX_ENTRIES = 100000
+EVICT_EVERY = 200  # Puts between eviction sweeps
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS searches (
+    query TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    candidates TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (query, platform)
+);
+CREATE INDEX IF NOT EXISTS idx_searches_last_used ON searches(last_used);
+"""
+
+
+def normalize_query(query):
+    """NFKC, lowercase, single spaces: '株式会社ＡＢＣ  Instagram' == '株式会社abc instagram'."""
+    return " ".join(unicodedata.normalize('NFKC', str(query)).lower().split())
+
+
+class SearchCache:
+    def __init__(self, path=CACHE_FILE):
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._puts = 0
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self):
+        # sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def get(self, query, platform):
+        """Returns the cached candidate list, or None when missing or expired."""
+        key = normalize_query(query)
+        conn = self._conn()
+        row = conn.execute("SELECT candidates, fetched_at FROM searches WHERE query = ? AND platform = ?",
+                           (key, platform)).fetchone()
+        if row is None: return None
+        candidates = json.loads(row[0])
+        ttl = TTL_SECONDS if candidates else NEGATIVE_TTL_SECONDS
+        now = time.time()
+        if row[1] + ttl < now: return None
+        conn.execute("UPDATE searches SET last_used = ?, hits = hits + 1 WHERE query = ? AND platform = ?",
+                     (now, key, platform))
+        return candidates
+
+    def put(self, query, platform, candidates):
+        now = time.time()
+        self._conn().execute(
+            "INSERT OR REPLACE INTO searches(query, platform, candidates, fetched_at, last_used) VALUES(?, ?, ?, ?, ?)",
+            (normalize_query(query), platform, json.dumps(list(candidates), ensure_ascii=False), now, now))
+        with self._lock:
+            self._puts += 1
+            sweep = self._puts % EVICT_EVERY == 0
+        if sweep:
+            self.evict()
+
+    def evict(self):
+        """Drops expired entries, then the least recently used ones above MAX_ENTRIES."""
+        conn = self._conn()
+        now = time.time()
+        expired = conn.execute(
+            "DELETE FROM searches WHERE fetched_at < ? OR (candidates = '[]' AND fetched_at < ?)",
+            (now - TTL_SECONDS, now - NEGATIVE_TTL_SECONDS)).rowcount
+        over = conn.execute("SELECT COUNT(*) FROM searches").fetchone()[0] - MAX_ENTRIES
+        if over > 0:
+            conn.execute("DELETE FROM searches WHERE rowid IN "
+                         "(SELECT rowid FROM searches ORDER BY last_used LIMIT ?)", (over,))
+        return expired + max(over, 0)
+
+    def clear(self):
+        return self._conn().execute("DELETE FROM searches").rowcount
+
+    def stats(self):
+        total, hits = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM searches").fetchone()
+        empty = self._conn().execute("SELECT COUNT(*) FROM searches WHERE candidates = '[]'").fetchone()[0]
+        return {'entries': total, 'empty': empty, 'hits': hits}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Process-wide cache at CACHE_FILE."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SearchCache()
+        return _cache
+
+
+def main():
+    cache = get_cache()
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+    if command == 'clear':
+        print(f"Removed {cache.clear()} cached search(es).")
+    elif command == 'evict':
+        print(f"Evicted {cache.evict()} cached search(es).")
+    print(f"{CACHE_FILE}: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
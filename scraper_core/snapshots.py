@@ -0,0 +1,166 @@
+"""
+Local snapshots of profile pages, keyed by canonical URL.
+
+Every page that passed validation (HTTP tier or browser) stores what
+validation needs: meta description, extracted stats, the normalized body text
+(capped at TEXT_LIMIT) and its fingerprint, plus the fetch time. Platform.verify
+re-validates a snapshot younger than FRESH_SECONDS instead of fetching the page
+again (and fetches it when the snapshot no longer passes), and
+validation rules can be re-run offline over every stored URL:
+
+    python -m scraper_core.snapshots revalidate <output_file> [platform ...]
+    python -m scraper_core.snapshots status
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+from scraper_core.text import normalize_text
+
+SNAPSHOT_FILE = os.environ.get('SNAPSHOT_FILE', 'snapshots.sqlite')
+FRESH_SECONDS = 3 * 24 * 3600
+TEXT_LIMIT = 5000  # Profile headers (name, bio, counts) are at the top of the body text
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    url TEXT PRIMARY KEY,
+    platform TEXT,
+    source TEXT,
+    fetched_at REAL NOT NULL,
+    meta_description TEXT,
+    stats TEXT,
+    text TEXT,
+    fingerprint TEXT
+);
+"""
+
+
+def canonical_url(url):
+    """https, no www, no query / fragment / trailing slash. Path case is kept (YouTube ids)."""
+    if not url: return ""
+    url = str(url).strip()
+    if '://' not in url: url = 'https://' + url
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    if host.startswith('www.'): host = host[4:]
+    if host.startswith('m.'): host = host[2:]
+    return f"https://{host}{parsed.path.rstrip('/')}"
+
+
+def fingerprint(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class SnapshotStore:
+    def __init__(self, path=SNAPSHOT_FILE):
+        self.path = path
+        self._local = threading.local()
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self):
+        # sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def put(self, url, platform, source, stats, text, meta_description=None):
+        """Stores one page. Returns True when the body changed since the last snapshot."""
+        key = canonical_url(url)
+        text = normalize_text(text)[:TEXT_LIMIT]
+        fp = fingerprint(text)
+        conn = self._conn()
+        old = conn.execute("SELECT fingerprint FROM snapshots WHERE url = ?", (key,)).fetchone()
+        conn.execute(
+            "INSERT OR REPLACE INTO snapshots(url, platform, source, fetched_at, meta_description, stats, text, fingerprint) "
+            "VALUES(?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, platform, source, time.time(), meta_description,
+             json.dumps(stats or {}, ensure_ascii=False), text, fp))
+        return old is None or old[0] != fp
+
+    def get(self, url, max_age=None):
+        """Returns the snapshot dict, or None when missing or older than max_age seconds."""
+        row = self._conn().execute(
+            "SELECT url, platform, source, fetched_at, meta_description, stats, text, fingerprint "
+            "FROM snapshots WHERE url = ?", (canonical_url(url),)).fetchone()
+        if row is None: return None
+        if max_age is not None and row[3] < time.time() - max_age: return None
+        return {
+            'url': row[0], 'platform': row[1], 'source': row[2], 'fetched_at': row[3],
+            'meta_description': row[4], 'stats': json.loads(row[5] or '{}'),
+            'text': row[6] or "", 'fingerprint': row[7],
+        }
+
+    def stats(self):
+        out = {}
+        for platform, source, n in self._conn().execute(
+                "SELECT platform, source, COUNT(*) FROM snapshots GROUP BY platform, source"):
+            out[f"{platform}/{source}"] = n
+        return out
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_snapshots():
+    """Process-wide store at SNAPSHOT_FILE."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SnapshotStore()
+        return _store
+
+
+def revalidate(output_file, platform_names=None):
+    """
+    Re-runs each platform's validate() on the snapshots of the URLs stored in
+    output_file, without network access. Prints the rows that no longer pass.
+    """
+    import pandas as pd
+    from scraper_core.csv_io import read_companies
+    from scraper_core.platforms import get_platforms
+
+    platforms = get_platforms(platform_names)
+    columns = ['id', 'company_name', 'website_url'] + [p.url_col for p in platforms]
+    df = read_companies(output_file, columns)
+    store = get_snapshots()
+    for p in platforms:
+        if p.url_col not in df.columns: continue
+        checked = missing = 0
+        failed = []
+        for idx, row in df[df[p.url_col].notna()].iterrows():
+            snap = store.get(row[p.url_col])
+            if snap is None:
+                missing += 1
+                continue
+            checked += 1
+            website_url = row.get('website_url')
+            if pd.isna(website_url): website_url = None
+            if not p.validate(snap['text'], row['company_name'], website_url, snap['stats']):
+                failed.append((idx, row['company_name'], row[p.url_col]))
+        print(f"[{p.label}] checked={checked} no_snapshot={missing} now_invalid={len(failed)}")
+        for idx, name, url in failed:
+            print(f"  [{idx}] {name}: {url}")
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+    if command == 'revalidate' and len(sys.argv) > 2:
+        revalidate(sys.argv[2], sys.argv[3:] or None)
+    elif command == 'status':
+        print(f"{SNAPSHOT_FILE}: {get_snapshots().stats()}")
+    else:
+        print("Usage: python -m scraper_core.snapshots [status | revalidate <output_file> [platform ...]]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Columnar company store: one Parquet file per column group instead of full CSV copies.
+
+    companies.store/
+        master.parquet                 id, company_name, website_url, industry, ...
+        platform=x/part.parquet        x_url, x_followers
+        platform=instagram/part.parquet
+        ...
+
+Every file carries the same `_row` key, so joining groups is a key lookup and
+nothing is parsed that a caller did not ask for. A scraper reads only
+company_name / website_url / its own columns and rewrites only its own
+partition; the other platforms' files are never touched.
+
+read_companies / write_companies (csv_io) dispatch here when given a store path,
+so the scrapers accept `OUTPUT_FILE = 'companies.store'` unchanged.
+
+    python -m scraper_core.store import companies.csv companies.store
+    python -m scraper_core.store export companies.store companies_final.csv
+"""
+import os
+import shutil
+import sys
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from scraper_core.csv_io import COUNT_COLUMNS, read_companies, write_companies
+
+KEY = '_row'
+MASTER = 'master'
+# Result columns per platform; everything else lives in the master file
+PARTITIONS = {
+    'x': ['x_url', 'x_followers'],
+    'instagram': ['insta_url', 'insta_followers'],
+    'tiktok': ['tiktok_url', 'tiktok_followers'],
+    'youtube': ['youtube_url', 'youtube_subscribers'],
+    'facebook': ['facebook_url', 'facebook_followers'],
+    'line': ['line_url', 'line_friends'],
+}
+_COLUMN_PARTITION = {col: name for name, cols in PARTITIONS.items() for col in cols}
+
+
+def partition_of(col):
+    return _COLUMN_PARTITION.get(col, MASTER)
+
+
+def _file(path, partition):
+    if partition == MASTER:
+        return os.path.join(path, 'master.parquet')
+    return os.path.join(path, f'platform={partition}', 'part.parquet')
+
+
+def _file_columns(file):
+    return [c for c in pq.read_schema(file).names if c != KEY]
+
+
+def read_store(path, columns=None):
+    """
+    Reads the requested columns (all when None) as one DataFrame indexed like
+    the original CSV rows. Partitions without a requested column are not opened.
+    """
+    master_file = _file(path, MASTER)
+    if not os.path.exists(master_file):
+        raise FileNotFoundError(f"No store at {path}")
+    wanted = {}
+    for partition in [MASTER] + list(PARTITIONS):
+        file = _file(path, partition)
+        if not os.path.exists(file): continue
+        available = _file_columns(file)
+        cols = available if columns is None else [c for c in available if c in columns]
+        if cols or partition == MASTER:
+            wanted[partition] = (file, cols)
+
+    df = None
+    for partition, (file, cols) in wanted.items():
+        part = _read_file(file, cols)
+        df = part if df is None else df.join(part, how='left')
+    df.index.name = None
+    if columns is not None:
+        df = df[[c for c in columns if c in df.columns]]
+    return df
+
+
+def _to_arrow(df, cols):
+    part = pd.DataFrame({KEY: df.index.astype('int64')})
+    for col in cols:
+        values = df[col].reset_index(drop=True)
+        if col in COUNT_COLUMNS:
+            part[col] = pd.to_numeric(values, errors='coerce').round().astype('Int64')
+        else:
+            part[col] = values.astype('string')
+    return pa.Table.from_pandas(part, preserve_index=False)
+
+
+def _write_file(table, file):
+    os.makedirs(os.path.dirname(file), exist_ok=True)
+    tmp = file + '.tmp'
+    pq.write_table(table, tmp)
+    os.replace(tmp, file)
+
+
+def write_store(df, path):
+    """
+    Writes the columns present in df into their partitions. Partitions df has
+    no columns for are left untouched; master columns missing from df are kept
+    from the existing master file.
+    """
+    groups = {}
+    for col in df.columns:
+        if col == KEY or str(col).startswith('Unnamed:') or col == '': continue
+        groups.setdefault(partition_of(col), []).append(col)
+
+    for partition, cols in groups.items():
+        file = _file(path, partition)
+        frame = df[cols]
+        if os.path.exists(file):
+            existing = _file_columns(file)
+            kept = [c for c in existing if c not in cols]
+            if kept:
+                # Narrow write: keep the stored values of columns we were not given
+                frame = frame.join(_read_file(file, kept), how='left')
+            frame = frame[existing + [c for c in cols if c not in existing]]
+        _write_file(_to_arrow(frame, list(frame.columns)), file)
+
+
+def _read_file(file, cols):
+    return pq.read_table(file, columns=[KEY] + cols).to_pandas().set_index(KEY)
+
+
+def import_csv(csv_path, path):
+    """Splits a companies CSV into a new store."""
+    df = read_companies(csv_path)
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    write_store(df, path)
+    return df
+
+
+def main():
+    if len(sys.argv) < 4 or sys.argv[1] not in ('import', 'export'):
+        print("Usage: python -m scraper_core.store import <csv> <store>")
+        print("       python -m scraper_core.store export <store> <csv>")
+        return
+    command, src, dst = sys.argv[1:4]
+    if command == 'import':
+        df = import_csv(src, dst)
+        print(f"Imported {len(df)} rows into {dst}")
+    else:
+        df = read_store(src)
+        write_companies(df, dst)
+        print(f"Exported {len(df)} rows to {dst}")
+
+
+if __name__ == "__main__":
+    main()
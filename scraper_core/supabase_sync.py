@@ -0,0 +1,177 @@
+"""
+Batched writes and keyset-paginated reads for the Supabase companies table.
+
+Writers buffer rows and flush them as bulk requests of CHUNK_SIZE rows, so
+round trips scale with batches, not rows:
+
+    sync = SupabaseSync(client)
+    sync.upsert({'id': ..., 'company_name': ..., 'insta_url': ...})
+    sync.insert({'company_name': ..., 'website_url': ...})   # new rows, id from the DB
+    sync.update(id, {'insta_url': ...})                       # changed columns of an existing row
+    sync.close()   # flushes the rest
+
+An upsert is an INSERT ... ON CONFLICT (id) DO UPDATE, so upserted rows must
+carry the NOT NULL columns (REQUIRED_COLUMNS) as well as the changed ones.
+PostgREST takes the column list of a bulk request from its rows, so buffered
+rows are grouped by their set of columns; a row never nulls a column it did
+not mention.
+
+An update only touches existing rows (an id deleted in the meantime is not
+re-created as a stub). PostgREST has no bulk update with per-row values, so
+updates are sent as UPDATE ... WHERE id IN (...), one request per distinct set
+of values; found links are mostly unique per row, so expect about one request
+per row. Writes need a key that RLS allows to write (schema.sql only grants
+SELECT to anon), e.g. the service role key.
+"""
+import os
+import random
+import threading
+import time
+
+TABLE = 'companies'
+CHUNK_SIZE = 500
+PAGE_SIZE = 1000
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0   # Seconds; doubles per attempt, plus jitter
+REQUIRED_COLUMNS = ['company_name', 'industry', 'region']
+
+
+def get_client():
+    """Supabase client from SUPABASE_URL / SUPABASE_KEY (or the NEXT_PUBLIC_ variants), None if unset."""
+    from supabase import create_client
+    try:
+        from dotenv import load_dotenv
+        load_dotenv('.env.local')
+    except ImportError: pass
+    url = os.environ.get("SUPABASE_URL") or os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
+    key = os.environ.get("SUPABASE_KEY") or os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY")
+    if not url or not key:
+        print("Error: SUPABASE_URL and SUPABASE_KEY must be set.")
+        return None
+    return create_client(url, key)
+
+
+def with_retry(request, what="request"):
+    """Runs request() with exponential backoff. Returns its result, or raises the last error."""
+    for attempt in range(MAX_RETRIES):
+        try:
+            return request()
+        except Exception as e:
+            if attempt == MAX_RETRIES - 1:
+                raise
+            delay = BACKOFF_BASE * (2 ** attempt) + random.uniform(0, BACKOFF_BASE)
+            print(f"[Sync] {what} failed ({e}); retry {attempt + 1}/{MAX_RETRIES - 1} in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def iter_pages(client, columns='*', page_size=PAGE_SIZE, query=None, table=TABLE):
+    """
+    Yields lists of rows ordered by id, page_size at a time. Keyset pagination
+    (id > last id) keeps every page an index range scan, unlike offsets.
+    query: optional function that adds filters to the select builder.
+    """
+    last_id = None
+    while True:
+        builder = client.table(table).select(columns)
+        if query: builder = query(builder)
+        if last_id is not None:
+            builder = builder.gt("id", last_id)
+        builder = builder.order("id").limit(page_size)
+        rows = with_retry(builder.execute, f"read {table}").data
+        if not rows: return
+        yield rows
+        if len(rows) < page_size: return
+        last_id = rows[-1]['id']
+
+
+def iter_rows(client, columns='*', page_size=PAGE_SIZE, query=None, table=TABLE):
+    for rows in iter_pages(client, columns, page_size, query, table):
+        yield from rows
+
+
+class SupabaseSync:
+    def __init__(self, client, table=TABLE, chunk_size=CHUNK_SIZE):
+        self.client = client
+        self.table = table
+        self.chunk_size = chunk_size
+        self._upserts = {}   # id -> row (later calls for the same id merge into it)
+        self._inserts = []
+        self._updates = {}   # id -> changed columns
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.requests = 0
+        self.failed = []     # Rows that still failed after every retry
+
+    def upsert(self, row):
+        if row.get('id') is None: raise ValueError("upsert needs an id")
+        with self._lock:
+            self._upserts.setdefault(row['id'], {}).update(row)
+            if len(self._upserts) >= self.chunk_size:
+                self._flush_upserts()
+
+    def insert(self, row):
+        with self._lock:
+            self._inserts.append(dict(row))
+            if len(self._inserts) >= self.chunk_size:
+                self._flush_inserts()
+
+    def update(self, row_id, values):
+        """Sets values on the existing row row_id; never inserts."""
+        if row_id is None: raise ValueError("update needs an id")
+        if not values: return
+        with self._lock:
+            self._updates.setdefault(row_id, {}).update(values)
+            if len(self._updates) >= self.chunk_size:
+                self._flush_updates()
+
+    def flush(self):
+        with self._lock:
+            self._flush_upserts()
+            self._flush_inserts()
+            self._flush_updates()
+
+    def close(self):
+        self.flush()
+        if self.requests:
+            print(f"[Sync] {self.sent} row(s) in {self.requests} request(s), {len(self.failed)} failed.")
+
+    def _flush_upserts(self):
+        rows, self._upserts = list(self._upserts.values()), {}
+        self._send(rows, lambda chunk: self.client.table(self.table).upsert(chunk, on_conflict='id'), "upsert")
+
+    def _flush_inserts(self):
+        rows, self._inserts = self._inserts, []
+        self._send(rows, lambda chunk: self.client.table(self.table).insert(chunk), "insert")
+
+    def _flush_updates(self):
+        updates, self._updates = self._updates, {}
+        groups = {}
+        for row_id, values in updates.items():
+            groups.setdefault(tuple(sorted(values.items())), []).append(row_id)
+        for key, ids in groups.items():
+            values = dict(key)
+            for i in range(0, len(ids), self.chunk_size):
+                chunk = ids[i:i + self.chunk_size]
+                build = lambda: self.client.table(self.table).update(values).in_('id', chunk).execute()
+                try:
+                    with_retry(build, f"update of {len(chunk)} row(s)")
+                    self.sent += len(chunk)
+                except Exception as e:
+                    print(f"[Sync] [Error] update of {len(chunk)} row(s) failed: {e}")
+                    self.failed.extend({'id': row_id, **values} for row_id in chunk)
+                self.requests += 1
+
+    def _send(self, rows, build, what):
+        groups = {}
+        for row in rows:
+            groups.setdefault(frozenset(row), []).append(row)
+        for group in groups.values():
+            for i in range(0, len(group), self.chunk_size):
+                chunk = group[i:i + self.chunk_size]
+                try:
+                    with_retry(lambda: build(chunk).execute(), f"{what} of {len(chunk)} row(s)")
+                    self.sent += len(chunk)
+                except Exception as e:
+                    print(f"[Sync] [Error] {what} of {len(chunk)} row(s) failed: {e}")
+                    self.failed.extend(chunk)
+                self.requests += 1
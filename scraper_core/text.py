@@ -0,0 +1,141 @@
+import re
+import unicodedata
+from decimal import Decimal, ROUND_HALF_UP
+from urllib.parse import urlparse
+
+_LEGAL_SUFFIX_RE = re.compile(r'(株式会社|有限会社|合同会社|（株）|\(株\))')
+# Standalone suffix tokens at the end only: 'KK Sangyo' and 'The Company Store' keep their words
+_EN_SUFFIX_RE = re.compile(
+    r'(?:[\s,.]+(?:co\.?,?\s*ltd|inc|corp|corporation|company|k\.?k|llc|ltd|limited|holdings))+\.?$', re.I)
+_SPACE_RE = re.compile(r'\s+')
+
+# --- Counts ---
+# Multiplier per unit (matched after NFKC, Latin units case-insensitively).
+# Japanese units can be chained from large to small: 1億2000万, 1万2345.
+COUNT_UNITS = {
+    '千': 10**3, '万': 10**4, '萬': 10**4, '億': 10**8,
+    'k': 10**3, 'thousand': 10**3,
+    'm': 10**6, 'mn': 10**6, 'million': 10**6,
+    'b': 10**9, 'bn': 10**9, 'billion': 10**9,
+}
+_CJK_UNITS = frozenset(u for u in COUNT_UNITS if not u.isascii())
+
+
+def _alternation(words):
+    return '|'.join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+
+
+# 1,234,567.8 | 1 234 567 / 1.234.567 / 1'234 (digit groups) | 1234.5
+_NUMBER = r"\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d{1,3}(?:[ '.]\d{3})+(?![\d,])|\d+(?:\.\d+)?"
+# Latin units must not run into a word ("3 Beiträge" is not 3 billion, "5 min" not 5 million)
+_UNIT = (f"{_alternation(_CJK_UNITS)}"
+         f"|(?i:{_alternation(u for u in COUNT_UNITS if u.isascii())})(?![A-Za-z])")
+# A count as it appears in text, unit included, for building label patterns (see count_pattern)
+COUNT_TOKEN = f"(?:{_NUMBER})(?:[ ]?(?:{_UNIT}))?(?:(?:{_NUMBER})(?:{_alternation(_CJK_UNITS)})?)*"
+
+_COUNT_RE = re.compile(f"({_NUMBER})(?:[ ]?({_UNIT}))?")
+_COUNT_ONLY_RE = re.compile(COUNT_TOKEN)
+
+
+def normalize_text(text):
+    """Normalize text to NFKC (handles full-width/half-width) and strip spaces."""
+    if not text: return ""
+    return unicodedata.normalize('NFKC', str(text)).strip()
+
+
+def normalize_company_name(name):
+    """Removes common suffixes to get the core name for checking."""
+    if not name: return ""
+    name = normalize_text(name)
+    name = _LEGAL_SUFFIX_RE.sub('', name)
+    return name.strip()
+
+
+def company_name_key(name):
+    """
+    The one comparison form of a company name, shared by merge keys, discovery
+    dedupe keys and match keys: NFKC, JP and EN legal suffixes stripped, no
+    whitespace, lowercase ('株式会社 Green House Co., Ltd.' -> 'greenhouse').
+    A name that is nothing but a suffix ('株式会社', 'Company') keeps it.
+    """
+    for core in (_EN_SUFFIX_RE.sub('', normalize_company_name(name)), normalize_text(name)):
+        key = _SPACE_RE.sub('', core).lower().strip(',.')
+        if key: return key
+    return ""
+
+
+def _number(num, unit):
+    num = num.replace(',', '').replace(' ', '').replace("'", '')
+    # Dots are digit groups when repeated (1.234.567) or, without a unit, before exactly
+    # three digits (1.234 Follower); otherwise a decimal point (1.5K, 15.7万)
+    if num.count('.') > 1 or (not unit and len(num.partition('.')[2]) == 3):
+        num = num.replace('.', '')
+    return Decimal(num)
+
+
+def _parse_count(s):
+    total = 0
+    last = None
+    m = _COUNT_RE.search(s)
+    while m:
+        unit = (m.group(2) or '').lower()
+        mult = COUNT_UNITS.get(unit, 1)
+        if last is not None and mult >= last: break
+        total += _number(m.group(1), unit) * mult
+        if unit not in _CJK_UNITS: break
+        last = mult
+        m = _COUNT_RE.match(s, m.end())  # Continues only right after a Japanese unit
+    # Half up, not round()'s half-to-even: '100.5' is 101. Decimal keeps 1.15万 from becoming 11499.99...
+    return int(Decimal(total).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def parse_count_str(count_str):
+    """Parses '1.5M', '10K', '1万', '1.2万人', '1,744 件', 'チャンネル登録者数 15.7万人' etc into integers."""
+    if not count_str: return 0
+    return _parse_count(normalize_text(count_str))
+
+
+def parse_counts(strings):
+    """Batch form of parse_count_str: one int per string (DOM scans repeat the same values)."""
+    seen = {}
+    out = []
+    for s in strings:
+        if s not in seen:
+            seen[s] = parse_count_str(s)
+        out.append(seen[s])
+    return out
+
+
+def is_count(text):
+    """True if text is nothing but a count ('1,744', '1.4万', '12K')."""
+    return bool(text) and _COUNT_ONLY_RE.fullmatch(normalize_text(text)) is not None
+
+
+def count_pattern(after, before=None):
+    """
+    Compiled regex for a count next to a label, e.g. count_pattern('followers|フォロワー', 'フォロワー')
+    matches '1,234 Followers' and 'フォロワー1.2万人'. Use with search_count.
+    """
+    pattern = rf"({COUNT_TOKEN})\s*(?:{after})"
+    if before:
+        pattern += f"|(?:{before}):?[ ]*({COUNT_TOKEN})"
+    return re.compile(pattern, re.I)
+
+
+def search_count(regex, text):
+    """First labelled count of a count_pattern regex in text, 0 if there is none."""
+    if not text: return 0
+    m = regex.search(normalize_text(text))
+    if not m: return 0
+    return parse_count_str(m.group(1) or m.group(2))
+
+
+def get_domain(url):
+    """Extracts domain from URL (e.g. 'https://www.google.com/foo' -> 'google.com')."""
+    if not url or not isinstance(url, str): return ""
+    try:
+        if '://' not in url: url = 'http://' + url
+        domain = urlparse(url).netloc.lower()
+        if domain.startswith("www."): domain = domain[4:]
+        return domain
+    except: return ""
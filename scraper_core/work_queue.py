@@ -0,0 +1,258 @@
+"""
+Persistent SQLite work queue keyed by (company, platform).
+
+Replaces the "Enter start row index" prompt and the CSV rescans: every task is
+pending, in_flight, done, failed or retry (retry_after in the future). Any
+number of scraper processes can claim from the same queue file; a claim is one
+IMMEDIATE transaction, so two processes never get the same company.
+
+Crash recovery needs no input: each process heartbeats, and in_flight tasks of
+a process whose heartbeat went stale (or whose lease expired) are claimable again.
+
+Status / reset from the shell:
+    python -m scraper_core.work_queue <output_file> [status|reset|retry-failed]
+"""
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+
+LEASE_SECONDS = 15 * 60       # A single claim may not stay in_flight longer than this
+HEARTBEAT_INTERVAL = 10
+HEARTBEAT_STALE = 30          # A worker silent for this long is considered dead
+RETRY_DELAYS = [60, 300, 1800]  # Backoff per attempt; after the last one the task is failed
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    company_key TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    row_idx INTEGER NOT NULL,
+    company_name TEXT,
+    website_url TEXT,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    claimed_at REAL,
+    retry_after REAL,
+    last_error TEXT,
+    updated_at REAL,
+    PRIMARY KEY (company_key, platform)
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_state_row ON tasks(state, row_idx);
+CREATE TABLE IF NOT EXISTS workers (
+    worker TEXT PRIMARY KEY,
+    heartbeat REAL NOT NULL
+);
+"""
+
+# Tasks a worker may take: new, due for retry, or abandoned by a dead/expired worker
+CLAIMABLE = """
+    state = 'pending'
+    OR (state = 'retry' AND retry_after <= :now)
+    OR (state = 'in_flight' AND (
+        claimed_at <= :lease_cutoff
+        OR worker NOT IN (SELECT worker FROM workers WHERE heartbeat > :stale_cutoff)))
+"""
+
+
+def queue_path(output_file):
+    return output_file + '.queue.sqlite'
+
+
+class WorkQueue:
+    def __init__(self, path):
+        self.path = path
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+        self._local = threading.local()
+        self._stop = threading.Event()
+        self._heartbeat_thread = None
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+
+    def _conn(self):
+        # sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    # --- Worker liveness ---
+
+    def heartbeat(self):
+        self._conn().execute(
+            "INSERT INTO workers(worker, heartbeat) VALUES(?, ?) "
+            "ON CONFLICT(worker) DO UPDATE SET heartbeat = excluded.heartbeat",
+            (self.worker, time.time()))
+
+    def start_heartbeat(self):
+        self.heartbeat()
+
+        def beat():
+            while not self._stop.wait(HEARTBEAT_INTERVAL):
+                try:
+                    self.heartbeat()
+                except sqlite3.Error as e:
+                    print(f"[Queue] Heartbeat failed: {e}")
+
+        self._heartbeat_thread = threading.Thread(target=beat, daemon=True)
+        self._heartbeat_thread.start()
+
+    def close(self):
+        self._stop.set()
+        try:
+            self._conn().execute("DELETE FROM workers WHERE worker = ?", (self.worker,))
+        except sqlite3.Error: pass
+
+    # --- Producer side ---
+
+    def seed(self, tasks):
+        """Adds (company_key, platform, row_idx, company_name, website_url) tuples; existing keys are kept."""
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cur = conn.executemany(
+                "INSERT OR IGNORE INTO tasks(company_key, platform, row_idx, company_name, website_url, updated_at) "
+                "VALUES(?, ?, ?, ?, ?, ?)",
+                [(str(k), p, int(i), n, w, now) for k, p, i, n, w in tasks])
+            conn.execute("COMMIT")
+        except:
+            conn.execute("ROLLBACK")
+            raise
+        return cur.rowcount
+
+    def reset(self, platform=None, states=None):
+        """Moves tasks back to pending (all, or only the given states / platform)."""
+        sql = "UPDATE tasks SET state = 'pending', attempts = 0, worker = NULL, retry_after = NULL, updated_at = ? WHERE 1=1"
+        params = [time.time()]
+        if platform:
+            sql += " AND platform = ?"
+            params.append(platform)
+        if states:
+            sql += f" AND state IN ({','.join('?' * len(states))})"
+            params.extend(states)
+        return self._conn().execute(sql, params).rowcount
+
+    # --- Consumer side ---
+
+    def claim(self, platforms=None):
+        """
+        Atomically claims every claimable task of the next company.
+        Returns (company_key, row_idx, [platform, ...]) or None when the queue is drained.
+        """
+        conn = self._conn()
+        now = time.time()
+        args = {'now': now, 'lease_cutoff': now - LEASE_SECONDS, 'stale_cutoff': now - HEARTBEAT_STALE,
+                'worker': self.worker}
+        platform_filter = ""
+        if platforms:
+            names = [f"p{i}" for i in range(len(platforms))]
+            args.update(zip(names, map(str, platforms)))
+            platform_filter = f" AND platform IN ({','.join(':' + n for n in names)})"
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                f"SELECT company_key, row_idx FROM tasks WHERE ({CLAIMABLE}){platform_filter} "
+                "ORDER BY row_idx LIMIT 1", args).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            args['key'] = row[0]
+            claimed = [r[0] for r in conn.execute(
+                f"SELECT platform FROM tasks WHERE company_key = :key AND ({CLAIMABLE}){platform_filter}", args)]
+            conn.execute(
+                f"UPDATE tasks SET state = 'in_flight', worker = :worker, claimed_at = :now, "
+                f"attempts = attempts + 1, updated_at = :now "
+                f"WHERE company_key = :key AND ({CLAIMABLE}){platform_filter}", args)
+            conn.execute("COMMIT")
+        except:
+            conn.execute("ROLLBACK")
+            raise
+        return row[0], row[1], claimed
+
+    def complete(self, company_key, platform):
+        self._conn().execute(
+            "UPDATE tasks SET state = 'done', last_error = NULL, updated_at = ? "
+            "WHERE company_key = ? AND platform = ?",
+            (time.time(), str(company_key), platform))
+
+    def fail(self, company_key, platform, error=None):
+        """Schedules a retry with backoff, or marks the task failed after the last attempt."""
+        conn = self._conn()
+        row = conn.execute("SELECT attempts FROM tasks WHERE company_key = ? AND platform = ?",
+                           (str(company_key), platform)).fetchone()
+        attempts = row[0] if row else 1
+        now = time.time()
+        if attempts > len(RETRY_DELAYS):
+            conn.execute(
+                "UPDATE tasks SET state = 'failed', last_error = ?, updated_at = ? WHERE company_key = ? AND platform = ?",
+                (str(error)[:500] if error else None, now, str(company_key), platform))
+        else:
+            conn.execute(
+                "UPDATE tasks SET state = 'retry', retry_after = ?, last_error = ?, updated_at = ? "
+                "WHERE company_key = ? AND platform = ?",
+                (now + RETRY_DELAYS[attempts - 1], str(error)[:500] if error else None, now,
+                 str(company_key), platform))
+
+    def defer(self, company_key, platform, delay, error=None):
+        """Retry after delay seconds without using up an attempt (the site throttled us; the task did not fail)."""
+        now = time.time()
+        self._conn().execute(
+            "UPDATE tasks SET state = 'retry', retry_after = ?, attempts = MAX(attempts - 1, 0), last_error = ?, "
+            "updated_at = ? WHERE company_key = ? AND platform = ?",
+            (now + delay, str(error)[:500] if error else None, now, str(company_key), platform))
+
+    # --- Reporting ---
+
+    def stats(self):
+        """Returns {platform: {state: count}}."""
+        out = {}
+        for platform, state, n in self._conn().execute(
+                "SELECT platform, state, COUNT(*) FROM tasks GROUP BY platform, state"):
+            out.setdefault(platform, {})[state] = n
+        return out
+
+    def peek(self, platform, limit=5, states=('pending', 'retry')):
+        """Returns the next tasks for a platform without claiming them."""
+        return self._conn().execute(
+            f"SELECT company_key, row_idx, company_name, website_url FROM tasks "
+            f"WHERE platform = ? AND state IN ({','.join('?' * len(states))}) ORDER BY row_idx LIMIT ?",
+            (platform, *states, limit)).fetchall()
+
+
+def print_stats(queue):
+    stats = queue.stats()
+    if not stats:
+        print("Queue is empty.")
+        return
+    for platform, states in sorted(stats.items()):
+        total = sum(states.values())
+        parts = ", ".join(f"{s}={n}" for s, n in sorted(states.items()))
+        print(f"  {platform}: total={total} ({parts})")
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python -m scraper_core.work_queue <output_file> [status|reset|retry-failed]")
+        return
+    path = queue_path(sys.argv[1])
+    if not os.path.exists(path):
+        print(f"No queue at {path}")
+        return
+    queue = WorkQueue(path)
+    command = sys.argv[2] if len(sys.argv) > 2 else 'status'
+    if command == 'reset':
+        print(f"Reset {queue.reset()} task(s) to pending.")
+    elif command == 'retry-failed':
+        print(f"Reset {queue.reset(states=['failed'])} failed task(s) to pending.")
+    print_stats(queue)
+
+
+if __name__ == "__main__":
+    main()
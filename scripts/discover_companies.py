@@ -1,10 +1,20 @@
+import itertools
 import os
+import sys
 import time
 import re
 from supabase import create_client, Client
 from duckduckgo_search import DDGS
 from dotenv import load_dotenv
 
+# Allow importing the shared scraper_core package from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scraper_core.dedupe_index import load_or_build, domain_key, name_key, query_terms
+from scraper_core.pool import WorkerPool
+from scraper_core.rate_limit import get_pacer, print_pacer_summary, Throttled
+from scraper_core.supabase_sync import SupabaseSync, iter_rows
+from scraper_core.work_queue import WorkQueue, print_stats
+
 # Load local env if available
 load_dotenv('.env.local')
 
@@ -12,7 +22,23 @@ load_dotenv('.env.local')
 SUPABASE_URL = os.environ.get("SUPABASE_URL") or os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
 SUPABASE_KEY = os.environ.get("SUPABASE_KEY") or os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY")
 
-# Industries/Keywords to search for
+# Query grid: every prefecture x industry x page type (see generate_queries)
+PREFECTURES = [
+    "北海道", "青森県", "岩手県", "宮城県", "秋田県", "山形県", "福島県",
+    "茨城県", "栃木県", "群馬県", "埼玉県", "千葉県", "東京都", "神奈川県",
+    "新潟県", "富山県", "石川県", "福井県", "山梨県", "長野県", "岐阜県",
+    "静岡県", "愛知県", "三重県", "滋賀県", "京都府", "大阪府", "兵庫県",
+    "奈良県", "和歌山県", "鳥取県", "島根県", "岡山県", "広島県", "山口県",
+    "徳島県", "香川県", "愛媛県", "高知県", "福岡県", "佐賀県", "長崎県",
+    "熊本県", "大分県", "宮崎県", "鹿児島県", "沖縄県",
+]
+INDUSTRIES = [
+    "IT企業", "製造業", "不動産", "運送業", "建設業", "飲食", "小売",
+    "卸売", "人材サービス", "広告代理店", "医療法人", "介護", "ホテル",
+    "旅行会社", "食品メーカー", "アパレル", "美容", "教育", "コンサルティング", "物流",
+]
+PAGE_TYPES = ["会社概要", "企業情報"]
+# Extra hand-written queries, searched before the grid
 KEYWORDS = [
     "東京都 IT企業 会社概要",
     "大阪府 製造業 会社概要",
@@ -20,25 +46,44 @@ KEYWORDS = [
     "愛知県 運送業 会社概要"
 ]
 
+# Progress per query is checkpointed here; re-running continues with the remaining ones.
+# Reset: python -m scraper_core.work_queue discovery reset
+QUEUE_FILE = 'discovery.queue.sqlite'
+CONCURRENT_SESSIONS = 4      # DDGS sessions searching in parallel
+# Shared by all sessions. The Pacer starts at QUERIES_PER_SECOND, halves the rate when
+# DuckDuckGo rate-limits us and creeps back up to MAX_QUERIES_PER_SECOND (see rate_limit)
+QUERIES_PER_SECOND = 0.5
+MIN_QUERIES_PER_SECOND = 0.05
+MAX_QUERIES_PER_SECOND = 1.0
+BURST = 2
+DDG_URL = "https://duckduckgo.com/"
+RATELIMIT_RETRY = 300        # Seconds before a rate-limited query is tried again
+MAX_RESULTS = 20
+# A query is only marked done once its companies are flushed to the table (and the
+# dedupe index saved), so a crash re-runs it instead of losing buffered inserts.
+# Flushed every FLUSH_ROWS buffered companies or FLUSH_INTERVAL seconds.
+FLUSH_ROWS = 500
+FLUSH_INTERVAL = 60
+
 if not SUPABASE_URL or not SUPABASE_KEY:
     print("Error: SUPABASE_URL and SUPABASE_KEY must be set.")
     # exit(1)
 
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY) if SUPABASE_URL and SUPABASE_KEY else None
+# New companies are buffered and inserted in bulk
+sync = SupabaseSync(supabase) if supabase else None
+index = None
+buffered_keys = set()  # Keys of companies in the insert buffer (not in the index until flushed)
 
-def search_companies(query, max_results=20):
+def generate_queries():
+    """KEYWORDS first, then the prefecture x industry x page-type grid (no duplicates)."""
+    grid = (f"{p} {i} {t}" for p, i, t in itertools.product(PREFECTURES, INDUSTRIES, PAGE_TYPES))
+    return list(dict.fromkeys(itertools.chain(KEYWORDS, grid)))
+
+def search_companies(ddgs, query, max_results=MAX_RESULTS):
+    """DuckDuckGo search on this worker's session. Errors propagate so the query is retried later."""
     print(f"Searching for: {query}")
-    results = []
-    try:
-        with DDGS() as ddgs:
-            # DuckDuckGo search
-            search_gen = ddgs.text(query, max_results=max_results)
-            for r in search_gen:
-                results.append(r)
-            time.sleep(2)
-    except Exception as e:
-        print(f"Search error: {e}")
-    return results
+    return list(ddgs.text(query, max_results=max_results))
 
 def extract_company_info(result):
     """
@@ -62,43 +107,180 @@ def extract_company_info(result):
 
     return company_name, url
 
-def insert_company(name, url):
-    if not name or not url or not supabase: return
-    
-    # Check simple duplicate by URL or Name
+def load_index():
+    """Known domains / normalized names, from the key file or one paged read of the table."""
+    global index
+    if not supabase: return
     try:
-        # Check URL
-        existing = supabase.table("companies").select("id").eq("website_url", url).execute()
-        if existing.data:
-            print(f"  [Skip] URL exists: {name}")
-            return
+        index = load_or_build(lambda: iter_rows(supabase, "id, company_name, website_url"))
+    except Exception as e:
+        print(f"  [Error] Could not load the known-company index: {e}")
 
-        # Insert
-        print(f"  [NEW] Inserting: {name}")
-        data = {
-            "company_name": name,
-            "website_url": url,
-            "industry": "未分類", # Needs refinement or AI classification
-            "region": "不明"      # Needs refinement
-        }
-        supabase.table("companies").insert(data).execute()
-        
+def is_known(name, key):
+    """Confirms a probable index hit against the table (the Bloom filter can be wrong)."""
+    try:
+        if key.startswith('d:'):
+            domain = key[2:]
+            rows = supabase.table("companies").select("id, website_url").ilike("website_url", f"%{domain}%").limit(20).execute().data
+            return any(domain_key(r.get('website_url')) == key for r in rows)
+        # Fetched by raw substrings (the stored name is not normalized), compared by name_key
+        rows = []
+        for term in query_terms(name):
+            rows += supabase.table("companies").select("id, company_name").ilike("company_name", f"%{term}%").limit(50).execute().data
+        return any(name_key(r.get('company_name')) == key for r in rows)
     except Exception as e:
-        print(f"  [Error] Insert failed: {e}")
+        print(f"  [Error] Duplicate check failed: {e}")
+        return True # When in doubt, do not insert a possible duplicate
+
+def company_keys(name, url):
+    return [k for k in (domain_key(url), name_key(name)) if k]
+
+def find_known(name, url):
+    """The key under which the company is already known (table or insert buffer), else None."""
+    keys = company_keys(name, url)
+    key = next((k for k in keys if k in buffered_keys), None)
+    if key: return key
+    # Check duplicate by domain and normalized name: local probe, DB only on a probable hit
+    if index is not None:
+        key = index.might_contain(name, url)
+        if key and (key in index.added or is_known(name, key)): return key
+        return None
+    # No index: ask the table for every key
+    return next((k for k in keys if is_known(name, k)), None)
+
+def insert_company(name, url):
+    """Buffers the company unless it is known. Returns the buffered row, or None."""
+    if not name or not url or not sync: return None
+
+    key = find_known(name, url)
+    if key:
+        print(f"  [Skip] Already known ({key}): {name}")
+        return None
+    buffered_keys.update(company_keys(name, url))
+
+    # Insert (buffered; flushed every CHUNK_SIZE rows and at the end)
+    print(f"  [NEW] Inserting: {name}")
+    data = {
+        "company_name": name,
+        "website_url": url,
+        "industry": "未分類", # Needs refinement or AI classification
+        "region": "不明"      # Needs refinement
+    }
+    sync.insert(data)
+    return data
+
+def row_key(row):
+    return row['company_name'], row['website_url']
 
 def main():
     print("Starting Company Discovery...")
-    
-    for kw in KEYWORDS:
-        results = search_companies(kw)
-        print(f"Found {len(results)} results for '{kw}'")
-        
+    if not sync:
+        print("Error: no Supabase client; discovered companies could not be stored.")
+        return
+    load_index()
+
+    queries = generate_queries()
+    work = WorkQueue(QUEUE_FILE)
+    added = work.seed((q, 'ddg', i, q, None) for i, q in enumerate(queries))
+    print(f"[Queue] {len(queries)} queries in the grid, {added} new.")
+    print_stats(work)
+    work.start_heartbeat()
+
+    pacer = get_pacer()
+    pacer.configure('duckduckgo.com', QUERIES_PER_SECOND, MIN_QUERIES_PER_SECOND, MAX_QUERIES_PER_SECOND, BURST)
+    started = time.time()
+    found = 0
+
+    def handle(ddgs, idx, query):
+        # Only one domain here: wait out an open circuit instead of deferring every query
+        if not pacer.acquire(DDG_URL, stop_event=pool.stop_event, wait_circuit=True):
+            return {'stopped': True}
+        try:
+            results = search_companies(ddgs, query)
+        except Exception as e:
+            print(f"Search error: {e}")
+            # duckduckgo_search raises RatelimitException when it is throttled
+            if 'ratelimit' in type(e).__name__.lower():
+                pacer.report(DDG_URL, 429)
+                return {'error': Throttled('duckduckgo.com', RATELIMIT_RETRY, str(e))}
+            return {'error': e}
+        pacer.report(DDG_URL, 200)
+        return {'results': results}
+
+    pool = WorkerPool(lambda slot: DDGS(), range(CONCURRENT_SESSIONS), handle)
+
+    claimed = {}  # idx -> query handed to a worker
+    pending = []  # (query, rows) searched but not flushed yet
+    state = {'buffered': 0, 'since': None, 'failed_mark': 0}
+
+    def commit_pending():
+        """Flushes the insert buffer; completes the pending queries whose rows all went in."""
+        if not pending: return
+        sync.flush()
+        failed = {row_key(r) for r in sync.failed[state['failed_mark']:]}
+        state['failed_mark'] = len(sync.failed)
+        for _, rows in pending:
+            for r in rows:
+                buffered_keys.difference_update(company_keys(r['company_name'], r['website_url']))
+                # Failed rows stay unknown, so a retried query can insert them
+                if index is not None and row_key(r) not in failed:
+                    index.add(r['company_name'], r['website_url'])
+        if index is not None: index.save()
+        for query, rows in pending:
+            if any(row_key(r) in failed for r in rows):
+                work.fail(query, 'ddg', "insert failed")
+            else:
+                work.complete(query, 'ddg')
+        pending.clear()
+        state['buffered'] = 0
+        state['since'] = None
+
+    def queries_to_run():
+        while True:
+            task = work.claim(['ddg'])
+            if task is None: return
+            query, idx, _ = task
+            claimed[idx] = query
+            yield idx, query
+
+    def on_result(idx, result):
+        # Single writer: dedupe index and insert buffer are only touched here
+        nonlocal found
+        query = claimed.pop(idx)
+        if result is not None and isinstance(result.get('error'), Throttled):
+            work.defer(query, 'ddg', result['error'].retry_in, result['error'])
+            return
+        if result is None or 'error' in result:
+            work.fail(query, 'ddg', result['error'] if result else "worker error")
+            return
+        if 'stopped' in result:
+            return # Left in_flight; claimable again once this worker is gone
+        results = result['results']
+        print(f"Found {len(results)} results for '{query}'")
+        rows = []
         for res in results:
             name, url = extract_company_info(res)
             if name and url:
-                insert_company(name, url)
-        
-        time.sleep(5) # Respect rate limits
+                found += 1
+                row = insert_company(name, url)
+                if row: rows.append(row)
+        pending.append((query, rows))
+        state['buffered'] += len(rows)
+        if state['since'] is None: state['since'] = time.time()
+        if state['buffered'] >= FLUSH_ROWS or time.time() - state['since'] >= FLUSH_INTERVAL:
+            commit_pending()
+
+    try:
+        pool.run(queries_to_run(), on_result)
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    finally:
+        commit_pending()
+        work.close()
+        print_stats(work)
+        print(f"{found} companies found in {time.time() - started:.0f}s.")
+        print_pacer_summary()
+        sync.close()
 
 if __name__ == "__main__":
     main()
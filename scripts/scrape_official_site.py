@@ -1,15 +1,25 @@
+import asyncio
 import os
 import re
+import sys
 import time
-import requests
-import unicodedata
-from bs4 import BeautifulSoup
+import aiohttp
 from supabase import create_client, Client
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 from dotenv import load_dotenv
 from googlesearch import search
 
-# Requires: pip install requests beautifulsoup4 supabase python-dotenv googlesearch-python
+# Allow importing the shared scraper_core package from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scraper_core.candidates import rank_candidates
+from scraper_core.html_extract import PageScanner, CHUNK_SIZE
+from scraper_core.match_keys import keys_for, prepare_text, name_in_text
+from scraper_core.http_fetch import HEADERS, TIMEOUT
+from scraper_core.rate_limit import get_pacer, print_pacer_summary, Throttled, STATIC_TIER
+from scraper_core.search_cache import get_cache
+from scraper_core.supabase_sync import SupabaseSync, iter_pages
+
+# Requires: pip install aiohttp supabase python-dotenv googlesearch-python
 
 # Load local env
 load_dotenv('.env.local')
@@ -17,125 +27,205 @@ load_dotenv('.env.local')
 # --- Config ---
 SUPABASE_URL = os.environ.get("SUPABASE_URL") or os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
 SUPABASE_KEY = os.environ.get("SUPABASE_KEY") or os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY")
-BATCH_SIZE = 50
+PAGE_SIZE = 500           # Rows per Supabase page (the whole table is paged through)
+CONCURRENCY = 50          # Companies crawled at once
+PER_HOST_LIMIT = 2        # Open connections per host (politeness + keep-alive reuse)
+CRAWL_EXTRA_PAGES = True  # Also crawl /company, /about etc. when the homepage lacks links
+MAX_EXTRA_PAGES = 2
+EXTRA_PATHS = ['/company/', '/about/', '/corporate/']
+# Same-site links that usually lead to the company profile page
+LIKELY_PAGE_RE = re.compile(r'(company|about|corporate|profile|outline|gaiyou|会社概要|企業情報|会社案内)', re.I)
+SEARCH_CONCURRENCY = 1    # googlesearch is rate limited; searches stay sequential
+GOOGLE_URL = "https://www.google.com/"  # Pacer key for googlesearch requests
+FALLBACK_CANDIDATES = 2   # Top-ranked search results validated (concurrently) per platform
+SNS_PLATFORMS = [
+    ('instagram', 'instagram.com'),
+    ('tiktok', 'tiktok.com'),
+    ('youtube', 'youtube.com')
+]
 
 if not SUPABASE_URL or not SUPABASE_KEY:
     print("Error: SUPABASE_URL and SUPABASE_KEY must be set.")
 
 # Initialize Supabase
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY) if SUPABASE_URL and SUPABASE_KEY else None
+# Found links are buffered and written as batched updates
+sync = SupabaseSync(supabase) if supabase else None
 
-def normalize_text(text):
-    if not text: return ""
-    return unicodedata.normalize('NFKC', str(text)).strip().lower()
+def iter_company_pages():
+    """Yields every company with a website, PAGE_SIZE rows at a time (keyset pagination on id)."""
+    if not supabase: return
+    yield from iter_pages(supabase, "id, company_name, website_url", PAGE_SIZE,
+                          query=lambda q: q.not_.is_("website_url", "null"))
 
-def get_companies_to_process():
-    if not supabase: return []
-    response = supabase.table("companies").select("*").not_.is_("website_url", "null").limit(BATCH_SIZE).execute()
-    return response.data
+async def scan_page(session, url, link_handler=None, head_only=False):
+    """
+    Streams the response through a PageScanner and stops reading as soon as it is done
+    (link_handler(final_url) returns the on_link callback). Returns (final_url, scanner) or (None, None).
+    Requests are paced per domain (STATIC_TIER) and their outcome reported (see rate_limit).
+    """
+    pacer = get_pacer()
+    try:
+        await pacer.acquire_async(url, STATIC_TIER)
+        async with session.get(url, allow_redirects=True) as res:
+            if res.status != 200:
+                pacer.report(url, res.status, str(res.url), tier=STATIC_TIER)
+                return None, None
+            final_url = str(res.url)
+            on_link = link_handler(final_url) if link_handler else None
+            scanner = PageScanner(on_link, head_only=head_only, header_charset=res.charset)
+            async for chunk in res.content.iter_chunked(CHUNK_SIZE):
+                if scanner.feed(chunk): break
+            scanner.close()
+            # Login walls / block pages: redirect target and <title> (the body is not kept)
+            if pacer.report(url, res.status, final_url, scanner.title, tier=STATIC_TIER) != 'ok':
+                return None, None
+            return final_url, scanner
+    except Throttled as e:
+        print(f"Skipped {url}: {e}")
+        return None, None
+    except Exception as e:
+        print(f"Error fetching {url}: {e}")
+        return None, None
 
-def validate_sns_page(url, company_name):
+async def validate_sns_page(session, url, company_name):
     """
     Simple validation: Check if company name exists in the SNS page title or description.
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
     try:
-        res = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(res.text, 'html.parser')
-        text_content = (soup.title.string if soup.title else "") + " " + (soup.find('meta', attrs={'name': 'description'}) or {}).get('content', '')
-        
-        norm_name = normalize_text(company_name)
-        norm_text = normalize_text(text_content)
-        
-        if norm_name in norm_text:
-            return True
-        return False
+        # Only <head> is needed: reading stops at </head>
+        _, page = await scan_page(session, url, head_only=True)
+        if page is None: return False
+        text_content = prepare_text(page.title + " " + page.meta.get('description', ''))
+        return name_in_text(keys_for(company_name), text_content)
     except:
         return False
 
-def search_sns_fallback(company_name, platform_domain):
+def search_sns_fallback(company_name, platform_domain, website_url=None):
     """
-    Search for company SNS using Google Search.
+    Search for company SNS using Google Search. Results (url, title + snippet) are
+    cached per query; returns the URLs ranked by candidates.rank_candidates.
+    Raises Throttled when Google is throttling us: the search did not run, which
+    is not an empty result (nothing is cached).
     """
     query = f"{company_name} {platform_domain}"
-    print(f"  [Fallback] Searching Google: {query}")
-    try:
-        # googlesearch.search(query, num_results=N, advanced=True) returns objects with .url, .title, .description
-        # sleep_interval is important to avoid 429 errors
-        results = search(query, num_results=3, advanced=True, sleep_interval=5)
-        
-        for r in results:
-            href = r.url
-            if platform_domain in href:
-                # Basic exclusion
-                if '/p/' in href or '/explore/' in href or '/video/' in href or '/watch' in href:
-                    continue
-                return href
-    except Exception as e:
-        print(f"  [Search Error] {e}")
-    return None
+    candidates = get_cache().get(query, platform_domain)
+    if candidates is None:
+        print(f"  [Fallback] Searching Google: {query}")
+        candidates = []
+        pacer = get_pacer()
+        try:
+            # The Pacer spaces searches out (and backs off on 429) instead of a fixed sleep_interval
+            pacer.acquire(GOOGLE_URL)
+            # googlesearch.search(query, num_results=N, advanced=True) returns objects with .url, .title, .description
+            results = list(search(query, num_results=3, advanced=True))
+            pacer.report(GOOGLE_URL, 200)
+
+            for r in results:
+                href = r.url
+                if platform_domain in href:
+                    # Basic exclusion
+                    if '/p/' in href or '/explore/' in href or '/video/' in href or '/watch' in href:
+                        continue
+                    candidates.append((href, f"{r.title or ''} {r.description or ''}"))
+            get_cache().put(query, platform_domain, candidates)
+        except Throttled:
+            raise
+        except Exception as e:
+            print(f"  [Search Error] {e}")
+            # googlesearch raises requests' HTTPError on 429; check() raises Blocked for it
+            status = getattr(getattr(e, 'response', None), 'status_code', None)
+            if status: pacer.check(GOOGLE_URL, status)
+    else:
+        print(f"  [Fallback] Cached search: {query}")
+    return [url for _, url in rank_candidates(candidates, company_name, website_url)]
+
+def sns_link_handler(sns_links, likely_pages):
+    """
+    Returns a link_handler for scan_page: adds SNS profile links to sns_links (first
+    hit per platform wins), collects same-site links that look like a company
+    profile page into likely_pages, and stops the scan once every platform is found.
+    """
+    def for_page(page_url):
+        host = urlparse(page_url).netloc
+
+        def on_link(href, text):
+            add_sns_link(page_url, host, href, text, sns_links, likely_pages)
+            return not missing_platforms(sns_links)
+        return on_link
+    return for_page
+
+def add_sns_link(page_url, host, href, text, sns_links, likely_pages):
+    """Classifies one link of page_url."""
+    full_url = urljoin(page_url, href)
+
+    if not sns_links.get('instagram') and 'instagram.com' in full_url:
+        if '/p/' not in full_url and '/explore/' not in full_url:
+            sns_links['instagram'] = full_url
 
-def find_sns_links(website_url, company_name):
+    if not sns_links.get('tiktok') and 'tiktok.com' in full_url:
+        if '/video/' not in full_url:
+            sns_links['tiktok'] = full_url
+
+    if not sns_links.get('youtube') and ('youtube.com' in full_url or 'youtu.be' in full_url):
+        if '/watch' not in full_url:
+            sns_links['youtube'] = full_url
+
+    if urlparse(full_url).netloc == host and LIKELY_PAGE_RE.search(href + " " + text):
+        likely_pages.append(full_url.split('#')[0])
+
+def missing_platforms(sns_links):
+    return [key for key, _ in SNS_PLATFORMS if not sns_links.get(key)]
+
+async def find_sns_links(session, search_lock, website_url, company_name):
     """
     1. Scrapes homepage.
-    2. If missing, searches fallback.
+    2. If links are missing, scrapes likely company / about pages.
+    3. If still missing, searches fallback.
+    Returns (sns_links, skipped): skipped lists the platforms whose search was throttled.
     """
     sns_links = {}
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
+    skipped = []
+
     # 1. Direct Website Scraping
-    try:
-        print(f"Scraping Official Site: {website_url}")
-        res = requests.get(website_url, headers=headers, timeout=10)
-        soup = BeautifulSoup(res.text, 'html.parser')
-        
-        for a in soup.find_all('a', href=True):
-            href = a['href']
-            full_url = urljoin(website_url, href)
-            
-            if not sns_links.get('instagram') and 'instagram.com' in full_url:
-                if '/p/' not in full_url and '/explore/' not in full_url:
-                    sns_links['instagram'] = full_url
-            
-            if not sns_links.get('tiktok') and 'tiktok.com' in full_url:
-                if '/video/' not in full_url:
-                    sns_links['tiktok'] = full_url
-                    
-            if not sns_links.get('youtube') and ('youtube.com' in full_url or 'youtu.be' in full_url):
-                if '/watch' not in full_url:
-                    sns_links['youtube'] = full_url
+    print(f"Scraping Official Site: {website_url}")
+    likely_pages = []
+    handler = sns_link_handler(sns_links, likely_pages)
+    final_url, page = await scan_page(session, website_url, handler)
 
-    except Exception as e:
-        print(f"Error scraping {website_url}: {e}")
-
-    # 2. Fallback Search (Only if missing)
-    platforms = [
-        ('instagram', 'instagram.com'),
-        ('tiktok', 'tiktok.com'),
-        ('youtube', 'youtube.com')
-    ]
-    
-    for key, domain in platforms:
+    # 2. Company / about pages, where SNS links often live when the homepage has none
+    if CRAWL_EXTRA_PAGES and page is not None and missing_platforms(sns_links):
+        pages = list(dict.fromkeys(likely_pages + [urljoin(final_url, p) for p in EXTRA_PATHS]))
+        pages = [p for p in pages if p.rstrip('/') != final_url.rstrip('/')]
+        for page_url in pages[:MAX_EXTRA_PAGES]:
+            await scan_page(session, page_url, sns_link_handler(sns_links, []))
+            if not missing_platforms(sns_links): break
+
+    # 3. Fallback Search (Only if missing)
+    for key, domain in SNS_PLATFORMS:
         if not sns_links.get(key):
-            found_url = search_sns_fallback(company_name, domain)
-            if found_url:
-                # Validate
-                if validate_sns_page(found_url, company_name):
+            try:
+                async with search_lock:
+                    found = await asyncio.to_thread(search_sns_fallback, company_name, domain, website_url)
+            except Throttled as e:
+                print(f"  [Search Skipped] {key}: {e}")
+                skipped.append(key)
+                continue
+            found = found[:FALLBACK_CANDIDATES]
+            # Validate the top candidates together; the best-ranked valid one wins
+            results = await asyncio.gather(*(validate_sns_page(session, url, company_name) for url in found))
+            for found_url, ok in zip(found, results):
+                if ok:
                     print(f"  [Fallback Success] Found {key}: {found_url}")
                     sns_links[key] = found_url
-                else:
-                    print(f"  [Fallback Reject] Validation failed for {found_url}")
+                    break
+                print(f"  [Fallback Reject] Validation failed for {found_url}")
 
-    return sns_links
+    return sns_links, skipped
 
-def update_company(company_id, sns_data):
-    """Updates Supabase with found links."""
-    if not sns_data or not supabase: return
+def update_company(company, sns_data):
+    """Queues found links for the next batched update (existing rows only)."""
+    if not sns_data or not sync: return
     
     update_payload = {}
     # ONLY add to payload if we have a value.
@@ -147,24 +237,61 @@ def update_company(company_id, sns_data):
     if sns_data.get('youtube'): update_payload['youtube_url'] = sns_data['youtube']
     
     if update_payload:
-        print(f"Updating {company_id}: {update_payload}")
-        supabase.table("companies").update(update_payload).eq("id", company_id).execute()
+        print(f"Updating {company['id']}: {update_payload}")
+        sync.update(company['id'], update_payload)
+
+async def crawl():
+    # One pooled, keep-alive connector for every request; limit_per_host keeps
+    # us polite to each site while CONCURRENCY companies are in flight.
+    connector = aiohttp.TCPConnector(limit=CONCURRENCY * PER_HOST_LIMIT, limit_per_host=PER_HOST_LIMIT,
+                                     keepalive_timeout=30, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT)
+    search_lock = asyncio.Semaphore(SEARCH_CONCURRENCY)
+    queue = asyncio.Queue(maxsize=CONCURRENCY * 2)
+    processed = 0
+    throttled = 0  # Companies with a throttled search; nothing is recorded for those platforms
+    started = time.time()
+
+    async def worker(session):
+        nonlocal processed, throttled
+        while True:
+            company = await queue.get()
+            if company is None: return
+            try:
+                links, skipped = await find_sns_links(session, search_lock, company['website_url'],
+                                                      company['company_name'])
+                if skipped: throttled += 1
+                if links:
+                    await asyncio.to_thread(update_company, company, links)
+            except Exception as e:
+                print(f"Error processing {company.get('company_name')}: {e}")
+            processed += 1
+            if processed % 100 == 0:
+                print(f"[Progress] {processed} companies ({processed / (time.time() - started) * 3600:.0f}/hour)")
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=HEADERS) as session:
+        workers = [asyncio.create_task(worker(session)) for _ in range(CONCURRENCY)]
+        pages = iter_company_pages()
+        while True:
+            # Supabase client is blocking; fetch the next page off the event loop
+            rows = await asyncio.to_thread(next, pages, None)
+            if rows is None: break
+            for company in rows:
+                if not company.get('website_url') or not company.get('company_name'): continue
+                await queue.put(company)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    if sync:
+        await asyncio.to_thread(sync.close)
+    print(f"Processed {processed} companies in {time.time() - started:.0f}s.")
+    if throttled:
+        print(f"{throttled} companies had searches skipped by throttling; the next run searches them again.")
+    print_pacer_summary()
 
 def main():
     print("Starting Official Site Scan (w/ Fallback)...")
-    companies = get_companies_to_process()
-    print(f"Found {len(companies)} companies to process.")
-    
-    for company in companies:
-        url = company.get('website_url')
-        name = company.get('company_name')
-        if not url or not name: continue
-        
-        links = find_sns_links(url, name)
-        if links:
-            update_company(company['id'], links)
-        
-        time.sleep(1)
+    asyncio.run(crawl())
 
 if __name__ == "__main__":
     main()
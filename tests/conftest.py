@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Allow importing the shared scraper_core package from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,91 @@
+"""Bloom filter and key-file index used for discovery de-duplication."""
+import os
+import time
+
+from scraper_core.dedupe_index import (BloomFilter, DedupeIndex, load_or_build, domain_key, name_key,
+                                       query_terms, KEYS_MAX_AGE)
+
+ROWS = [
+    {'company_name': '株式会社グリーンハウス', 'website_url': 'https://www.greenhouse.co.jp/'},
+    {'company_name': 'Blue Sky Co., Ltd.', 'website_url': None},
+]
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000)
+    keys = [f"n:company{i}" for i in range(1000)]
+    for k in keys:
+        bloom.add(k)
+    assert all(k in bloom for k in keys)
+    false_positives = sum(f"n:other{i}" in bloom for i in range(10000))
+    assert false_positives < 100  # ~0.1% expected
+
+
+def test_keys():
+    assert domain_key('https://www.greenhouse.co.jp/about') == 'd:greenhouse.co.jp'
+    assert domain_key(None) is None
+    assert name_key('（株）グリーン ハウス') == 'n:グリーンハウス'
+    assert name_key('Blue Sky Co., Ltd.') == 'n:bluesky'
+    assert name_key('') is None
+
+
+def test_might_contain_and_add(tmp_path):
+    index = DedupeIndex.build(ROWS, str(tmp_path / 'known.keys'))
+    assert index.count == 3
+    assert index.might_contain('Other', 'https://greenhouse.co.jp') == 'd:greenhouse.co.jp'
+    assert index.might_contain('グリーンハウス株式会社', 'https://example.com') == 'n:グリーンハウス'
+    assert index.might_contain('BLUE SKY Inc.', None) == 'n:bluesky'
+    assert index.might_contain('Red Leaf', 'https://redleaf.jp') is None
+
+    index.add('Red Leaf', 'https://redleaf.jp')
+    assert index.might_contain('Red Leaf', None) == 'n:redleaf'
+    assert index.added == {'n:redleaf', 'd:redleaf.jp'}
+
+
+def test_save_load_round_trip(tmp_path):
+    path = str(tmp_path / 'known.keys')
+    index = DedupeIndex.build(ROWS, path)
+    built_at = os.path.getmtime(path)
+    index.add('Red Leaf', 'https://redleaf.jp')
+    index.save(path)
+    # Merging added keys keeps the build time, so the next rebuild is not postponed
+    assert os.path.getmtime(path) == built_at
+
+    loaded = DedupeIndex.load(path)
+    assert loaded.count == 5
+    assert loaded.might_contain('Red Leaf', None) == 'n:redleaf'
+    assert loaded.might_contain('Blue Sky', None) == 'n:bluesky'
+
+
+def test_load_or_build_rebuilds_stale_or_old_files(tmp_path):
+    path = str(tmp_path / 'known.keys')
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return ROWS
+
+    load_or_build(fetch, path)
+    load_or_build(fetch, path)
+    assert len(calls) == 1
+
+    old = time.time() - KEYS_MAX_AGE - 10
+    os.utime(path, (old, old))
+    load_or_build(fetch, path)
+    assert len(calls) == 2
+
+    # A key file without the current version header is rebuilt too
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('n:stale\n')
+    index = load_or_build(fetch, path)
+    assert len(calls) == 3
+    assert index.might_contain('stale', None) is None
+
+
+def test_query_terms_match_stored_names():
+    # Stored names keep their widths and suffixes; terms are raw substrings of them
+    assert query_terms('株式会社 ＧＲＥＥＮ ＨＯＵＳＥ') == ['ＧＲＥＥＮ', 'GREEN']
+    assert query_terms('株式会社グリーンハウス') == ['グリーンハウス']
+    # ilike wildcards never reach the query
+    assert query_terms('100%_Foods Inc.') == ['Foods']
+    assert query_terms('') == []
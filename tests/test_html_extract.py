@@ -0,0 +1,47 @@
+"""Streaming head / link extraction of PageScanner."""
+import pytest
+
+from scraper_core import html_extract
+from scraper_core.html_extract import PageScanner, scan_bytes
+
+PAGE = ('<html><head><title>Foo &amp; Co</title>'
+        '<meta property="og:title" content="Foo">' + ' ' * 3000 +
+        '</head   ><body><meta name="late" content="x">'
+        '<a href="https://instagram.com/foo">Insta</a><a href="/about"> About  us </a></body></html>').encode()
+
+
+def feed_in(data, size, **kwargs):
+    scanner = PageScanner(**kwargs)
+    for i in range(0, len(data), size):
+        if scanner.feed(data[i:i + size]): break
+    scanner.close()
+    return scanner
+
+
+@pytest.mark.parametrize('size', [1, 7, 1024, len(PAGE)])
+def test_head_end_split_across_chunks(size):
+    links = []
+    scanner = feed_in(PAGE, size, on_link=lambda href, text: links.append((href, text)))
+    assert scanner.title == 'Foo & Co'
+    assert scanner.meta == {'og:title': 'Foo'}   # Meta after </head> is not head metadata
+    assert links == [('https://instagram.com/foo', 'Insta'), ('/about', 'About us')]
+
+
+def test_head_only_stops_at_head_end():
+    scanner = PageScanner(head_only=True)
+    assert scanner.feed(PAGE[:2000]) is False
+    assert scanner.feed(PAGE[2000:]) is True
+    assert scanner.title == 'Foo & Co'
+
+
+def test_head_limit_without_head_end(monkeypatch):
+    monkeypatch.setattr(html_extract, 'HEAD_LIMIT', 2048)
+    data = b'<title>T</title>' + b'x' * 4096
+    scanner = feed_in(data, 512, head_only=True)
+    assert scanner.title == 'T'
+    assert scanner.done
+
+
+def test_on_link_stops_the_scan():
+    scanner = scan_bytes(PAGE, on_link=lambda href, text: True)
+    assert scanner.done
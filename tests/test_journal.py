@@ -0,0 +1,80 @@
+"""Append-only result journal: replay and compaction."""
+import os
+
+import pandas as pd
+
+from scraper_core import journal
+from scraper_core.csv_io import read_companies
+from scraper_core.journal import Journal, journal_path, all_journals, read_records, read_watermark, replay, compact
+
+
+def write_csv(path, ids=('1', '2', '3')):
+    pd.DataFrame({'id': list(ids), 'company_name': [f"c{i}" for i in ids],
+                  'x_url': [None] * len(ids)}).to_csv(path, index=False)
+
+
+def append(path, idx, row_id, updates):
+    j = Journal(path)
+    j.append(idx, row_id, updates)
+    j.close()
+
+
+def test_read_records_skips_torn_line(tmp_path):
+    path = str(tmp_path / 'out.csv.journal.jsonl')
+    append(path, 0, '1', {'x_url': 'https://x.com/a'})
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"idx": 1, "id": "2", "upd')  # Crash mid-write
+    records = list(read_records(path))
+    assert len(records) == 1
+    assert records[0]['updates'] == {'x_url': 'https://x.com/a'}
+
+
+def test_replay_matches_rows_by_id(tmp_path):
+    path = str(tmp_path / 'out.csv.journal.jsonl')
+    append(path, 0, '3', {'x_url': 'https://x.com/c', 'x_followers': 7})
+    # Row order differs from the run that wrote the journal: id wins over idx
+    df = pd.DataFrame({'id': ['3', '1'], 'company_name': ['c3', 'c1']})
+    assert replay(df, path) == 1
+    assert df.loc[0, 'x_url'] == 'https://x.com/c'
+    assert df.loc[0, 'x_followers'] == 7
+    assert pd.isna(df.loc[1, 'x_url'])
+
+
+def test_replay_applies_journals_in_timestamp_order(tmp_path, monkeypatch):
+    a = str(tmp_path / 'out.csv.journal.a.jsonl')
+    b = str(tmp_path / 'out.csv.journal.b.jsonl')
+    clock = iter([100.0, 200.0])
+    monkeypatch.setattr(journal.time, 'time', lambda: next(clock))
+    append(b, 0, '1', {'x_url': 'old'})
+    append(a, 0, '1', {'x_url': 'new'})
+    df = pd.DataFrame({'id': ['1']})
+    replay(df, [a, b])
+    assert df.loc[0, 'x_url'] == 'new'
+    # Records at or before `since` are already in the file
+    df = pd.DataFrame({'id': ['1']})
+    assert replay(df, [a, b], since=150.0) == 1
+
+
+def test_compact_writes_watermark_and_truncates(tmp_path):
+    base = str(tmp_path / 'companies.csv')
+    out = str(tmp_path / 'out.csv')
+    write_csv(base)
+    mine = journal_path(out, 'host:1')
+    other = journal_path(out, 'host:2')
+    append(mine, 0, '1', {'x_url': 'https://x.com/a'})
+    append(other, 1, '2', {'x_url': 'https://x.com/b'})
+
+    compact(out, base, truncate=[mine])
+    df = read_companies(out)
+    assert list(df['x_url'].fillna('')) == ['https://x.com/a', 'https://x.com/b', '']
+    assert read_watermark(out) > 0
+    # Only our own journal is truncated; the other process's journal stays
+    assert all_journals(out) == [other]
+
+    # Compacting again starts from out.csv; records inside the watermark margin replay idempotently
+    append(mine, 2, '3', {'x_url': 'https://x.com/c'})
+    compact(out, base)
+    df = read_companies(out)
+    assert list(df['x_url']) == ['https://x.com/a', 'https://x.com/b', 'https://x.com/c']
+    assert all_journals(out) == []
+    assert not os.path.exists(out + '.lock')
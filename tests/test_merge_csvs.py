@@ -0,0 +1,52 @@
+"""Joining platform files onto the base by id and by name key."""
+import pandas as pd
+
+import merge_csvs
+from merge_csvs import join_source, load_source, name_keys
+
+COLS = ['insta_url', 'insta_followers']
+
+
+def test_name_keys_are_na_without_a_name():
+    df = pd.DataFrame({'company_name': ['株式会社 Foo', None, '', '  '],
+                       'website_url': ['https://www.foo.jp/', None, 'https://bar.jp', None]})
+    keys = name_keys(df)
+    assert keys[0] == 'foo|foo.jp'
+    assert keys[1:].isna().all()
+
+
+def test_rows_without_a_key_are_not_joined(tmp_path):
+    src_file = tmp_path / 'insta.csv'
+    pd.DataFrame({
+        'id': ['', '', '', 'b'],
+        'company_name': ['Foo', None, '', None],
+        'website_url': ['https://foo.jp', None, None, None],
+        'insta_url': ['https://instagram.com/foo', 'https://instagram.com/x', 'https://instagram.com/y',
+                      'https://instagram.com/b'],
+        'insta_followers': [10, 20, 30, 40],
+    }).to_csv(src_file, index=False)
+    src, dup, unkeyed = load_source(str(src_file), COLS)
+    assert list(unkeyed['insta_url']) == ['https://instagram.com/x', 'https://instagram.com/y']
+    assert len(dup) == 0
+
+    base = pd.DataFrame({'id': ['a', 'b', None, None],
+                         'company_name': ['Foo', 'Bar', None, ''],
+                         'website_url': ['https://foo.jp', None, None, None]})
+    out = join_source(base, src, COLS)
+    assert out.at[0, 'insta_url'] == 'https://instagram.com/foo'   # By name, onto a row with an id
+    assert out.at[1, 'insta_url'] == 'https://instagram.com/b'     # By id, though it has no name
+    assert out.loc[[2, 3]].isna().all().all()                      # Nameless base rows pass through
+
+
+def test_unkeyed_rows_are_reported(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pd.DataFrame({'id': ['a'], 'company_name': ['Foo'], 'industry': ['IT'], 'region': ['東京']}).to_csv(
+        'companies.csv', index=False)
+    pd.DataFrame({'company_name': [None, 'Foo'], 'insta_url': ['https://instagram.com/x', 'https://instagram.com/foo']}
+                 ).to_csv('companies_instagram_filled.csv', index=False)
+    merge_csvs.main()
+    conflicts = pd.read_csv(merge_csvs.CONFLICTS_FILE, encoding='utf-8-sig')
+    assert list(conflicts['reason']) == ['no_key']
+    assert list(conflicts['source_value']) == ['https://instagram.com/x']
+    final = pd.read_csv(merge_csvs.OUTPUT_FILE, encoding='utf-8-sig')
+    assert final.at[0, 'insta_url'] == 'https://instagram.com/foo'
@@ -0,0 +1,87 @@
+"""Per-row metrics events and the run summary."""
+import pytest
+
+from scraper_core import metrics
+from scraper_core.metrics import MetricsWriter, read_events, summarize, percentile
+
+
+def event(row, platform, outcome, worker='h:1', ts=0.0, total=1.0, stages=None, candidates=()):
+    return {'ts': ts, 'worker': worker, 'row': row, 'company': f"c{row}", 'platform': platform,
+            'outcome': outcome, 'reject': None, 'error': None, 'stages': stages or {}, 'total': total,
+            'candidates': [{'url': u, 'score': None, 'result': r} for u, r in candidates]}
+
+
+def test_row_event_records_stages_candidates_and_outcome():
+    e = metrics.start(3, 'c3', 'instagram')
+    with metrics.stage('search'):
+        pass
+    metrics.candidate('https://instagram.com/a', 2.345)
+    metrics.reject(metrics.REJECT_NAME)
+    metrics.candidate('https://instagram.com/b', 1.0)
+    metrics.reject(metrics.REJECT_LOW_POSTS)
+    data = e.finish('rejected')
+    assert data['outcome'] == 'rejected'
+    assert data['reject'] == metrics.REJECT_LOW_POSTS
+    assert [c['result'] for c in data['candidates']] == [metrics.REJECT_NAME, metrics.REJECT_LOW_POSTS]
+    assert data['candidates'][0]['score'] == 2.35
+    assert 'search' in data['stages']
+    assert metrics.current() is None
+
+
+def test_later_tier_accept_overrides_reject():
+    e = metrics.start(1, 'c1', 'tiktok')
+    metrics.candidate('https://tiktok.com/@a')
+    metrics.reject(metrics.REJECT_NAME)  # HTTP tier
+    metrics.accept()                     # Browser tier
+    metrics.set_outcome('found')
+    data = e.finish('not_found')
+    assert data['outcome'] == 'found'
+    assert data['reject'] is None
+    assert data['candidates'][0]['result'] == 'valid'
+
+
+def test_no_event_is_a_no_op():
+    metrics._local.event = None
+    metrics.candidate('u')
+    metrics.reject(metrics.REJECT_NAME)
+    metrics.accept()
+    with metrics.stage('wait'):
+        pass
+
+
+def test_percentile():
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile(list(range(1, 101)), 95) == 95
+    assert percentile([7], 95) == 7
+
+
+def test_summarize():
+    events = [
+        event(0, 'x', 'found', ts=0, total=10, stages={'search': 2.0, 'navigate': 5.0},
+              candidates=[('u1', metrics.REJECT_NAME), ('u2', 'valid')]),
+        event(1, 'x', 'rejected', ts=10, total=10, stages={'search': 4.0}, candidates=[('u3', metrics.REJECT_NAME)]),
+        event(2, 'x', 'skipped', ts=20, total=10),
+        event(0, 'instagram', 'updated', worker='h:2', ts=0, total=30, candidates=[('u4', metrics.REJECT_LOW_POSTS)]),
+    ]
+    s = summarize(events)
+    assert s['events'] == 4
+    assert s['rows'] == 4                     # (worker, row) pairs
+    assert s['hours'] == pytest.approx(30 / 3600, abs=1e-3)  # Overlapping workers counted once
+    assert s['stages']['search'] == {'n': 2, 'p50': 2.0, 'p95': 4.0, 'total': 6.0}
+    # Skipped rows are not attempts
+    assert s['platforms']['x']['attempted'] == 2
+    assert s['platforms']['x']['hit_rate'] == 0.5
+    assert s['platforms']['instagram']['hit_rate'] == 1.0
+    assert s['top_rejects'][0] == (metrics.REJECT_NAME, 2)
+
+
+def test_writer_and_read_events(tmp_path):
+    path = str(tmp_path / 'out.csv.metrics.jsonl')
+    writer = MetricsWriter(path)
+    writer.write([event(0, 'x', 'found', ts=100), event(1, 'x', 'not_found', ts=200)])
+    writer.close()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"torn": ')  # Killed mid-write
+    assert len(read_events(path)) == 2
+    assert [e['row'] for e in read_events(path, since=150)] == [1]
+    assert read_events(str(tmp_path / 'missing.jsonl')) == []
@@ -0,0 +1,136 @@
+"""Token buckets, circuit breakers and the per-domain Pacer."""
+import pytest
+
+from scraper_core import rate_limit
+from scraper_core.rate_limit import (TokenBucket, AdaptiveBucket, CircuitBreaker, Pacer, Blocked, CircuitOpen,
+                                     classify, pacer_key, domain_key, STATIC_TIER, BREAKER_THRESHOLD,
+                                     BREAKER_COOLDOWN, PROBE_TIMEOUT)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake wall and monotonic clocks, advanced by hand."""
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, 'time', lambda: now[0])
+    monkeypatch.setattr(rate_limit.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_token_bucket(clock):
+    bucket = TokenBucket(rate=2, burst=2)
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+    clock[0] += 0.5
+    assert bucket.try_acquire() == 0
+
+
+def test_adaptive_bucket_aimd(clock):
+    bucket = AdaptiveBucket(1.0, 1, min_rate=0.1, max_rate=2.0)
+    bucket.on_throttle()
+    assert bucket.rate == 0.5
+    for _ in range(100):
+        bucket.on_success()
+    assert bucket.rate == 2.0
+    for _ in range(10):
+        bucket.on_throttle()
+    assert bucket.rate == 0.1
+
+
+def test_classify():
+    assert classify(200) == 'ok'
+    assert classify(429) == 'throttled'
+    assert classify(403) == 'blocked'
+    assert classify(200, 'https://www.instagram.com/accounts/login/?next=/abc/') == 'blocked'
+    assert classify(200, text='Our systems have detected unusual traffic from your computer') == 'blocked'
+    assert classify(200, text='This site is protected by reCAPTCHA') == 'ok'
+
+
+def test_keys():
+    assert domain_key('https://twitter.com/abc') == 'x.com'
+    assert domain_key('https://shop.greenhouse.co.jp/') == 'greenhouse.co.jp'
+    assert pacer_key('https://www.instagram.com/abc/', STATIC_TIER) == 'http:instagram.com'
+
+
+def test_breaker_trips_and_cooldown_doubles(clock):
+    breaker = CircuitBreaker()
+    for _ in range(BREAKER_THRESHOLD - 1):
+        assert breaker.on_failure() == 0
+    assert breaker.on_failure() == BREAKER_COOLDOWN
+    assert breaker.remaining() == BREAKER_COOLDOWN
+    assert not breaker.start_request()
+    # Failures of requests already in flight do not extend the trip
+    assert breaker.on_failure() == 0
+
+    clock[0] += BREAKER_COOLDOWN
+    assert breaker.start_request()  # The probe
+    assert breaker.on_failure() == 2 * BREAKER_COOLDOWN
+    assert breaker.trips == 2
+
+
+def test_breaker_half_open_lets_one_probe_through(clock):
+    breaker = CircuitBreaker()
+    for _ in range(BREAKER_THRESHOLD):
+        breaker.on_failure()
+    clock[0] += BREAKER_COOLDOWN
+    assert breaker.remaining() == 0
+    assert breaker.start_request()
+    # Everyone else waits for the probe to report
+    assert breaker.remaining() == PROBE_TIMEOUT
+    assert not breaker.start_request()
+    breaker.on_success()
+    assert breaker.remaining() == 0
+    assert breaker.start_request() and breaker.start_request()
+
+
+def test_breaker_probe_timeout(clock):
+    breaker = CircuitBreaker()
+    for _ in range(BREAKER_THRESHOLD):
+        breaker.on_failure()
+    clock[0] += BREAKER_COOLDOWN
+    assert breaker.start_request()
+    clock[0] += PROBE_TIMEOUT
+    # The probe never reported: another one may go
+    assert breaker.start_request()
+
+
+def test_pacer_opens_circuit_and_probes(clock):
+    pacer = Pacer()
+    pacer.configure('example.com', 100, 1, 100, burst=100)
+    url = 'https://example.com/a'
+    for _ in range(BREAKER_THRESHOLD):
+        assert pacer.report(url, 429) == 'throttled'
+    with pytest.raises(CircuitOpen):
+        pacer.try_acquire(url)
+    clock[0] += BREAKER_COOLDOWN
+    assert pacer.try_acquire(url) == 0
+    with pytest.raises(CircuitOpen):
+        pacer.try_acquire(url)  # Probe in flight
+    pacer.report(url, 200)
+    assert pacer.try_acquire(url) == 0
+    assert pacer.try_acquire(url) == 0
+    assert pacer.summary()['example.com']['trips'] == 1
+
+
+def test_pacer_tiers_are_separate(clock):
+    pacer = Pacer()
+    url = 'https://www.instagram.com/abc/'
+    # A tier starts from its domain's limits
+    pacer.try_acquire(url, STATIC_TIER)
+    assert pacer.summary()['http:instagram.com']['rate'] == rate_limit.DOMAIN_LIMITS['instagram.com'][0]
+    for _ in range(BREAKER_THRESHOLD):
+        pacer.report(url, 403, tier=STATIC_TIER)
+    with pytest.raises(CircuitOpen):
+        pacer.try_acquire(url, STATIC_TIER)
+    assert pacer.try_acquire(url) == 0
+
+
+def test_check_raises_blocked_on_its_tier(clock):
+    pacer = Pacer()
+    url = 'https://www.instagram.com/abc/'
+    pacer.check(url, 200, tier=STATIC_TIER)
+    with pytest.raises(Blocked) as e:
+        pacer.check(url, final_url='https://www.instagram.com/accounts/login/', tier=STATIC_TIER)
+    assert e.value.domain == 'http:instagram.com'
+    assert pacer.summary()['http:instagram.com']['blocked'] == 1
+    assert 'instagram.com' not in pacer.summary()
@@ -0,0 +1,64 @@
+"""Search-result cache: key normalization, TTLs and LRU eviction."""
+import pytest
+
+from scraper_core import search_cache
+from scraper_core.search_cache import SearchCache, normalize_query, TTL_SECONDS, NEGATIVE_TTL_SECONDS
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(search_cache.time, 'time', lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SearchCache(str(tmp_path / 'search_cache.sqlite'))
+
+
+def test_normalize_query():
+    assert normalize_query('株式会社ＡＢＣ  Instagram') == normalize_query('株式会社abc instagram')
+
+
+def test_put_get_round_trip(cache, clock):
+    pairs = [['https://instagram.com/abc', '株式会社ABC 公式'], ['https://instagram.com/abc2', '']]
+    cache.put('株式会社ABC', 'instagram', pairs)
+    assert cache.get('株式会社ＡＢＣ', 'instagram') == pairs
+    assert cache.get('株式会社ABC', 'tiktok') is None
+    assert cache.stats() == {'entries': 1, 'empty': 0, 'hits': 1}
+
+
+def test_ttl(cache, clock):
+    cache.put('found', 'x', ['https://x.com/found'])
+    cache.put('missing', 'x', [])
+    clock[0] += NEGATIVE_TTL_SECONDS + 1
+    # Empty results expire sooner, so a company that opens an account is found later
+    assert cache.get('missing', 'x') is None
+    assert cache.get('found', 'x') == ['https://x.com/found']
+    clock[0] += TTL_SECONDS
+    assert cache.get('found', 'x') is None
+
+    assert cache.evict() == 2
+    assert cache.stats()['entries'] == 0
+
+
+def test_lru_eviction(cache, clock, monkeypatch):
+    monkeypatch.setattr(search_cache, 'MAX_ENTRIES', 2)
+    for q in ('a', 'b', 'c'):
+        cache.put(q, 'x', [q])
+        clock[0] += 1
+    cache.get('a', 'x')  # 'b' is now the least recently used
+    assert cache.evict() == 1
+    assert cache.get('b', 'x') is None
+    assert cache.get('a', 'x') == ['a']
+    assert cache.get('c', 'x') == ['c']
+
+
+def test_put_sweeps_every_evict_every(cache, clock, monkeypatch):
+    monkeypatch.setattr(search_cache, 'MAX_ENTRIES', 3)
+    monkeypatch.setattr(search_cache, 'EVICT_EVERY', 5)
+    for i in range(5):
+        cache.put(f"q{i}", 'x', [str(i)])
+        clock[0] += 1
+    assert cache.stats()['entries'] == 3
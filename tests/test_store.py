@@ -0,0 +1,84 @@
+"""Columnar company store: import, column-pruned reads and narrow partition writes."""
+import os
+
+import pandas as pd
+
+from scraper_core.csv_io import read_companies, write_companies
+from scraper_core.store import import_csv, read_store, write_store, partition_of
+
+
+def make_csv(path):
+    pd.DataFrame({
+        'id': ['001', '002', '003'],
+        'company_name': ['c1', 'c2', 'c3'],
+        'website_url': ['https://a.jp', None, 'https://c.jp'],
+        'x_url': ['https://x.com/a', None, None],
+        'x_followers': [10, None, None],
+        'insta_url': [None, 'https://instagram.com/b', None],
+        'insta_followers': [None, 20, None],
+    }).to_csv(path, index=False)
+
+
+def test_import_and_read_round_trip(tmp_path):
+    csv = str(tmp_path / 'companies.csv')
+    store = str(tmp_path / 'companies.store')
+    make_csv(csv)
+    import_csv(csv, store)
+    assert os.path.exists(os.path.join(store, 'master.parquet'))
+    assert os.path.exists(os.path.join(store, 'platform=x', 'part.parquet'))
+
+    df = read_store(store)
+    original = read_companies(csv)
+    assert list(df.columns) == list(original.columns)
+    assert list(df['id']) == ['001', '002', '003']  # Leading zeros kept
+    assert df.loc[0, 'x_followers'] == 10
+    assert pd.isna(df.loc[2, 'x_followers'])
+
+
+def test_read_only_requested_columns(tmp_path):
+    csv = str(tmp_path / 'companies.csv')
+    store = str(tmp_path / 'companies.store')
+    make_csv(csv)
+    import_csv(csv, store)
+    df = read_store(store, ['company_name', 'insta_url'])
+    assert list(df.columns) == ['company_name', 'insta_url']
+    assert df.loc[1, 'insta_url'] == 'https://instagram.com/b'
+
+
+def test_write_touches_only_the_given_partitions(tmp_path):
+    csv = str(tmp_path / 'companies.csv')
+    store = str(tmp_path / 'companies.store')
+    make_csv(csv)
+    import_csv(csv, store)
+    master = os.path.join(store, 'master.parquet')
+    insta = os.path.join(store, 'platform=instagram', 'part.parquet')
+    os.utime(master, (0, 0))
+    os.utime(insta, (0, 0))
+
+    df = read_store(store, ['x_url'])
+    df.loc[2, 'x_url'] = 'https://x.com/c'
+    write_companies(df, store)
+
+    assert os.path.getmtime(master) == 0
+    assert os.path.getmtime(insta) == 0
+    full = read_store(store)
+    assert full.loc[2, 'x_url'] == 'https://x.com/c'
+    # Columns of the partition that were not written keep their values
+    assert full.loc[0, 'x_followers'] == 10
+
+
+def test_partition_of():
+    assert partition_of('x_url') == 'x'
+    assert partition_of('youtube_subscribers') == 'youtube'
+    assert partition_of('company_name') == 'master'
+
+
+def test_write_store_adds_new_partition(tmp_path):
+    csv = str(tmp_path / 'companies.csv')
+    store = str(tmp_path / 'companies.store')
+    make_csv(csv)
+    import_csv(csv, store)
+    df = read_store(store, ['id'])
+    df['tiktok_url'] = [None, None, 'https://tiktok.com/@c']
+    write_store(df[['tiktok_url']], store)
+    assert read_store(store, ['tiktok_url']).loc[2, 'tiktok_url'] == 'https://tiktok.com/@c'
@@ -0,0 +1,55 @@
+"""Batched writes of SupabaseSync against a recording fake client."""
+from scraper_core.supabase_sync import SupabaseSync
+
+
+class FakeClient:
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+class FakeQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.call = [table]
+
+    def __getattr__(self, method):
+        def record(*args, **kwargs):
+            self.call.append((method, args))
+            return self
+        return record
+
+    def execute(self):
+        if self.client.fail: raise RuntimeError("403")
+        self.client.calls.append(self.call)
+        return self
+
+
+def test_update_groups_ids_by_values_and_never_upserts():
+    client = FakeClient()
+    sync = SupabaseSync(client)
+    sync.update('a', {'insta_url': 'https://instagram.com/a'})
+    sync.update('a', {'tiktok_url': 'https://tiktok.com/@a'})  # Merges into the same row
+    sync.update('b', {'youtube_url': 'https://youtube.com/@x'})
+    sync.update('c', {'youtube_url': 'https://youtube.com/@x'})
+    sync.update('d', {})
+    sync.flush()
+    calls = client.calls
+    assert len(calls) == 2
+    assert all(c[1][0] == 'update' for c in calls)
+    by_ids = {tuple(c[2][1][1]): c[1][1][0] for c in calls}  # in_('id', ids) -> update(values)
+    assert by_ids[('a',)] == {'insta_url': 'https://instagram.com/a', 'tiktok_url': 'https://tiktok.com/@a'}
+    assert by_ids[('b', 'c')] == {'youtube_url': 'https://youtube.com/@x'}
+    assert sync.sent == 3 and sync.requests == 2
+
+
+def test_failed_update_is_recorded(monkeypatch):
+    monkeypatch.setattr('scraper_core.supabase_sync.MAX_RETRIES', 1)
+    sync = SupabaseSync(FakeClient(fail=True))
+    sync.update('a', {'insta_url': 'u'})
+    sync.flush()
+    assert sync.failed == [{'id': 'a', 'insta_url': 'u'}]
+    assert sync.sent == 0
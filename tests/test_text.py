@@ -0,0 +1,154 @@
+"""Count parsing against counts and meta descriptions as the platforms serve them."""
+import pytest
+
+from scraper_core.platforms.base import FOLLOWERS_RE, POSTS_RE
+from scraper_core.platforms.x import X_POSTS_RE
+from scraper_core.platforms.youtube import SUBSCRIBERS_META_RE
+from scraper_core.text import parse_count_str, parse_counts, is_count, search_count, count_pattern, company_name_key
+
+
+@pytest.mark.parametrize('text, expected', [
+    # Plain and grouped digits
+    ('0', 0),
+    ('744', 744),
+    ('1,744', 1744),
+    ('1,744 件', 1744),
+    ('1,234,567', 1234567),
+    ('1 234 567', 1234567),
+    ("12'345", 12345),
+    ('1.234.567', 1234567),
+    ('1.234 Follower', 1234),
+    ('3 Beiträge', 3),
+    ('5 min', 5),
+    # Full-width digits and units (NFKC)
+    ('１２３４', 1234),
+    ('１．２万', 12000),
+    # Japanese units, with labels after them
+    ('1万', 10000),
+    ('1.2万人', 12000),
+    ('15.7万人', 157000),
+    ('2.5千', 2500),
+    ('1億', 100000000),
+    ('3.4萬', 34000),
+    # Chained Japanese units
+    ('1億2000万', 120000000),
+    ('1万2345', 12345),
+    ('2億3456万7890', 234567890),
+    # Latin units in any case
+    ('10K', 10000),
+    ('1.5k', 1500),
+    ('12.3K followers', 12300),
+    ('1.5M', 1500000),
+    ('2.5B', 2500000000),
+    ('3 bn', 3000000000),
+    ('4.2 mn', 4200000),
+    ('1.2 million', 1200000),
+    ('7 thousand', 7000),
+    # Decimals round half up
+    ('15.5', 16),
+    ('100.5', 101),
+    ('1,234,567.8', 1234568),
+    ('1.15万', 11500),
+    # Nothing to parse
+    ('', 0),
+    (None, 0),
+    ('abc', 0),
+])
+def test_parse_count_str(text, expected):
+    assert parse_count_str(text) == expected
+
+
+# (regex, meta description, expected count)
+META_DESCRIPTIONS = [
+    (FOLLOWERS_RE, '1.2M Followers, 345 Following, 1,234 Posts - See Instagram photos and videos from Example (@example)', 1200000),
+    (POSTS_RE, '1.2M Followers, 345 Following, 1,234 Posts - See Instagram photos and videos from Example (@example)', 1234),
+    (FOLLOWERS_RE, '5,678 Followers, 12 Following, 98 Posts - See Instagram photos and videos from 株式会社グリーンハウス (@greenhouse)', 5678),
+    (FOLLOWERS_RE, 'フォロワー1.2万人、フォロー中345人、投稿1,744件 - 株式会社サンプル(@sample)のInstagram写真と動画をチェックしよう', 12000),
+    (POSTS_RE, 'フォロワー1.2万人、フォロー中345人、投稿1,744件 - 株式会社サンプル(@sample)のInstagram写真と動画をチェックしよう', 1744),
+    (FOLLOWERS_RE, 'フォロワー：1億2000万人', 120000000),
+    (FOLLOWERS_RE, '12.3K Followers · 2,345 Following', 12300),
+    (FOLLOWERS_RE, '８，９０１ フォロワー', 8901),
+    (X_POSTS_RE, '3.4万 件のポスト', 34000),
+    (X_POSTS_RE, '12.5K posts', 12500),
+    (SUBSCRIBERS_META_RE, 'チャンネル登録者数 15.7万人', 157000),
+    (SUBSCRIBERS_META_RE, '1.23M subscribers', 1230000),
+    (SUBSCRIBERS_META_RE, '株式会社サンプル公式チャンネルです。登録者数 2,345人', 2345),
+]
+
+
+@pytest.mark.parametrize('regex, text, expected', META_DESCRIPTIONS)
+def test_search_count_in_meta_descriptions(regex, text, expected):
+    assert search_count(regex, text) == expected
+
+
+def test_search_count_without_label():
+    assert search_count(FOLLOWERS_RE, 'See Instagram photos and videos') == 0
+    assert search_count(FOLLOWERS_RE, '') == 0
+
+
+def test_non_english_labels():
+    follower_re = count_pattern('follower|abonnenten')
+    posts_re = count_pattern('beiträge')
+    text = '1.234 Follower, 56 gefolgt, 3 Beiträge - Sieh dir Instagram-Fotos und -Videos von Beispiel an'
+    assert search_count(follower_re, text) == 1234
+    assert search_count(posts_re, text) == 3
+
+
+def test_parse_counts():
+    assert parse_counts(['1.2万', '1,744', '1.2万', '', '3K']) == [12000, 1744, 12000, 0, 3000]
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('1,744', True),
+    ('1.4万', True),
+    ('12K', True),
+    ('1億2000万', True),
+    ('1,744 件', False),
+    ('Followers', False),
+    ('', False),
+])
+def test_is_count(text, expected):
+    assert is_count(text) is expected
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('株式会社グリーンハウス', 'グリーンハウス'),
+    ('（株）グリーン ハウス', 'グリーンハウス'),
+    ('グリーンハウス有限会社', 'グリーンハウス'),
+    ('Green House Co., Ltd.', 'greenhouse'),
+    ('ＧＲＥＥＮ ＨＯＵＳＥ Inc.', 'greenhouse'),
+    ('Green House Holdings Co., Ltd.', 'greenhouse'),
+    ('Green House K.K.', 'greenhouse'),
+    # Suffix words elsewhere in the name are part of it
+    ('KK Sangyo', 'kksangyo'),
+    ('The Company Store', 'thecompanystore'),
+    ('Inc Design', 'incdesign'),
+    ('Greenhouseinc', 'greenhouseinc'),
+    # Never empty for a non-empty name
+    ('Company', 'company'),
+    ('株式会社', '株式会社'),
+    ('', ''),
+    (None, ''),
+])
+def test_company_name_key(name, expected):
+    assert company_name_key(name) == expected
+
+
+@pytest.mark.parametrize('platform, page, expected', [
+    # ytInitialData, older and newer layout, then the meta description
+    ('youtube', {'html': '"subscriberCountText":{"accessibility":{"accessibilityData":{"label":"15.7万人"}},"simpleText":"チャンネル登録者数 15.7万人"}',
+                 'meta_description': ''}, {'followers': 157000, 'posts': 0}),
+    ('youtube', {'html': '"content":"@example・1.23M subscribers・456 videos"', 'meta_description': ''},
+     {'followers': 1230000, 'posts': 0}),
+    ('youtube', {'html': '', 'meta_description': '登録者数 2,345人'}, {'followers': 2345, 'posts': 0}),
+    # TikTok's embedded JSON, then the meta description
+    ('tiktok', {'html': '"stats":{"followerCount":12345,"followingCount":3,"videoCount":67}', 'meta_description': ''},
+     {'followers': 12345, 'posts': 67}),
+    ('tiktok', {'html': '', 'meta_description': 'Example (@example) on TikTok | 1.2M Likes. 45.6K Followers.'},
+     {'followers': 45600, 'posts': 0}),
+])
+def test_extract_static(platform, page, expected):
+    from scraper_core.platforms.tiktok import TikTokPlatform
+    from scraper_core.platforms.youtube import YouTubePlatform
+    cls = {'youtube': YouTubePlatform, 'tiktok': TikTokPlatform}[platform]
+    assert cls().extract_static(page) == expected
@@ -0,0 +1,103 @@
+"""Persistent work queue: claiming, completion, retries and crash recovery."""
+import pytest
+
+from scraper_core import work_queue
+from scraper_core.work_queue import WorkQueue, RETRY_DELAYS, LEASE_SECONDS
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = WorkQueue(str(tmp_path / 'out.csv.queue.sqlite'))
+    q.seed([('1', 'x', 0, 'c1', None), ('1', 'instagram', 0, 'c1', None),
+            ('2', 'x', 1, 'c2', None), ("3'", 'x', 2, 'c3', None)])
+    q.heartbeat()
+    yield q
+    q.close()
+
+
+def states(q):
+    return {k: v for k, v in q.stats().items()}
+
+
+def test_seed_keeps_existing_tasks(queue):
+    assert queue.seed([('1', 'x', 0, 'c1', None), ('4', 'x', 3, 'c4', None)]) == 1
+    assert states(queue)['x'] == {'pending': 4}
+
+
+def test_claim_takes_every_platform_of_the_next_company(queue):
+    key, idx, platforms = queue.claim()
+    assert (key, idx, sorted(platforms)) == ('1', 0, ['instagram', 'x'])
+    assert states(queue) == {'x': {'in_flight': 1, 'pending': 2}, 'instagram': {'in_flight': 1}}
+    assert queue.claim()[0] == '2'
+
+
+def test_claim_filters_platforms(queue):
+    key, idx, platforms = queue.claim(['x'])
+    assert (key, platforms) == ('1', ['x'])
+    assert states(queue)['instagram'] == {'pending': 1}
+    # Quotes in platform names are bound, not interpolated
+    assert queue.claim(["x') OR ('1'='1"]) is None
+
+
+def test_complete_and_drain(queue):
+    while True:
+        task = queue.claim()
+        if task is None: break
+        for platform in task[2]:
+            queue.complete(task[0], platform)
+    assert states(queue) == {'x': {'done': 3}, 'instagram': {'done': 1}}
+
+
+def test_fail_retries_with_backoff_then_fails(queue, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(work_queue.time, 'time', lambda: now[0])
+    queue.heartbeat()
+    for delay in RETRY_DELAYS:
+        assert queue.claim(['instagram'])[0] == '1'
+        queue.fail('1', 'instagram', 'boom')
+        assert states(queue)['instagram'] == {'retry': 1}
+        now[0] += delay - 1
+        queue.heartbeat()
+        assert queue.claim(['instagram']) is None  # Not due yet
+        now[0] += 1
+        queue.heartbeat()
+    # The attempt after the last retry delay is the final one
+    assert queue.claim(['instagram'])[0] == '1'
+    queue.fail('1', 'instagram', 'boom')
+    assert states(queue)['instagram'] == {'failed': 1}
+    assert queue.reset(states=['failed']) == 1
+
+
+def test_defer_does_not_use_up_an_attempt(queue):
+    queue.claim(['x'])
+    queue.defer('1', 'x', 0, 'throttled')
+    attempts = queue._conn().execute("SELECT attempts FROM tasks WHERE company_key = '1' AND platform = 'x'").fetchone()[0]
+    assert attempts == 0
+    assert queue.claim(['x'])[0] == '1'
+
+
+def test_expired_lease_and_dead_worker_are_claimable(tmp_path, monkeypatch):
+    path = str(tmp_path / 'q.sqlite')
+    now = [1000.0]
+    monkeypatch.setattr(work_queue.time, 'time', lambda: now[0])
+    a = WorkQueue(path)
+    a.worker = 'host:a'
+    a.seed([('1', 'x', 0, 'c1', None)])
+    a.heartbeat()
+    assert a.claim()[0] == '1'
+
+    b = WorkQueue(path)
+    b.worker = 'host:b'
+    b.heartbeat()
+    assert b.claim() is None  # a is alive and within its lease
+
+    # a keeps beating but holds the task past its lease
+    now[0] += LEASE_SECONDS + 1
+    a.heartbeat()
+    b.heartbeat()
+    assert b.claim()[0] == '1'
+
+    # b dies (no heartbeat): a takes the task back
+    now[0] += work_queue.HEARTBEAT_STALE + 1
+    a.heartbeat()
+    assert a.claim()[0] == '1'